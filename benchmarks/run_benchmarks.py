@@ -0,0 +1,278 @@
+"""Offline benchmark suite and regression gate for the scraping and data pipeline.
+
+Every stage runs on local data only: the fixture detail pages, pages rendered
+from data/museum_details_full.json and the dataset itself. Each stage reports
+throughput (items per CPU second, best of --repeat runs) and peak Python
+memory. CPU time is used instead of wall time so other load on the machine
+disturbs the numbers less.
+
+    python3 benchmarks/run_benchmarks.py --save        # record baselines
+    python3 benchmarks/run_benchmarks.py               # compare, exit 1 on regression
+    python3 benchmarks/run_benchmarks.py --stage extract_museum --threshold 0.1
+
+Baselines are machine specific; record them on the machine that runs the gate.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from lxml import etree
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraping"))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import build_facet_index  # noqa: E402
+import build_hours_index  # noqa: E402
+import build_search_index  # noqa: E402
+import check_image_mismatches  # noqa: E402
+import extract  # noqa: E402
+from fixture_server import dataset_pages, load_detail_pages  # noqa: E402
+from record_writer import DAYS, RecordWriter  # noqa: E402
+
+DATASET_PATH = os.path.join(ROOT, "data", "museum_details_full.json")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines.json")
+
+DAY_RANGES = ["Mon - Fri", "Thu - Sat", "Fri - Tue", "Sun", "mon-sun", "Wed", "Sat - Mon", "Tue - Thu"]
+
+
+# --- Stage setup ---
+# Each stage returns (function, number of items it processes per call)
+
+def _load_dataset():
+    with open(DATASET_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _corpus():
+    pages = [body.decode("utf-8") for _, body in load_detail_pages()]
+    return pages + [page for _, page in dataset_pages(DATASET_PATH)]
+
+
+def stage_expand_days():
+    ranges = DAY_RANGES * 500
+    return lambda: [extract.expand_days(r.replace(" - ", "-")) for r in ranges], len(ranges)
+
+
+def stage_parse_opening_hours():
+    sections = []
+    for page in _corpus():
+        sections += extract.OPENING_SECTION(etree.HTML(page))
+    return lambda: [extract.parse_opening_hours(section) for section in sections], len(sections)
+
+
+def stage_parse_hours_text():
+    # Every museum's week as "Mon  10:00 - 17:00" lines, the free text fallback format
+    texts = [
+        "\n".join(f"{day[:3]}  {museum[f'Opening_{day}']}" for day in DAYS)
+        for museum in _load_dataset()
+    ]
+    return lambda: [extract.parse_hours_text(text) for text in texts], len(texts)
+
+
+def stage_clean_filename():
+    names = [museum["Name"] for museum in _load_dataset()]
+    return lambda: [extract.clean_filename(name) for name in names], len(names)
+
+
+def stage_clean_filename_check_images():
+    names = [museum["Name"] for museum in _load_dataset()]
+    return lambda: [check_image_mismatches.clean_filename(name) for name in names], len(names)
+
+
+def stage_open_at_parsing():
+    museums = _load_dataset()
+    queries = [(day, f"{hour:02d}:30") for day in DAYS for hour in range(8, 20)]
+    return lambda: [build_hours_index.open_by_parsing(museums, *q) for q in queries], len(queries)
+
+
+def stage_open_at_index():
+    index = build_hours_index.HoursIndex.from_museums(_load_dataset())
+    queries = [(day, f"{hour:02d}:30") for day in DAYS for hour in range(8, 20)]
+    return lambda: [index.open_at(*q) for q in queries], len(queries)
+
+
+def _search_queries(museums):
+    return build_search_index.sample_queries(museums, 60, random.Random(0))
+
+
+def stage_search_scan():
+    museums = _load_dataset()
+    queries = _search_queries(museums)
+    return lambda: [build_search_index.scan_suggestions(museums, q) for q in queries], len(queries)
+
+
+def stage_search_index():
+    museums = _load_dataset()
+    index = build_search_index.SearchIndex.build(museums)
+    queries = _search_queries(museums)
+    return lambda: [index.search(q) for q in queries], len(queries)
+
+
+def _facet_selections(index):
+    return build_facet_index.sample_selections(index, 60, random.Random(0))
+
+
+def stage_facet_scan():
+    museums = _load_dataset()
+    selections = _facet_selections(build_facet_index.FacetIndex.build(museums))
+    return lambda: [build_facet_index.scan(museums, s) for s in selections], len(selections)
+
+
+def stage_facet_index():
+    index = build_facet_index.FacetIndex.build(_load_dataset())
+    selections = _facet_selections(index)
+    return lambda: [(index.query(s), index.facet_counts(s)) for s in selections], len(selections)
+
+
+def stage_extract_museum():
+    pages = _corpus()
+    return lambda: [extract.extract_museum(page) for page in pages], len(pages)
+
+
+def stage_load_dataset_json():
+    with open(DATASET_PATH, "r", encoding="utf-8") as f:
+        text = f.read()
+    return lambda: json.loads(text), len(json.loads(text))
+
+
+def stage_write_records():
+    museums = _load_dataset()
+
+    def write():
+        # A directory per call, so no benchmark run leaves files behind
+        with tempfile.TemporaryDirectory() as directory:
+            base = os.path.join(directory, "museums")
+            writer = RecordWriter(f"{base}.csv", f"{base}.jsonl", f"{base}.json")
+            for museum in museums:
+                writer.write(museum)
+            writer.close()
+    return write, len(museums)
+
+
+STAGES = {
+    "expand_days": stage_expand_days,
+    "parse_opening_hours": stage_parse_opening_hours,
+    "parse_hours_text": stage_parse_hours_text,
+    "clean_filename": stage_clean_filename,
+    "clean_filename_check_images": stage_clean_filename_check_images,
+    "open_at_parsing": stage_open_at_parsing,
+    "open_at_index": stage_open_at_index,
+    "search_scan": stage_search_scan,
+    "search_index": stage_search_index,
+    "facet_scan": stage_facet_scan,
+    "facet_index": stage_facet_index,
+    "extract_museum": stage_extract_museum,
+    "load_dataset_json": stage_load_dataset_json,
+    "write_records": stage_write_records,
+}
+
+
+# --- Measuring ---
+def measure(setup, repeat, min_time=0.2):
+    func, items = setup()
+
+    # Warm up and find how many calls make one timed run last at least min_time,
+    # so short stages are not dominated by timer noise
+    started = time.process_time()
+    func()
+    once = time.process_time() - started
+    calls = max(1, int(min_time / once) if once else 1000)
+
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.process_time()
+            for _ in range(calls):
+                func()
+            elapsed = (time.process_time() - started) / calls
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+
+    # Separate run for memory, tracemalloc slows everything down
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "items": items,
+        "seconds": best,
+        "throughput": items / best if best else float("inf"),
+        "peak_kb": peak / 1024,
+    }
+
+
+def compare(name, result, baseline, threshold):
+    """List of regression messages for one stage"""
+    problems = []
+    if baseline is None:
+        return problems
+    if result["throughput"] < baseline["throughput"] * (1 - threshold):
+        problems.append(
+            f"{name}: throughput {result['throughput']:.0f}/s is "
+            f"{(1 - result['throughput'] / baseline['throughput']) * 100:.0f}% below baseline "
+            f"{baseline['throughput']:.0f}/s"
+        )
+    if result["peak_kb"] > baseline["peak_kb"] * (1 + threshold) and result["peak_kb"] - baseline["peak_kb"] > 64:
+        problems.append(
+            f"{name}: peak memory {result['peak_kb']:.0f} KB is "
+            f"{(result['peak_kb'] / baseline['peak_kb'] - 1) * 100:.0f}% above baseline {baseline['peak_kb']:.0f} KB"
+        )
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraping and data pipeline")
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES), help="Only run these stages")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage, the best one counts")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timed run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown or memory growth as a fraction of the baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args()
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    results = {}
+    problems = []
+    print(f"{'stage':<30} {'items/s':>12} {'ms/run':>9} {'peak KB':>9} {'vs base':>8}")
+    for name in args.stage or STAGES:
+        result = measure(STAGES[name], args.repeat, args.min_time)
+        results[name] = result
+        baseline = baselines.get(name)
+        change = f"{(result['throughput'] / baseline['throughput'] - 1) * 100:+.0f}%" if baseline else "-"
+        print(f"{name:<30} {result['throughput']:>12.0f} {result['seconds'] * 1000:>9.2f} "
+              f"{result['peak_kb']:>9.0f} {change:>8}")
+        problems += compare(name, result, baseline, args.threshold)
+
+    if args.save:
+        baselines.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Saved baselines for {len(results)} stages to {args.baseline}")
+        return
+
+    if problems:
+        print(f"\n❌ {len(problems)} regression(s) past the {args.threshold:.0%} threshold:")
+        for problem in problems:
+            print(f"   {problem}")
+        sys.exit(1)
+    print("\n✅ No regressions" if baselines else "\nℹ️ No baseline yet, run with --save to record one")
+
+
+if __name__ == "__main__":
+    main()
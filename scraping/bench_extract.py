@@ -0,0 +1,73 @@
+"""Check the fast extractor against the BeautifulSoup reference and compare CPU time.
+
+The corpus is the saved fixture pages, a page rendered from every museum in
+data/museum_details_full.json and, if present, the pages in the scraper's
+page cache:
+
+    python3 scraping/bench_extract.py --repeat 3 --min-speedup 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from extract import extract_museum
+from extract_bs4 import extract_record as extract_reference
+from fixture_server import dataset_pages, load_detail_pages
+
+
+def load_corpus(cache_dir):
+    pages = [(slug, body.decode("utf-8")) for slug, body in load_detail_pages()]
+    pages += dataset_pages()
+    for path in sorted(glob.glob(os.path.join(cache_dir, "pages", "*", "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def cpu_time(extract, pages, repeat):
+    """Best of `repeat` CPU seconds to extract the whole corpus"""
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        for _, html in pages:
+            extract(html)
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_museum against the BeautifulSoup extractor")
+    parser.add_argument("--cache-dir", default="data/cache", help="Scraper cache with extra pages to include")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-speedup", type=float, default=5.0, help="Fail below this CPU time ratio")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.cache_dir)
+    print(f"📚 Corpus: {len(pages)} pages")
+
+    mismatches = 0
+    for slug, html in pages:
+        expected, actual = extract_reference(html), extract_museum(html)
+        if expected != actual:
+            mismatches += 1
+            fields = [field for field in expected if expected[field] != actual.get(field)]
+            print(f"  ❌ {slug}: records differ in {', '.join(fields)}")
+    print(f"🔍 Identical records: {len(pages) - mismatches}/{len(pages)}")
+
+    reference = cpu_time(extract_reference, pages, args.repeat)
+    fast = cpu_time(extract_museum, pages, args.repeat)
+    speedup = reference / fast if fast else float("inf")
+    print(f"⏱️ BeautifulSoup: {reference / len(pages) * 1000:.2f} ms CPU per page")
+    print(f"⚡ extract_museum: {fast / len(pages) * 1000:.2f} ms CPU per page")
+    print(f"📈 Speedup: {speedup:.1f}x")
+
+    if mismatches or speedup < args.min_speedup:
+        print(f"❌ Failed: {mismatches} mismatching records, speedup {speedup:.1f}x (need {args.min_speedup:g}x)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
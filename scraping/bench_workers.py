@@ -0,0 +1,48 @@
+"""Measure detail scraper throughput at different worker counts, fully offline.
+
+    python3 scraping/bench_workers.py --count 64 --workers 1 2 4 8
+"""
+import argparse
+import time
+from functools import partial
+
+from fixture_server import fixture_urls, start_server
+from page_waits import WaitStats
+from record_writer import empty_record
+from scrape_detail_pages import DEFAULT_PAGE_TIMEOUT, create_driver, scrape_museum
+from worker_pool import run_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the detail scraper against the fixture server")
+    parser.add_argument("--count", type=int, default=64, help="Number of simulated museum pages")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds per request")
+    args = parser.parse_args()
+
+    server, base_url = start_server(latency=args.latency)
+    urls = fixture_urls(base_url, args.count)
+
+    rows = []
+    try:
+        for workers in args.workers:
+            wait_stats = WaitStats(DEFAULT_PAGE_TIMEOUT)
+            started = time.perf_counter()
+            results = run_pool(urls, partial(scrape_museum, wait_stats=wait_stats), create_driver,
+                               workers=workers, empty_result=empty_record(), progress_every=0)
+            elapsed = time.perf_counter() - started
+            successful = len([r for r in results if r and r["Name"]])
+            rows.append((workers, elapsed, len(urls) / elapsed, successful))
+            print(wait_stats.summary())
+    finally:
+        server.shutdown()
+
+    print(f"\n📊 Throughput for {len(urls)} fixture pages")
+    print(f"{'workers':>8} {'seconds':>9} {'pages/s':>8} {'speedup':>8} {'ok':>5}")
+    base = rows[0][1] if rows else 0
+    for workers, elapsed, rate, successful in rows:
+        print(f"{workers:>8} {elapsed:>9.1f} {rate:>8.2f} {base / elapsed:>7.1f}x {successful:>5}")
+
+
+if __name__ == "__main__":
+    main()
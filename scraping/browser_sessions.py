@@ -0,0 +1,288 @@
+"""Warm browser sessions shared by the scrapers.
+
+Starting Chrome, and before that resolving chromedriver with
+webdriver-manager, costs seconds per browser. This module does both once:
+
+- `driver_path()` resolves chromedriver once per process and remembers the
+  path in data/cache/chromedriver.json for the next process. `CHROMEDRIVER`
+  in the environment overrides it.
+- `SessionManager` hands out browser sessions and takes them back, so a
+  long-lived process (a notebook, a scheduler, listing discovery followed by
+  the detail scrape) reuses warm browsers between runs instead of starting
+  new ones. Every reused session is health checked first, and a session is
+  recycled after `max_pages` pages, when the renderer crashes or when it
+  stops answering.
+- `chrome_options()` is the one Chrome configuration of both scrapers, and
+  both use the `CHROME_SESSIONS` manager, so a browser started for the
+  listing is a valid warm session for the detail pages.
+
+Startup, recycle and health check timings are kept per manager and are
+also sent to a `RunMetrics` set as `observe`:
+
+    sessions = shared_sessions(CHROME_SESSIONS, create_driver, max_pages=200)
+    sessions.observe = metrics.observe
+    pool = BrowserPool(scrape, sessions, on_result, workers=4)
+"""
+import atexit
+import json
+import os
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from http_fetch import percentile
+
+DRIVER_CACHE_PATH = "data/cache/chromedriver.json"
+DEFAULT_MAX_PAGES = 200
+CHROME_SESSIONS = "chrome"
+
+# Error messages of a browser that is gone, not of a page that failed
+CRASH_MARKERS = (
+    "tab crashed",
+    "page crash",
+    "session deleted",
+    "invalid session id",
+    "chrome not reachable",
+    "disconnected",
+    "target window already closed",
+)
+
+
+# --- chromedriver ---
+_driver_path = None
+_driver_lock = threading.Lock()
+
+
+def driver_path(cache_path=DRIVER_CACHE_PATH, refresh=False):
+    """Path of the chromedriver binary, resolved at most once per process.
+
+    The path webdriver-manager returns is kept in `cache_path`, so the next
+    process skips the version lookup as long as the binary is still there.
+    """
+    global _driver_path
+    with _driver_lock:
+        if _driver_path and not refresh and os.path.exists(_driver_path):
+            return _driver_path
+
+        path = os.environ.get("CHROMEDRIVER")
+        if not path and not refresh and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    path = json.load(f).get("path")
+            except (OSError, ValueError):
+                path = None
+            if path and not os.access(path, os.X_OK):
+                path = None
+
+        if not path:
+            path = ChromeDriverManager().install()
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            tmp = f"{cache_path}.partial"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"path": path, "resolved": time.strftime("%Y-%m-%dT%H:%M:%S%z")}, f, indent=2)
+            os.replace(tmp, cache_path)
+
+        _driver_path = path
+        return path
+
+
+def chrome_options():
+    """Headless Chrome options shared by the listing and detail scrapers"""
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    return options
+
+
+def start_chrome(options):
+    """Start Chrome with the cached chromedriver.
+
+    A cached driver that no longer matches an updated Chrome fails to create
+    a session; the driver is then resolved again and the start retried once.
+    """
+    try:
+        return webdriver.Chrome(service=Service(driver_path()), options=options)
+    except SessionNotCreatedException:
+        if os.environ.get("CHROMEDRIVER"):
+            raise
+        return webdriver.Chrome(service=Service(driver_path(refresh=True)), options=options)
+
+
+def is_crash(error):
+    """Whether an exception means the browser itself is gone"""
+    message = str(error).lower()
+    return any(marker in message for marker in CRASH_MARKERS)
+
+
+def _quit(driver):
+    """Close a driver, ignoring errors from an already dead browser"""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+# --- Sessions ---
+class Session:
+    """One browser and the number of pages it has loaded"""
+
+    def __init__(self, driver, startup):
+        self.driver = driver
+        self.startup = startup
+        self.pages = 0
+
+
+class SessionManager:
+    """Hands out browser sessions and keeps released ones warm for reuse.
+
+    `start()` returns a new driver. With `keep_warm` off, released sessions
+    are closed instead of kept, which is the behaviour of a pool that owns
+    its browsers. `max_pages` of None never recycles a healthy session.
+    """
+
+    def __init__(self, start, max_pages=DEFAULT_MAX_PAGES, keep_warm=True, observe=None):
+        self.start = start
+        self.max_pages = max_pages
+        self.keep_warm = keep_warm
+        self.observe = observe
+        self.idle = []
+        self.counts = {"started": 0, "reused": 0, "start_failed": 0}
+        self.recycled = {}
+        self.timings = {"browser_startup": [], "browser_recycle": [], "health_check": []}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _time(self, stage, seconds):
+        with self._lock:
+            self.timings[stage].append(seconds)
+        if self.observe is not None:
+            self.observe(stage, seconds)
+
+    def acquire(self):
+        """A healthy warm session if there is one, else a newly started browser"""
+        while True:
+            with self._lock:
+                session = self.idle.pop() if self.idle else None
+            if session is None:
+                break
+            if self.healthy(session):
+                with self._lock:
+                    self.counts["reused"] += 1
+                return session
+            self._recycle(session, "unhealthy")
+
+        started = time.perf_counter()
+        try:
+            driver = self.start()
+        except Exception:
+            with self._lock:
+                self.counts["start_failed"] += 1
+            raise
+        elapsed = time.perf_counter() - started
+        self._time("browser_startup", elapsed)
+        with self._lock:
+            self.counts["started"] += 1
+        return Session(driver, elapsed)
+
+    def healthy(self, session):
+        """Whether the browser still runs JavaScript"""
+        started = time.perf_counter()
+        try:
+            session.driver.execute_script("return 1")
+            ok = True
+        except Exception:
+            ok = False
+        self._time("health_check", time.perf_counter() - started)
+        return ok
+
+    def _recycle(self, session, reason):
+        started = time.perf_counter()
+        _quit(session.driver)
+        self._time("browser_recycle", time.perf_counter() - started)
+        with self._lock:
+            self.recycled[reason] = self.recycled.get(reason, 0) + 1
+
+    def page_done(self, session, error=None):
+        """Count a loaded page. Returns the session to keep using, or None once it was recycled.
+
+        After an error the session is kept only if the browser did not crash
+        and still passes a health check; a page that merely failed to parse
+        is no reason to start a new browser.
+        """
+        session.pages += 1
+        if error is not None:
+            if is_crash(error):
+                self._recycle(session, "crash")
+                return None
+            if not self.healthy(session):
+                self._recycle(session, "unhealthy")
+                return None
+        if self.max_pages and session.pages >= self.max_pages:
+            self._recycle(session, "max_pages")
+            return None
+        return session
+
+    def release(self, session):
+        """Give a session back for the next `acquire`"""
+        if session is None:
+            return
+        with self._lock:
+            if self.keep_warm and not self._closed:
+                self.idle.append(session)
+                return
+        _quit(session.driver)
+
+    def close(self):
+        """Close every warm session; sessions released later are closed too"""
+        with self._lock:
+            self._closed = True
+            idle, self.idle = self.idle, []
+        for session in idle:
+            _quit(session.driver)
+
+    def summary(self):
+        startup = self.timings["browser_startup"]
+        recycle = self.timings["browser_recycle"]
+        recycled = sum(self.recycled.values())
+        lines = [
+            f"🌐 Browser sessions: {self.counts['started']} started, {self.counts['reused']} reused warm, "
+            f"{recycled} recycled, {len(self.idle)} kept warm"
+        ]
+        if startup:
+            lines.append(f"   startup  p50 {percentile(startup, 50) * 1000:.0f} ms  "
+                         f"p95 {percentile(startup, 95) * 1000:.0f} ms  total {sum(startup):.1f}s")
+        if recycle:
+            reasons = ", ".join(f"{reason} {count}" for reason, count in sorted(self.recycled.items()))
+            lines.append(f"   recycle  p50 {percentile(recycle, 50) * 1000:.0f} ms  ({reasons})")
+        if self.counts["start_failed"]:
+            lines.append(f"   ⚠️ {self.counts['start_failed']} browsers failed to start")
+        return "\n".join(lines)
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_sessions(name, start, max_pages=DEFAULT_MAX_PAGES):
+    """The process-wide session manager called `name`, created on first use.
+
+    Its warm sessions outlive a single scraper run and are closed when the
+    process exits. `start` of the first call is kept, so every caller of one
+    name must start identical browsers. `max_pages` of a later call replaces
+    the earlier one.
+    """
+    with _shared_lock:
+        manager = _shared.get(name)
+        if manager is None:
+            manager = _shared[name] = SessionManager(start, max_pages=max_pages)
+            atexit.register(manager.close)
+        manager.max_pages = max_pages
+        return manager
@@ -0,0 +1,320 @@
+"""Fast extractor for museum.nl detail pages.
+
+`extract_museum(html)` turns a detail page into a record with the fields in
+`record_writer.FIELDS`. Pages are parsed with lxml and every selector and
+regex is compiled once at import time, which is several times cheaper per
+page than BeautifulSoup with html.parser. `extract_bs4.py` keeps the old
+extractor so `bench_extract.py` can check both produce identical records.
+"""
+import datetime
+import re
+
+from lxml import etree
+
+from record_writer import DAYS
+
+# --- Day names ---
+day_aliases = {
+    "mon": "Monday", "tue": "Tuesday", "wed": "Wednesday",
+    "thu": "Thursday", "fri": "Friday", "sat": "Saturday", "sun": "Sunday",
+    "monday": "Monday", "tuesday": "Tuesday", "wednesday": "Wednesday",
+    "thursday": "Thursday", "friday": "Friday", "saturday": "Saturday", "sunday": "Sunday"
+}
+SHORT_DAYS = list(day_aliases.keys())[:7]  # Only use short forms for range detection
+DAY_SET = frozenset(DAYS)
+
+# Keywords on the "today" block of the practical info; the first match wins
+DAY_KEYWORDS = (
+    ("monday", "Monday"), ("maandag", "Monday"),
+    ("tuesday", "Tuesday"), ("dinsdag", "Tuesday"),
+    ("wednesday", "Wednesday"), ("woensdag", "Wednesday"),
+    ("thursday", "Thursday"), ("donderdag", "Thursday"),
+    ("friday", "Friday"), ("vrijdag", "Friday"),
+    ("saturday", "Saturday"), ("zaterdag", "Saturday"),
+    ("sunday", "Sunday"), ("zondag", "Sunday"),
+    ("today", None), ("vandaag", None),  # Will use actual scraping day
+)
+
+# --- Precompiled patterns ---
+TIME_RE = re.compile(r'\d{1,2}:\d{2}')
+TIME_RANGE_RE = re.compile(r'(\d{1,2}:\d{2}\s*-\s*\d{1,2}:\d{2})')
+DAY_NAME_RE = re.compile(r'(mon|tue|wed|thu|fri|sat|sun)')
+DAY_AND_HOURS_RE = re.compile(r'([a-zA-Z\s\-]+)\s+(\d{1,2}:\d{2}.*|closed)')
+
+# Image file names: remove special chars, replace spaces with underscores
+FILENAME_STEPS = (
+    (re.compile(r'[&|,\'"(){}[\]]'), ''),  # Remove these chars
+    (re.compile(r'[/\\-]'), '_'),  # Replace with underscore
+    (re.compile(r'[^\w\s_]'), ''),  # Remove any remaining special chars
+    (re.compile(r'\s+'), '_'),  # Replace spaces with underscores
+    (re.compile(r'_+'), '_'),  # Replace multiple underscores with single
+)
+
+
+# --- Precompiled selectors ---
+def _cls(name):
+    # The plain substring test is cheap and rules out most elements before the exact token match
+    return f"contains(@class, '{name}') and contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+FIRST_H1 = etree.XPath("(//h1)[1]")
+FIRST_META = etree.XPath(f"(//*[{_cls('meta')}])[1]")
+OPENING_SECTION = etree.XPath("(//*[@id='openingHours'])[1]")
+OPENING_SECTION_FALLBACK = etree.XPath(
+    f"(//*[{_cls('opening-hours')}] | //*[{_cls('openingHours')}]"
+    " | //*[contains(@class, 'opening')] | //*[contains(@class, 'hours')])[1]"
+)
+FIRST_TABLE = etree.XPath("(.//table)[1]")
+TABLE_ROWS = etree.XPath(".//tr")
+ROW_CELLS = etree.XPath(".//*[self::td or self::th]")
+CURRENT_DAY = etree.XPath(f"(//*[{_cls('practical-info_blocks')}]/*[1])[1]")
+ADDRESS = etree.XPath(f"(//*[{_cls('practical-info')}]//address)[1]")
+MAPS_LINK = etree.XPath(f"(//*[{_cls('practical-info')}]//address//a[@href])[1]")
+PHONE_ICON = etree.XPath(f"(//*[{_cls('practical-info')}]//*[{_cls('icon-phone')}])[1]")
+WEBSITE_ICON = etree.XPath(f"(//*[{_cls('practical-info')}]//*[{_cls('icon-website')}])[1]")
+PARENT_P = etree.XPath("ancestor::p[1]")
+LINK_WITH_HREF = etree.XPath("(.//a[@href])[1]")
+DESCRIPTION = etree.XPath(
+    f"(//*[{_cls('expander')}][{_cls('read-more')}][{_cls('text-block')}])[1]"
+)
+DESCRIPTION_BLOCKS = etree.XPath(".//*[self::h3 or self::p]")
+MUSEUM_CARD = etree.XPath(f"boolean(//*[{_cls('museum-card-valid')}])")
+FACILITIES = etree.XPath(f"//*[{_cls('summary-block_iconlist')}]//*[{_cls('visually-hidden')}]")
+
+# Text inside these never counts as page text, same as BeautifulSoup's get_text
+NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+
+def _first(xpath, node):
+    found = xpath(node)
+    return found[0] if found else None
+
+
+def _strings(element):
+    """Text nodes under an element in document order, skipping comments and scripts"""
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def get_text(element, separator="", strip=False):
+    """Equivalent of BeautifulSoup's Tag.get_text for an lxml element"""
+    if strip:
+        return separator.join(text for text in (s.strip() for s in _strings(element)) if text)
+    return separator.join(_strings(element))
+
+
+# --- Opening hours ---
+def expand_days(day_part):
+    parts = [p.strip().lower() for p in day_part.strip().split('-')]
+    if len(parts) == 2:
+        try:
+            i1 = SHORT_DAYS.index(parts[0])
+            i2 = SHORT_DAYS.index(parts[1])
+        except ValueError:
+            return []
+        if i1 <= i2:
+            return [day_aliases[d] for d in SHORT_DAYS[i1:i2 + 1]]
+        return [day_aliases[d] for d in SHORT_DAYS[i1:] + SHORT_DAYS[:i2 + 1]]
+    elif len(parts) == 1:
+        return [day_aliases.get(parts[0], "")]
+    return []
+
+
+def _set_days(opening_hours, day_part, hours):
+    """Store hours for a single day or a "Thu - Sat" style range"""
+    if ' - ' in day_part:
+        day_parts = [d.strip() for d in day_part.split(' - ')]
+        if len(day_parts) == 2:
+            for day in expand_days(f"{day_parts[0]}-{day_parts[1]}"):
+                if day:
+                    opening_hours[day] = hours
+    else:
+        day = day_aliases.get(day_part.lower(), day_part.title())
+        if day in DAY_SET:
+            opening_hours[day] = hours
+
+
+def parse_hours_table(table):
+    """Method 1: a table with one row per day or day range"""
+    opening_hours = {}
+    for row in TABLE_ROWS(table):
+        cells = ROW_CELLS(row)
+        if len(cells) < 2:
+            continue
+        day_cell = get_text(cells[0]).strip()
+        hours_cell = get_text(cells[1]).strip()
+
+        # Skip header rows
+        if day_cell.lower() == 'day' or hours_cell.lower() == 'opening hours':
+            continue
+        if day_cell and hours_cell:
+            _set_days(opening_hours, day_cell, hours_cell)
+    return opening_hours
+
+
+def parse_hours_text(hours_text):
+    """Method 2: free text with one "Mon - Fri 10:00 - 17:00" or "Monday: ..." per line"""
+    opening_hours = {}
+    for line in hours_text.splitlines():
+        line = line.strip()
+        lower = line.lower()
+        if not line or "route" in lower or "plan" in lower or "overview" in lower:
+            continue
+
+        if ':' in line and not TIME_RE.search(line):
+            # Pattern: "Monday: 10:00 - 17:00" (but not time like "10:00")
+            day_part, hours_part = (part.strip() for part in line.split(':', 1))
+            if '-' in day_part and not any(char.isdigit() for char in day_part):
+                for day in expand_days(day_part):
+                    if day:
+                        opening_hours[day] = hours_part
+            else:
+                day = day_aliases.get(day_part.lower(), day_part.title())
+                if day in DAY_SET:
+                    opening_hours[day] = hours_part
+
+        # Space separation for patterns like "Thu - Sat  12:00 - 17:00"
+        elif DAY_NAME_RE.search(lower):
+            match = DAY_AND_HOURS_RE.match(lower)
+            if match:
+                _set_days(opening_hours, match.group(1).strip(), match.group(2).strip())
+    return opening_hours
+
+
+def parse_opening_hours(opening_section):
+    """Returns (hours per day, method used): method is "table", "text" or "none" """
+    if opening_section is None:
+        return {}, "none"
+    try:
+        table = _first(FIRST_TABLE, opening_section)
+        if table is not None:
+            return parse_hours_table(table), "table"
+        return parse_hours_text(get_text(opening_section)), "text"
+    except Exception as e:
+        print(f"Error parsing opening hours: {e}")
+        return {}, "none"
+
+
+def current_day_hours(text, today=None):
+    """(day, hours) shown on the practical info "today" block, hours may be "Time unknown" """
+    lower = text.lower()
+    detected_day = None
+    for keyword, day in DAY_KEYWORDS:
+        if keyword in lower:
+            detected_day = day
+            break
+
+    # If no specific day detected, assume it's showing today's info
+    if not detected_day:
+        detected_day = today or datetime.datetime.now().strftime('%A')
+
+    if "closed" in lower or "gesloten" in lower:
+        return detected_day, "Closed"
+    time_match = TIME_RANGE_RE.search(text)
+    return detected_day, time_match.group(1) if time_match else "Time unknown"
+
+
+def clean_filename(name):
+    clean_name = name.lower()
+    for pattern, replacement in FILENAME_STEPS:
+        clean_name = pattern.sub(replacement, clean_name)
+    return clean_name.strip('_')  # Remove leading/trailing underscores
+
+
+# --- Extract One Museum ---
+def extract_museum(html, info=None):
+    """Extract a museum record from detail page HTML.
+
+    If `info` is a dict it receives diagnostics about the page, currently
+    `hours_method`: "table", "text", "current_day" (only the today block had
+    hours), "unparsed" (a section was found but not understood) or "none".
+    """
+    root = etree.HTML(html)  # Plain lxml elements, lxml.html element classes only add overhead
+
+    # --- Basic Info ---
+    name = _first(FIRST_H1, root)
+    name = get_text(name, strip=True) if name is not None else ""
+
+    meta = _first(FIRST_META, root)
+    meta = get_text(meta, strip=True) if meta is not None else ""
+
+    # --- Opening Hours ---
+    opening_section = _first(OPENING_SECTION, root)
+    if opening_section is None:
+        opening_section = _first(OPENING_SECTION_FALLBACK, root)
+    opening_hours, hours_method = parse_opening_hours(opening_section)
+    if opening_section is not None and not opening_hours:
+        hours_method = "unparsed"
+
+    # Add today's hours from the practical info if the structured data misses them
+    current_day_info = _first(CURRENT_DAY, root)
+    if current_day_info is not None:
+        day, hours = current_day_hours(get_text(current_day_info, strip=True))
+        if day not in opening_hours and hours != "Time unknown":
+            opening_hours[day] = hours
+            if hours_method in ("none", "unparsed"):
+                hours_method = "current_day"
+
+    # --- Basic Details ---
+    address_elem = _first(ADDRESS, root)
+    address = get_text(address_elem, " ", strip=True).replace("Plan route", "").strip() if address_elem is not None else ""
+
+    maps_elem = _first(MAPS_LINK, root)
+    maps_link = maps_elem.get("href") if maps_elem is not None else ""
+
+    phone = ""
+    phone_elem = _first(PHONE_ICON, root)
+    if phone_elem is not None:
+        phone_p = _first(PARENT_P, phone_elem)
+        phone = get_text(phone_p, strip=True) if phone_p is not None else ""
+
+    website = ""
+    website_elem = _first(WEBSITE_ICON, root)
+    if website_elem is not None:
+        website_p = _first(PARENT_P, website_elem)
+        website_link = _first(LINK_WITH_HREF, website_p) if website_p is not None else None
+        website = website_link.get("href") if website_link is not None else ""
+
+    # --- Clean Text Description ---
+    desc_section = _first(DESCRIPTION, root)
+    formatted_description = ""
+    if desc_section is not None:
+        blocks = []
+        current_heading = None
+        for elem in DESCRIPTION_BLOCKS(desc_section):
+            text = get_text(elem, " ", strip=True)
+            if elem.tag == "h3":
+                current_heading = text
+            elif text:
+                if current_heading:
+                    blocks.append(f"{current_heading}\n{text}")
+                    current_heading = None
+                else:
+                    blocks.append(text)
+        formatted_description = "\n\n".join(blocks)
+
+    # --- Museum Card + Facilities ---
+    museum_card = "Yes" if MUSEUM_CARD(root) else "No"
+    facility_list = ", ".join(get_text(item, strip=True) for item in FACILITIES(root))
+
+    if info is not None:
+        info["hours_method"] = hours_method
+
+    return {
+        "Name": name,
+        "Open Today": meta,
+        **{f"Opening_{day}": opening_hours.get(day, "Time unknown") for day in DAYS},
+        "Address": address,
+        "Google Maps": maps_link,
+        "Phone": phone,
+        "Description_Text": formatted_description,
+        "Museum Card": museum_card,
+        "Facilities": facility_list,
+        "Image": f"images/{clean_filename(name)}.jpg",
+        "Official_Website": website,
+    }
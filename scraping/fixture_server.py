@@ -0,0 +1,289 @@
+"""Local HTTP server with saved museum.nl-style pages for offline scraper runs.
+
+The pages in `scraping/fixtures/detail/` are served under numbered URLs so any
+number of museums can be simulated:
+
+    python3 scraping/fixture_server.py --count 509 --write-urls data/fixture_urls.json
+    python3 scraping/scrape_detail_pages.py --urls data/fixture_urls.json --workers 4 \
+        --output data/cache/fixture/museum_details --cache-dir data/cache/fixture --metrics ""
+
+The scrapers write to the real dataset by default, so point them at a
+scratch path like above when running against the fixtures.
+
+The website line of the practical info (`.icon-website`) is synthetic markup
+added for the Official_Website field, not copied from a saved page; check the
+selector against the live site before relying on that field there.
+
+The listing is served too, `LISTING_PAGE_SIZE` cards per `?mv-PageIndex=N`
+page, with one card for every simulated museum:
+
+    python3 scraping/scrape_museum_list.py --base-url http://127.0.0.1:8765 --output-dir data/cache/fixture
+"""
+import argparse
+import html
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from record_writer import DAYS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "museum_details_full.json")
+LISTING_PATH = "/en/see-and-do/museums"
+DETAIL_PREFIX = "/en/see-and-do/museums/"
+LISTING_PAGE_SIZE = 12
+SHORT_DAYS = [day[:3] for day in DAYS]
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{name} | Museum.nl</title>
+</head>
+<body>
+  <main class="detail-page">
+    <header class="detail-header">
+      <h1>{name}</h1>
+      <p class="meta">{open_today}</p>
+    </header>
+
+    <section class="summary-block{card_class}">
+      <ul class="summary-block_iconlist">{facilities}
+      </ul>
+    </section>
+
+    <section class="practical-info">
+      <div class="practical-info_blocks">
+        <div class="practical-info_block"><strong>Today</strong> {today}</div>
+      </div>
+      <address>
+        {address}
+        <a href="{maps}">Plan route</a>
+      </address>
+      <p><span class="icon icon-phone" aria-hidden="true"></span>{phone}</p>
+      <!-- Synthetic website line, see the module docstring -->
+      <p><span class="icon icon-website" aria-hidden="true"></span><a href="{website}">Visit museum website</a></p>
+    </section>
+
+    <section id="openingHours" class="opening-hours">
+      <h2>Opening hours</h2>
+      <table>
+        <thead>
+          <tr><th>Day</th><th>Opening hours</th></tr>
+        </thead>
+        <tbody>{hours}
+        </tbody>
+      </table>
+    </section>
+
+    <section class="expander read-more text-block">{description}
+    </section>
+    <button class="read-more-toggle" type="button">Read more</button>
+  </main>
+</body>
+</html>
+"""
+
+LISTING_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Museums | Museum.nl</title>
+</head>
+<body>
+  <main class="overview-page">
+    <div class="see-and-do-overview">{cards}
+    </div>
+  </main>
+</body>
+</html>
+"""
+
+CARD_TEMPLATE = """
+      <div class="see-and-do-card">
+        <a href="{href}">
+          <div class="see-and-do-card_img"><img src="/{image}" alt=""></div>
+          <span class="typography heading-3">{name}</span>
+          <span class="typography buttons-and-labels">{city}</span>
+        </a>
+      </div>"""
+
+# "Street 1 1234 AB City": the city is whatever follows the postcode
+CITY_RE = re.compile(r"\d{4}\s?[A-Z]{2}\s+(.+)$")
+
+
+def load_detail_pages():
+    """Read the saved detail pages, sorted by file name"""
+    detail_dir = os.path.join(FIXTURE_DIR, "detail")
+    pages = []
+    for file in sorted(os.listdir(detail_dir)):
+        if file.endswith(".html"):
+            with open(os.path.join(detail_dir, file), "rb") as f:
+                pages.append((file[:-len(".html")], f.read()))
+    return pages
+
+
+def render_detail_page(museum, today="Monday"):
+    """Render a dataset record as a museum.nl-style detail page"""
+    e = html.escape
+
+    # Group consecutive days with the same hours into "Mon - Wed" rows
+    rows = []
+    for i, day in enumerate(DAYS):
+        hours = museum.get(f"Opening_{day}", "")
+        if hours in ("", "Time unknown"):
+            continue
+        if rows and rows[-1][2] == hours and rows[-1][1] == i - 1:
+            rows[-1][1] = i
+        else:
+            rows.append([i, i, hours])
+    hours_rows = "".join(
+        f"\n          <tr><td>{SHORT_DAYS[first]}{' - ' + SHORT_DAYS[last] if last > first else ''}</td>"
+        f"<td>{e(hours)}</td></tr>"
+        for first, last, hours in rows
+    )
+
+    description = ""
+    for block in museum.get("Description_Text", "").split("\n\n"):
+        heading, _, text = block.rpartition("\n")
+        if heading:
+            description += f"\n      <h3>{e(heading)}</h3>"
+        if text:
+            description += f"\n      <p>{e(text)}</p>"
+
+    facilities = "".join(
+        f'\n        <li><span class="icon" aria-hidden="true"></span><span class="visually-hidden">{e(f)}</span></li>'
+        for f in museum.get("Facilities", "").split(", ") if f
+    )
+
+    return DETAIL_TEMPLATE.format(
+        name=e(museum.get("Name", "")),
+        open_today=e(museum.get("Open Today", "")),
+        card_class=" museum-card-valid" if museum.get("Museum Card") == "Yes" else "",
+        facilities=facilities,
+        today=e(museum.get(f"Opening_{today}", "")),
+        address=e(museum.get("Address", "")),
+        maps=e(museum.get("Google Maps", "")),
+        phone=e(museum.get("Phone", "")),
+        website=e(museum.get("Official_Website", "")),
+        hours=hours_rows,
+        description=description,
+    )
+
+
+def dataset_pages(path=DATASET_PATH):
+    """Detail pages rendered from every museum in the dataset, as (slug, html) pairs"""
+    with open(path, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+    return [(f"museum-{i}", render_detail_page(museum)) for i, museum in enumerate(museums)]
+
+
+def fixture_urls(base_url, count):
+    """Detail URLs for `count` simulated museums, cycling through the saved pages"""
+    pages = load_detail_pages()
+    return [
+        f"{base_url}{DETAIL_PREFIX}{pages[i % len(pages)][0]}-{i}"
+        for i in range(count)
+    ]
+
+
+def listing_cards(count, path=DATASET_PATH):
+    """Listing card HTML for `count` simulated museums, linking to the fixture detail URLs"""
+    with open(path, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+    e = html.escape
+    cards = []
+    for i, url in enumerate(fixture_urls("", count)):
+        museum = museums[i % len(museums)]
+        city = CITY_RE.search(museum.get("Address", ""))
+        cards.append(CARD_TEMPLATE.format(
+            href=e(url),
+            image=e(museum.get("Image", "")),
+            name=e(museum.get("Name", "")),
+            city=e(city.group(1) if city else ""),
+        ))
+    return cards
+
+
+def render_listing_page(cards, page_index, page_size=LISTING_PAGE_SIZE):
+    """One listing page; pages past the end have no cards"""
+    start = (page_index - 1) * page_size
+    return LISTING_TEMPLATE.format(cards="".join(cards[start:start + page_size]) if page_index > 0 else "")
+
+
+def make_handler(pages, latency, cards):
+    by_slug = dict(pages)
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)  # Simulate network and server time
+
+            parts = urlsplit(self.path)
+            path = parts.path
+            body = None
+            if path == LISTING_PATH:
+                try:
+                    page_index = int(parse_qs(parts.query).get("mv-PageIndex", ["1"])[0])
+                except ValueError:
+                    page_index = 1
+                body = render_listing_page(cards, page_index).encode("utf-8")
+            elif path.startswith(DETAIL_PREFIX):
+                slug = path[len(DETAIL_PREFIX):].rsplit("-", 1)[0]
+                body = by_slug.get(slug)
+
+            if body is None:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def start_server(port=0, latency=0.0, count=509):
+    """Start the fixture server in a background thread and return (server, base_url)"""
+    handler = make_handler(load_detail_pages(), latency, listing_cards(count))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved museum.nl pages for offline scraping")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of simulated latency per request")
+    parser.add_argument("--count", type=int, default=509, help="Number of museum URLs to simulate")
+    parser.add_argument("--write-urls", help="Write the simulated detail URLs to this JSON file")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.latency, args.count)
+    if args.write_urls:
+        with open(args.write_urls, "w", encoding="utf-8") as f:
+            json.dump(fixture_urls(base_url, args.count), f, indent=2)
+        print(f"📝 Wrote {args.count} fixture URLs to {args.write_urls}")
+
+    print(f"🌐 Serving fixture pages on {base_url}{DETAIL_PREFIX} and the listing on {base_url}{LISTING_PATH}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""HTTP-only fast path for the detail page scraper.
+
+Most of a museum.nl detail page is rendered on the server, so the raw HTML can
+be fetched with a pooled keep-alive HTTP session and run through the normal
+extractor. Only pages that come back without the required fields need a real
+browser.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+
+def create_session(pool_size):
+    """A requests session that keeps up to `pool_size` connections per host alive"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en"})
+    return session
+
+
+def fetch_html(session, url, timeout):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def fetch_all(urls, handle, workers=8, timeout=10.0, stats=None):
+    """Fetch every URL over HTTP and call `handle(index, url, html, seconds)` as each page arrives.
+
+    A URL whose request failed is handled with `html=None` so the caller can
+    send it down the browser path. `seconds` is how long the request took. Nothing is collected here, so memory does
+    not grow with the number of URLs.
+    """
+    session = create_session(workers)
+
+    def fetch_one(job):
+        index, url = job
+        started = time.perf_counter()
+        try:
+            html = fetch_html(session, url, timeout)
+        except Exception as e:
+            print(f"  ⚠️ HTTP fetch failed for {url}: {e}")
+            html = None
+        elapsed = time.perf_counter() - started
+        if stats is not None:
+            stats.add("http", elapsed)
+        handle(index, url, html, elapsed)
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for _ in pool.map(fetch_one, enumerate(urls)):
+            pass
+    except KeyboardInterrupt:
+        # Only the requests in flight finish, the queued ones are dropped
+        pool.shutdown(cancel_futures=True)
+        raise
+    finally:
+        pool.shutdown()
+        session.close()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class PathStats:
+    """Thread safe page counts and latencies per extraction path"""
+
+    def __init__(self):
+        self.latencies = {}
+        self._lock = threading.Lock()
+
+    def add(self, path, seconds):
+        with self._lock:
+            self.latencies.setdefault(path, []).append(seconds)
+
+    def summary(self):
+        lines = ["🛣️ Pages per extraction path:"]
+        for path, values in self.latencies.items():
+            mean = sum(values) / len(values)
+            lines.append(
+                f"   {path:<8} {len(values):>4} pages  "
+                f"mean {mean * 1000:.0f} ms  p50 {percentile(values, 50) * 1000:.0f} ms  "
+                f"p95 {percentile(values, 95) * 1000:.0f} ms"
+            )
+        return "\n".join(lines)
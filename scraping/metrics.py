@@ -0,0 +1,190 @@
+"""Per-page timing spans and run counters for the detail page scraper.
+
+Every page gets a span that times its stages (driver.get, the readiness waits,
+the read-more click, page_source, parsing, caching) and records how it ended.
+Spans are written as one JSON line per page the moment the page is done, so a
+slow or interrupted run can be inspected while it is still going:
+
+    {"run": "...", "url": "...", "path": "browser", "status": "ok",
+     "hours_method": "table", "timed_out": false, "total": 1.84,
+     "stages": {"get": 0.91, "wait_page": 0.42, ...}}
+
+At the end of the run `summary()` gives p50/p95/p99 per stage and
+`write_prometheus()` exports the same numbers for the node exporter's
+textfile collector.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from http_fetch import percentile
+
+QUANTILES = [50, 95, 99]
+
+# Counters named "<group>_<label>" are exported as one labelled metric per group
+COUNTER_GROUPS = {
+    "pages": ("pages", "status", "Pages handled in the last run by outcome"),
+    "path": ("pages_by_path", "path", "Pages handled in the last run by extraction path"),
+    "hours": ("pages_by_hours_method", "method", "Pages per opening hours parsing method in the last run"),
+}
+
+
+class PageSpan:
+    """Stage timings and outcome of one page.
+
+    `elapsed` backdates the span for work done before it was created, like an
+    HTTP request whose page is only handed over once it has arrived.
+    """
+
+    def __init__(self, url, path, elapsed=0.0):
+        self.url = url
+        self.path = path
+        self.started = time.time() - elapsed
+        self.stages = {}
+        self.status = None
+        self.hours_method = None
+        self.timed_out = False
+        self._started = time.perf_counter() - elapsed
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+
+class RunMetrics:
+    """Thread safe collector of page spans, stage timings and counters.
+
+    With a `path`, every finished span is appended to that file as JSONL.
+    Earlier runs stay in the file; each line carries its `run` id.
+    Only the stage durations are kept in memory for the percentiles.
+    """
+
+    def __init__(self, path=None):
+        self.run_id = time.strftime("%Y%m%dT%H%M%S")
+        self.path = path
+        self.counters = {}
+        self.samples = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, stage, seconds):
+        """Record a stage timing that does not belong to a single page span, like writing"""
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def finish(self, span, status):
+        """Close a span: update the counters and write its JSON line"""
+        span.status = status
+        total = span.elapsed()
+        line = json.dumps({
+            "run": self.run_id,
+            "url": span.url,
+            "path": span.path,
+            "status": status,
+            "hours_method": span.hours_method,
+            "timed_out": span.timed_out,
+            "started": round(span.started, 3),
+            "total": round(total, 4),
+            "stages": {stage: round(seconds, 4) for stage, seconds in span.stages.items()},
+        }, ensure_ascii=False)
+
+        with self._lock:
+            for name in (f"pages_{status}", f"path_{span.path}",
+                         f"hours_{span.hours_method}" if span.hours_method else None,
+                         "timeouts" if span.timed_out else None):
+                if name:
+                    self.counters[name] = self.counters.get(name, 0) + 1
+            for stage, seconds in span.stages.items():
+                self.samples.setdefault(stage, []).append(seconds)
+            self.samples.setdefault(f"total_{span.path}", []).append(total)
+            if self._file:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def summary(self):
+        lines = ["📐 Time per stage:"]
+        lines.append(f"   {'stage':<18} {'count':>6} " + " ".join(f"{f'p{q}':>8}" for q in QUANTILES) + f" {'total':>9}")
+        for stage, values in self.samples.items():
+            lines.append(
+                f"   {stage:<18} {len(values):>6} "
+                + " ".join(f"{percentile(values, q) * 1000:>6.0f}ms" for q in QUANTILES)
+                + f" {sum(values):>8.1f}s"
+            )
+        counters = ", ".join(f"{name} {value}" for name, value in sorted(self.counters.items()))
+        lines.append(f"🔢 Counters: {counters or 'none'}")
+        if self.path:
+            lines.append(f"📝 Page spans written to {self.path}")
+        return "\n".join(lines)
+
+    def write_prometheus(self, path, prefix="museum_scraper"):
+        """Export counters and stage quantiles in the Prometheus text format.
+
+        The file is written next to its destination and renamed into place,
+        so the textfile collector never reads a half written file.
+        """
+        lines = []
+        for group, (metric, label, help_text) in COUNTER_GROUPS.items():
+            values = [
+                (name[len(group) + 1:], value) for name, value in sorted(self.counters.items())
+                if name.startswith(f"{group}_")
+            ]
+            if not values:
+                continue
+            metric = f"{prefix}_{metric}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            lines += [f'{metric}{{{label}="{key}"}} {value}' for key, value in values]
+        lines += [
+            f"# HELP {prefix}_page_timeouts Pages that hit the page timeout in the last run",
+            f"# TYPE {prefix}_page_timeouts gauge",
+            f"{prefix}_page_timeouts {self.counters.get('timeouts', 0)}",
+        ]
+
+        lines += [
+            f"# HELP {prefix}_stage_seconds Time spent per page in each scraping stage during the last run",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, values in self.samples.items():
+            for q in QUANTILES:
+                lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{q / 100:g}"}} {percentile(values, q):.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {sum(values):.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {len(values)}')
+
+        lines += [
+            f"# HELP {prefix}_last_run_timestamp_seconds When the last run finished",
+            f"# TYPE {prefix}_last_run_timestamp_seconds gauge",
+            f"{prefix}_last_run_timestamp_seconds {time.time():.0f}",
+            f"# HELP {prefix}_last_run_duration_seconds How long the last run took",
+            f"# TYPE {prefix}_last_run_duration_seconds gauge",
+            f"{prefix}_last_run_duration_seconds {time.time() - self.started:.3f}",
+        ]
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
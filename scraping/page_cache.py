@@ -0,0 +1,138 @@
+"""On-disk page cache and checkpoint journal for resumable scraping.
+
+Fetched pages are stored by the SHA-256 of their content, and every extracted
+record is appended to a JSONL journal keyed by URL as soon as it is scraped. A
+run that crashes or is interrupted can be restarted and picks up where it
+stopped, and `--only-changed` can compare content hashes with the last run.
+"""
+import datetime
+import hashlib
+import json
+import os
+import threading
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """Content addressed store of page HTML: <dir>/<first 2 hex chars>/<sha256>.html"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, digest):
+        return os.path.join(self.directory, digest[:2], f"{digest}.html")
+
+    def put(self, html):
+        digest = content_hash(html)
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so a crash never leaves a half written page
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp, path)
+        return digest
+
+    def get(self, digest):
+        path = self.path(digest)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of extracted records; the last entry for a URL wins.
+
+    Only the hashes and the byte offset of each URL's latest entry are kept in
+    memory; records are read back from the file when they are needed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._load()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab")
+        self._reader = open(path, "rb")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None  # Line cut short by a crash
+                if entry is not None:
+                    self.entries[entry["url"]] = {
+                        "page_hash": entry["page_hash"],
+                        "source_hash": entry["source_hash"],
+                        "offset": offset,
+                    }
+                offset += len(line)
+
+    def __contains__(self, url):
+        return url in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def read_record(self, url):
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        with self._lock:
+            self._reader.seek(entry["offset"])
+            return json.loads(self._reader.readline())["record"]
+
+    def record(self, url, record, page_hash, source_hash=None):
+        line = json.dumps({
+            "url": url,
+            "page_hash": page_hash,
+            "source_hash": source_hash,
+            "scraped_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "record": record,
+        }, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(line)
+            self._file.flush()
+            self.entries[url] = {"page_hash": page_hash, "source_hash": source_hash, "offset": offset}
+
+    def reset(self):
+        with self._lock:
+            self.entries = {}
+            self._file.truncate(0)
+
+    def close(self):
+        self._file.close()
+        self._reader.close()
+
+
+class ScrapeStore:
+    """Page cache plus checkpoint journal living in one cache directory"""
+
+    def __init__(self, directory):
+        self.pages = PageCache(os.path.join(directory, "pages"))
+        self.journal = CheckpointJournal(os.path.join(directory, "journal.jsonl"))
+
+    def record(self, url, html, record, source_hash=None):
+        """Cache the page and checkpoint its record; records without a name are left for a retry"""
+        page_hash = self.pages.put(html)
+        if record and record["Name"]:
+            self.journal.record(url, record, page_hash, source_hash)
+        return page_hash
+
+    def close(self):
+        self.journal.close()
@@ -0,0 +1,126 @@
+"""Readiness based waits for museum detail pages.
+
+Instead of sleeping a fixed 3 seconds per page (plus 1 second after the
+read-more click), these waits poll the page and return as soon as the
+elements the extractor needs are present, up to a per-page timeout.
+"""
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# The old scraper slept this long on every page, and again after clicking read-more
+LEGACY_PAGE_SLEEP = 3.0
+LEGACY_TOGGLE_SLEEP = 1.0
+
+# h1 and the practical info block are always rendered; the opening hours block
+# is optional, so it only has to be there once the document finished loading
+PAGE_READY_JS = """
+return !!document.querySelector("h1")
+    && !!document.querySelector(".practical-info")
+    && (!!document.querySelector("#openingHours") || document.readyState === "complete");
+"""
+
+# State of the read-more block and its toggle, taken before the click to compare with after it
+DESCRIPTION_STATE_JS = """
+var block = document.querySelector(".expander.read-more");
+var toggle = document.querySelector(".read-more-toggle");
+if (!block) return null;
+return [block.className, block.getAttribute("aria-expanded"), block.getAttribute("data-expanded"),
+        toggle ? toggle.getAttribute("aria-expanded") : null, block.textContent.length].join("|");
+"""
+
+# The paragraphs are often in the server-rendered HTML already, so they alone do not
+# show the toggle worked: the block also has to be marked expanded (aria-expanded,
+# data-expanded or an expanded/open class) or differ from its state before the click
+DESCRIPTION_READY_JS = """
+var block = document.querySelector(".expander.read-more");
+var toggle = document.querySelector(".read-more-toggle");
+if (!block) return true;
+var expanded = block.getAttribute("aria-expanded") === "true"
+    || block.getAttribute("data-expanded") === "true"
+    || (!!toggle && toggle.getAttribute("aria-expanded") === "true")
+    || /(^|[\\s-])(expanded|open)(\\s|$)/.test(block.className);
+var state = [block.className, block.getAttribute("aria-expanded"), block.getAttribute("data-expanded"),
+             toggle ? toggle.getAttribute("aria-expanded") : null, block.textContent.length].join("|");
+return (expanded || state !== arguments[0]) && Array.prototype.some.call(block.querySelectorAll("p"), function (p) {
+    return p.textContent.trim().length > 0;
+});
+"""
+
+# A listing page is ready once its cards are there, or it finished loading without any
+LISTING_READY_JS = """
+return !!document.querySelector(".see-and-do-card") || document.readyState === "complete";
+"""
+
+
+class WaitStats:
+    """Thread safe record of how long each page waited compared to the old fixed sleeps"""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.pages = 0
+        self.waited = 0.0
+        self.legacy = 0.0
+        self.timeouts = []
+        self._lock = threading.Lock()
+
+    def add(self, url, waited, legacy, timed_out):
+        with self._lock:
+            self.pages += 1
+            self.waited += waited
+            self.legacy += legacy
+            if timed_out:
+                self.timeouts.append(url)
+
+    def summary(self):
+        saved = self.legacy - self.waited
+        lines = [
+            f"⏱️ Waited {self.waited:.1f}s on {self.pages} pages "
+            f"(fixed sleeps would have taken {self.legacy:.1f}s, saved {saved:.1f}s)"
+        ]
+        if self.timeouts:
+            lines.append(f"⚠️ {len(self.timeouts)} pages hit the {self.timeout:g}s timeout:")
+            lines.extend(f"   {url}" for url in self.timeouts)
+        return "\n".join(lines)
+
+
+def _wait_for(driver, script, timeout, *args):
+    """Poll `script` until it returns true; returns False if the timeout was hit"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(script, *args)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_page(driver, timeout):
+    """Block until the detail page content is present. Returns (seconds waited, timed out)"""
+    started = time.perf_counter()
+    ready = _wait_for(driver, PAGE_READY_JS, timeout)
+    return time.perf_counter() - started, not ready
+
+
+def description_state(driver):
+    """Snapshot of the read-more block to pass to `wait_for_description` after clicking"""
+    return driver.execute_script(DESCRIPTION_STATE_JS)
+
+
+def wait_for_description(driver, timeout, before=None):
+    """Block until the read-more block is expanded and has its text. Returns (seconds waited, timed out)
+
+    `before` is the `description_state` from before the click.
+    """
+    started = time.perf_counter()
+    ready = _wait_for(driver, DESCRIPTION_READY_JS, timeout, before)
+    return time.perf_counter() - started, not ready
+
+
+def wait_for_listing(driver, timeout):
+    """Block until the listing cards are present. Returns (seconds waited, timed out)"""
+    started = time.perf_counter()
+    ready = _wait_for(driver, LISTING_READY_JS, timeout)
+    return time.perf_counter() - started, not ready
@@ -0,0 +1,115 @@
+"""One schema, three outputs: streaming CSV, JSONL and JSON writer for museum records.
+
+Records are written to every output the moment they are extracted, so memory
+stays flat no matter how many museums are scraped, and the CSV the scraper
+keeps and the JSON the site loads can no longer drift apart.
+"""
+import csv
+import json
+import os
+import threading
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Field order of every output, matching data/museum_details_full.json
+FIELDS = [
+    "Name", "Open Today",
+    *[f"Opening_{day}" for day in DAYS],
+    "Address", "Google Maps", "Phone",
+    "Description_Text", "Museum Card", "Facilities", "Image",
+    "Official_Website",
+]
+
+
+def empty_record():
+    return dict.fromkeys(FIELDS, "")
+
+
+class RecordWriter:
+    """Append records to CSV, JSONL and a JSON array in a single pass.
+
+    Everything is written to `<path>.partial` files first and only moved into
+    place by `close()` of a complete run, so the site never loads a half
+    written dataset.
+    """
+
+    def __init__(self, csv_path, jsonl_path=None, json_path=None):
+        self.paths = [path for path in (csv_path, jsonl_path, json_path) if path]
+        self.count = 0
+        self._lock = threading.Lock()
+
+        self._csv_file = self._open(csv_path)
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=FIELDS)
+        self._csv.writeheader()
+        self._jsonl = self._open(jsonl_path)
+        self._json = self._open(json_path)
+        if self._json:
+            self._json.write("[")
+
+    @staticmethod
+    def _open(path):
+        if not path:
+            return None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return open(f"{path}.partial", "w", newline="", encoding="utf-8")
+
+    def write(self, record):
+        record = {field: record.get(field, "") for field in FIELDS}
+        with self._lock:
+            self._csv.writerow(record)
+            self._csv_file.flush()
+            if self._jsonl:
+                self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._jsonl.flush()
+            if self._json:
+                # Same layout as the existing data/museum_details_full.json
+                item = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+                self._json.write(("," if self.count else "") + "\n  " + item)
+                self._json.flush()
+            self.count += 1
+
+    def close(self, promote=True):
+        """Finish the files. Without `promote` they are left as `.partial` and the outputs keep the last run"""
+        if self._json:
+            self._json.write("\n]\n" if self.count else "]\n")
+        for handle in (self._csv_file, self._jsonl, self._json):
+            if handle:
+                handle.close()
+        if promote:
+            for path in self.paths:
+                os.replace(f"{path}.partial", path)
+
+
+class OrderedRecords:
+    """Reorder buffer: records arrive from workers in any order and are emitted by position.
+
+    `put(index, record)` accepts either a record or a zero-argument callable
+    that loads it, so records from an earlier run can be read lazily when
+    their turn comes. Only records that arrived ahead of a slower page are
+    held in memory.
+    """
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.next_index = 0
+        self.pending = {}
+        self._lock = threading.Lock()
+
+    def put(self, index, record):
+        with self._lock:
+            self.pending[index] = record
+            while self.next_index in self.pending:
+                self._emit(self.pending.pop(self.next_index))
+                self.next_index += 1
+
+    def _emit(self, record):
+        if callable(record):
+            record = record()
+        if record is not None:
+            self.emit(record)
+
+    def flush(self):
+        """Emit whatever is left after an interrupted run, skipping the gaps"""
+        with self._lock:
+            for index in sorted(self.pending):
+                self._emit(self.pending.pop(index))
@@ -1,343 +1,389 @@
+import argparse
 import json
-import csv
+import os
+import shutil
+import subprocess
+import sys
+import threading
 import time
-import re
-from collections import OrderedDict
-from selenium import webdriver
+from functools import partial
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from bs4 import BeautifulSoup
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import NoSuchElementException
+
+from browser_sessions import CHROME_SESSIONS, DEFAULT_MAX_PAGES, chrome_options, shared_sessions, start_chrome
+from extract import extract_museum
+from http_fetch import PathStats, fetch_all
+from metrics import PageSpan, RunMetrics
+from page_cache import CheckpointJournal, ScrapeStore, content_hash
+from record_writer import OrderedRecords, RecordWriter, empty_record
+from page_waits import (LEGACY_PAGE_SLEEP, LEGACY_TOGGLE_SLEEP, WaitStats, description_state, wait_for_description,
+                        wait_for_page)
+from worker_pool import BrowserPool
+
+DEFAULT_PAGE_TIMEOUT = 10.0
+
+# The dataset the site is built from, and the script that builds the files it actually loads
+SITE_OUTPUT = "data/museum_details_full"
+SHARDS_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts",
+                             "build_data_shards.py")
 
 # --- Headless Browser Setup ---
-options = Options()
-options.add_argument("--headless=new")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
-options.add_argument("--disable-gpu")
-options.add_argument("--window-size=1920,1080")
-
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-# Load all museum detail page URLs
-with open("data/detail_urls.json", "r", encoding="utf-8") as f:
-    urls = json.load(f)
-
-print(f"🎯 Found {len(urls)} museums to scrape")
-print(f"⏱️ Estimated time: {len(urls) * 4 // 60} minutes (assuming 4 seconds per museum)")
-
-results = []
-
-# --- Helper for day range expansion ---
-day_aliases = {
-    "mon": "Monday", "tue": "Tuesday", "wed": "Wednesday",
-    "thu": "Thursday", "fri": "Friday", "sat": "Saturday", "sun": "Sunday",
-    "monday": "Monday", "tuesday": "Tuesday", "wednesday": "Wednesday",
-    "thursday": "Thursday", "friday": "Friday", "saturday": "Saturday", "sunday": "Sunday"
+def create_driver():
+    """Start a headless Chrome instance for one scraping worker"""
+    return start_chrome(chrome_options())
+
+# The scraper only guesses these (the image path from the name), so a value in the existing dataset wins
+CURATED_FIELDS = ["Image"]
+
+# Pages missing any of these after the HTTP fast path are scraped again with a browser
+REQUIRED_FIELDS = ["Name", "Address", "Description_Text"]
+
+HOURS_STATUS = {
+    "table": "✅ Opening hours parsed successfully",
+    "text": "✅ Opening hours parsed successfully (text fallback)",
+    "current_day": "⚠️ Opening hours only known for today",
+    "unparsed": "⚠️ Opening hours section found but couldn't parse",
+    "none": "⚠️ No opening hours section found",
 }
 
-def expand_days(day_part):
-    days = list(day_aliases.keys())[:7]  # Only use short forms for range detection
-    parts = [p.strip().lower() for p in day_part.strip().split('-')]
-    if len(parts) == 2:
-        try:
-            i1 = days.index(parts[0])
-            i2 = days.index(parts[1])
-            if i1 <= i2:
-                return [day_aliases[d] for d in days[i1:i2+1]]
-            else:
-                return [day_aliases[d] for d in days[i1:] + days[:i2+1]]
-        except ValueError:
-            return []
-    elif len(parts) == 1:
-        return [day_aliases.get(parts[0], "")]
-    return []
-
-def parse_opening_hours(opening_section):
-    """Parse opening hours from the section with better error handling"""
-    opening_hours = OrderedDict()
-    if not opening_section:
-        return opening_hours
-    
+
+def extract_record(html, span=None):
+    """Extract a museum record from the detail page HTML and log how it went"""
+    info = {}
+    started = time.perf_counter()
+    record = extract_museum(html, info)
+    if span is not None:
+        span.add("parse", time.perf_counter() - started)
+        span.hours_method = info["hours_method"]
+    print(f"  {HOURS_STATUS[info['hours_method']]}")
+    if record["Name"]:
+        print(f"  ✅ Successfully scraped: {record['Name']}")
+    return record
+
+
+# --- Scrape One Museum ---
+def load_page(driver, url, wait_stats=None, page_timeout=DEFAULT_PAGE_TIMEOUT, span=None):
+    """Render a museum detail page, expand its description and return the HTML"""
+    if span is None:
+        span = PageSpan(url, "browser")
+    with span.stage("get"):
+        driver.get(url)
+    waited, timed_out = wait_for_page(driver, page_timeout)
+    span.add("wait_page", waited)
+    legacy = LEGACY_PAGE_SLEEP
+
+    # Try to click read-more button if it exists
     try:
-        # Method 1: Look for table structure (most common on this site)
-        table = opening_section.find('table')
-        if table:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    day_cell = cells[0].get_text().strip()
-                    hours_cell = cells[1].get_text().strip()
-                    
-                    # Skip header rows
-                    if day_cell.lower() in ['day'] or hours_cell.lower() in ['opening hours']:
-                        continue
-                    
-                    # Parse day ranges and individual days
-                    if day_cell and hours_cell:
-                        # Handle ranges like "Thu - Sat", "Mon - Tue", "Fri - Tue"
-                        if ' - ' in day_cell:
-                            day_parts = [d.strip() for d in day_cell.split(' - ')]
-                            if len(day_parts) == 2:
-                                expanded_days = expand_days(f"{day_parts[0]}-{day_parts[1]}")
-                                for day in expanded_days:
-                                    if day:
-                                        opening_hours[day] = hours_cell
-                        else:
-                            # Single day
-                            day = day_aliases.get(day_cell.lower(), day_cell.title())
-                            if day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-                                opening_hours[day] = hours_cell
-            
-            return opening_hours
-        
-        # Method 2: Fallback to text parsing
-        hours_text = opening_section.get_text()
-        
-        # Parse the text line by line
-        for line in hours_text.splitlines():
-            line = line.strip()
-            if not line or "route" in line.lower() or "plan" in line.lower() or "overview" in line.lower():
-                continue
-                
-            # Try different splitting patterns
-            if ':' in line and not re.search(r'\d{1,2}:\d{2}', line):
-                # Pattern: "Monday: 10:00 - 17:00" (but not time like "10:00")
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    day_part = parts[0].strip()
-                    hours_part = parts[1].strip()
-                    
-                    # Handle day ranges and individual days
-                    if '-' in day_part and not any(char.isdigit() for char in day_part):
-                        expanded_days = expand_days(day_part)
-                        for day in expanded_days:
-                            if day:
-                                opening_hours[day] = hours_part
-                    else:
-                        day = day_aliases.get(day_part.lower(), day_part.title())
-                        if day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-                            opening_hours[day] = hours_part
-            
-            # Try space separation for patterns like "Thu - Sat  12:00 - 17:00"
-            elif re.search(r'(mon|tue|wed|thu|fri|sat|sun)', line.lower()):
-                # Look for day patterns followed by times
-                match = re.match(r'([a-zA-Z\s\-]+)\s+(\d{1,2}:\d{2}.*|closed)', line.lower())
-                if match:
-                    day_part = match.group(1).strip()
-                    hours_part = match.group(2).strip()
-                    
-                    if ' - ' in day_part:
-                        day_parts = [d.strip() for d in day_part.split(' - ')]
-                        if len(day_parts) == 2:
-                            expanded_days = expand_days(f"{day_parts[0]}-{day_parts[1]}")
-                            for day in expanded_days:
-                                if day:
-                                    opening_hours[day] = hours_part
-                    else:
-                        day = day_aliases.get(day_part.lower(), day_part.title())
-                        if day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-                            opening_hours[day] = hours_part
-                            
-    except Exception as e:
-        print(f"Error parsing opening hours: {e}")
-    
-    return opening_hours
-
-# --- Scrape Loop ---
-try:
-    for i, url in enumerate(urls, 1):
-        print(f"🔄 Visiting ({i}/{len(urls)}): {url}")
-        
+        with span.stage("click"):
+            button = driver.find_element(By.CLASS_NAME, "read-more-toggle")
+            clicked = button.is_displayed()
+            if clicked:
+                before = description_state(driver)
+                driver.execute_script("arguments[0].click();", button)
+        if clicked:
+            toggle_waited, toggle_timed_out = wait_for_description(driver, page_timeout, before)
+            span.add("wait_description", toggle_waited)
+            waited += toggle_waited
+            timed_out = timed_out or toggle_timed_out
+            legacy += LEGACY_TOGGLE_SLEEP
+    except NoSuchElementException:
+        pass
+
+    span.timed_out = timed_out
+    if timed_out:
+        print(f"  ⚠️ Page not ready after {page_timeout:g}s, extracting what is there")
+    if wait_stats is not None:
+        wait_stats.add(url, waited, legacy, timed_out)
+
+    with span.stage("page_source"):
+        return driver.page_source
+
+
+def scrape_museum(driver, url, wait_stats=None, page_timeout=DEFAULT_PAGE_TIMEOUT, store=None, source_hash=None,
+                  metrics=None):
+    """Visit a museum detail page and return its record"""
+    span = PageSpan(url, "browser")
+    try:
+        html = load_page(driver, url, wait_stats, page_timeout, span)
+        record = extract_record(html, span)
+        if store is not None:
+            with span.stage("cache"):
+                store.record(url, html, record, source_hash=source_hash)
+    except Exception:
+        if metrics is not None:
+            metrics.finish(span, "error")
+        raise
+    if metrics is not None:
+        metrics.finish(span, "ok" if record["Name"] else "failed")
+    return record
+
+# --- HTTP First, Browser Fallback ---
+def missing_fields(record):
+    if record is None:
+        return list(REQUIRED_FIELDS)
+    return [field for field in REQUIRED_FIELDS if not record[field]]
+
+
+def scrape_http_first(urls, on_result, workers, wait_stats, page_timeout, store=None, only_changed=False,
+                      metrics=None, sessions=None):
+    """Extract pages from raw HTML and only open a browser for incomplete pages.
+
+    Incomplete pages are handed to the browser pool as soon as they are seen,
+    so both paths run at the same time. With `only_changed`, a page whose raw
+    HTML hashes the same as in the last run reuses the journaled record
+    instead of being extracted again.
+    """
+    path_stats = PathStats()
+    source_hashes = {}
+    counts = {"unchanged": 0, "fallback": 0}
+    counts_lock = threading.Lock()
+
+    def timed_scrape(driver, url):
+        started = time.perf_counter()
         try:
-            driver.get(url)
-            time.sleep(3)  # Increased wait time
-
-            # Try to click read-more button if it exists
-            try:
-                button = driver.find_element(By.CLASS_NAME, "read-more-toggle")
-                if button.is_displayed():
-                    driver.execute_script("arguments[0].click();", button)
-                    time.sleep(1)
-            except NoSuchElementException:
-                pass
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-
-            # --- Basic Info ---
-            name = soup.select_one("h1")
-            name = name.get_text(strip=True) if name else ""
-
-            meta = soup.select_one(".meta")
-            meta = meta.get_text(strip=True) if meta else ""
-
-            # --- Opening Hours with improved parsing ---
-            opening_section = soup.select_one("#openingHours")
-            if not opening_section:
-                # Try alternative selectors
-                opening_section = soup.select_one(".opening-hours, .openingHours, [class*='opening'], [class*='hours']")
-            
-            opening_hours = parse_opening_hours(opening_section)
-            
-            # --- Get current day's opening hours from practical info ---
-            current_day_info = soup.select_one(".practical-info_blocks > *:first-child")
-            if current_day_info:
-                current_day_text = current_day_info.get_text(strip=True)
-                print(f"  Current day info: {current_day_text}")
-                
-                # Try to detect which day is being shown
-                detected_day = None
-                day_keywords = {
-                    'monday': 'Monday', 'maandag': 'Monday',
-                    'tuesday': 'Tuesday', 'dinsdag': 'Tuesday', 
-                    'wednesday': 'Wednesday', 'woensdag': 'Wednesday',
-                    'thursday': 'Thursday', 'donderdag': 'Thursday',
-                    'friday': 'Friday', 'vrijdag': 'Friday',
-                    'saturday': 'Saturday', 'zaterdag': 'Saturday',
-                    'sunday': 'Sunday', 'zondag': 'Sunday',
-                    'today': None, 'vandaag': None  # Will use actual scraping day
-                }
-                
-                for keyword, day in day_keywords.items():
-                    if keyword in current_day_text.lower():
-                        detected_day = day
-                        break
-                
-                # If no specific day detected, assume it's showing today's info
-                if not detected_day:
-                    # Get current day of scraping
-                    import datetime
-                    scraping_day = datetime.datetime.now().strftime('%A')
-                    detected_day = scraping_day
-                
-                # Extract opening hours from current day info
-                if "closed" in current_day_text.lower() or "gesloten" in current_day_text.lower():
-                    current_day_hours = "Closed"
-                else:
-                    # Try to extract time pattern
-                    time_match = re.search(r'(\d{1,2}:\d{2}\s*-\s*\d{1,2}:\d{2})', current_day_text)
-                    if time_match:
-                        current_day_hours = time_match.group(1)
-                    else:
-                        current_day_hours = "Time unknown"
-                
-                # Add the detected day's hours if missing from structured data
-                if detected_day and detected_day not in opening_hours and current_day_hours != "Time unknown":
-                    opening_hours[detected_day] = current_day_hours
-                    print(f"  Added {detected_day} hours from current day info: {current_day_hours}")
-            
-            opening_hours = opening_hours
-            
-            # Log opening hours status
-            if opening_section and opening_hours:
-                print(f"  ✅ Opening hours parsed successfully")
-            elif opening_section:
-                print(f"  ⚠️ Opening hours section found but couldn't parse")
-            else:
-                print(f"  ⚠️ No opening hours section found")
-
-            # --- Basic Details ---
-            address_elem = soup.select_one(".practical-info address")
-            address = address_elem.get_text(" ", strip=True).replace("Plan route", "").strip() if address_elem else ""
-
-            maps_elem = soup.select_one(".practical-info address a[href]")
-            maps_link = maps_elem['href'] if maps_elem else ""
-
-            phone_elem = soup.select_one(".practical-info .icon-phone")
-            phone = phone_elem.find_parent("p").get_text(strip=True) if phone_elem else ""
-
-            # --- Clean Text Description ---
-            desc_section = soup.select_one(".expander.read-more.text-block")
-            formatted_description = ""
-            if desc_section:
-                blocks = []
-                current_heading = None
-                for elem in desc_section.find_all(['h3', 'p']):
-                    text = elem.get_text(" ", strip=True)
-                    if elem.name == "h3":
-                        current_heading = text
-                    elif elem.name == "p" and text:
-                        if current_heading:
-                            blocks.append(f"{current_heading}\n{text}")
-                            current_heading = None
-                        else:
-                            blocks.append(text)
-                formatted_description = "\n\n".join(blocks)
-
-            # --- Museum Card + Facilities ---
-            museum_card = "Yes" if soup.select_one(".museum-card-valid") else "No"
-
-            facility_list = ""
-            try:
-                facility_items = soup.select(".summary-block_iconlist .visually-hidden")
-                facilities = [item.get_text(strip=True) for item in facility_items]
-                facility_list = ", ".join(facilities)
-            except Exception:
-                pass
-
-            # --- Image Path ---
-            # Clean filename: remove special chars, replace spaces with underscores
-            clean_name = name.lower()
-            clean_name = re.sub(r'[&|,\'"(){}[\]]', '', clean_name)  # Remove these chars
-            clean_name = re.sub(r'[/\\-]', '_', clean_name)  # Replace with underscore
-            clean_name = re.sub(r'[^\w\s_]', '', clean_name)  # Remove any remaining special chars
-            clean_name = re.sub(r'\s+', '_', clean_name)  # Replace spaces with underscores
-            clean_name = re.sub(r'_+', '_', clean_name)  # Replace multiple underscores with single
-            clean_name = clean_name.strip('_')  # Remove leading/trailing underscores
-            filename = clean_name + ".jpg"
-            image_path = f"images/{filename}"
-
-            # --- Add to Results with "Time unknown" for missing days ---
-            results.append([
-                name, meta,
-                opening_hours.get("Monday", "Time unknown"),
-                opening_hours.get("Tuesday", "Time unknown"),
-                opening_hours.get("Wednesday", "Time unknown"),
-                opening_hours.get("Thursday", "Time unknown"),
-                opening_hours.get("Friday", "Time unknown"),
-                opening_hours.get("Saturday", "Time unknown"),
-                opening_hours.get("Sunday", "Time unknown"),
-                address, maps_link, phone,
-                formatted_description,
-                museum_card, facility_list, image_path
-            ])
-            
-            print(f"  ✅ Successfully scraped: {name}")
-            
-        except Exception as e:
-            print(f"  ❌ Error scraping {url}: {e}")
-            # Add empty row to maintain consistency
-            results.append(["", "", "", "", "", "", "", "", "", "", "", "", "", "", "", ""])
-        
-        # Progress indicator every 50 museums
-        if i % 50 == 0:
-            successful = len([r for r in results if r[0]])
-            print(f"📈 Progress: {i}/{len(urls)} completed ({successful} successful)")
-            
-except KeyboardInterrupt:
-    print("\n⚠️ Scraping interrupted by user")
-finally:
-    # Always close the driver
-    driver.quit()
-    print("🔒 Browser closed")
-
-# --- Save to CSV ---
-if results:
-    with open("data/museum_details_full.csv", "w", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            "Name", "Open Today",
-            "Opening_Monday", "Opening_Tuesday", "Opening_Wednesday",
-            "Opening_Thursday", "Opening_Friday", "Opening_Saturday", "Opening_Sunday",
-            "Address", "Google Maps", "Phone",
-            "Description_Text", "Museum Card", "Facilities", "Image"
-        ])
-        writer.writerows(results)
-    
-    print(f"✅ Scraped {len(results)} museums with clean structure and saved to CSV.")
-    print(f"📊 Success rate: {len([r for r in results if r[0]])} successful / {len(results)} total")
-else:
-    print("❌ No data was scraped successfully.")
+            return scrape_museum(driver, url, wait_stats=wait_stats, page_timeout=page_timeout,
+                                 store=store, source_hash=source_hashes.pop(url, None), metrics=metrics)
+        finally:
+            path_stats.add("browser", time.perf_counter() - started)
+
+    browsers = BrowserPool(timed_scrape, sessions or create_driver, on_result, workers=workers,
+                           empty_result=empty_record(), total=len(urls))
+
+    def finish(span, status):
+        if metrics is not None:
+            metrics.finish(span, status)
+
+    def handle(index, url, html, seconds):
+        span = PageSpan(url, "http", elapsed=seconds)
+        span.add("fetch", seconds)
+        if html is not None:
+            source_hash = content_hash(html)
+            if only_changed:
+                previous = store.journal.get(url)
+                if previous and previous["source_hash"] == source_hash:
+                    with counts_lock:
+                        counts["unchanged"] += 1
+                    finish(span, "unchanged")
+                    on_result(index, lambda: store.journal.read_record(url))
+                    return
+
+            record = extract_record(html, span)
+            missing = missing_fields(record)
+            if not missing:
+                if store is not None:
+                    with span.stage("cache"):
+                        store.record(url, html, record, source_hash=source_hash)
+                finish(span, "ok")
+                on_result(index, record)
+                return
+            source_hashes[url] = source_hash
+            finish(span, "fallback")
+        else:
+            record = None
+            missing = missing_fields(None)
+            finish(span, "fetch_failed")
+
+        print(f"  ↪️ Browser fallback for {url} (missing: {', '.join(missing)})")
+        with counts_lock:
+            counts["fallback"] += 1
+        # If the browser fails too, the HTTP record only lacks the missing fields
+        browsers.submit(index, url, fallback=record)
+
+    try:
+        fetch_all(urls, handle, workers=workers * 4, timeout=page_timeout, stats=path_stats)
+    except KeyboardInterrupt:
+        print("\n⚠️ Scraping interrupted by user, waiting for workers to finish their page")
+        browsers.stop()
+        return False
+    except Exception:
+        browsers.close()
+        raise
+    completed = browsers.close()
+
+    print(path_stats.summary())
+    if only_changed:
+        print(f"   {counts['unchanged']} pages unchanged since the last run")
+    print(f"   {len(urls) - counts['unchanged'] - counts['fallback']} pages extracted over HTTP, "
+          f"{counts['fallback']} needed the browser fallback")
+    return completed
+
+
+def load_existing(json_path):
+    """Museums of the dataset this run replaces, by name"""
+    if not os.path.exists(json_path):
+        return {}
+    with open(json_path, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+    existing = {}
+    for museum in museums:
+        existing.setdefault(museum.get("Name"), museum)
+    return existing
+
+
+def keep_existing_fields(record, existing):
+    """The record with the curated fields, and fields this scrape came back without, taken from the dataset"""
+    previous = existing.get(record["Name"])
+    if not previous:
+        return record
+    record = dict(record)
+    for field, value in previous.items():
+        if value and (field in CURATED_FIELDS or not record.get(field)):
+            record[field] = value
+    return record
+
+
+def rebuild_shards(json_path):
+    """Rebuild data/manifest.json and the shards, which is what the site loads instead of the full JSON"""
+    print("🧩 Rebuilding the data shards for the site...")
+    if subprocess.run([sys.executable, SHARDS_SCRIPT, "--input", json_path]).returncode:
+        print("⚠️ Could not rebuild the data shards, run python3 scripts/build_data_shards.py by hand")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape museum detail pages from museum.nl")
+    parser.add_argument("--urls", default="data/detail_urls.json", help="JSON list of detail page URLs")
+    parser.add_argument("--output", default=SITE_OUTPUT,
+                        help="Output path without extension; .csv, .jsonl and .json are written")
+    parser.add_argument("--workers", type=int, default=4, help="Number of parallel browser workers")
+    parser.add_argument("--mode", choices=["browser", "http"], default="browser",
+                        help="browser: render every page in Chrome; http: fetch raw HTML and only use Chrome as fallback")
+    parser.add_argument("--page-timeout", type=float, default=DEFAULT_PAGE_TIMEOUT,
+                        help="Maximum seconds to wait for a page to render")
+    parser.add_argument("--cache-dir", default="data/cache", help="Where fetched pages and the checkpoint journal are kept")
+    parser.add_argument("--fresh", action="store_true", help="Ignore the checkpoint journal and scrape every URL again")
+    parser.add_argument("--only-changed", action="store_true",
+                        help="Fetch every page over HTTP but only re-extract pages whose content changed since the last run")
+    parser.add_argument("--metrics", default="data/metrics/scrape_spans.jsonl",
+                        help="Where per-page timing spans are written as JSONL (empty to disable)")
+    parser.add_argument("--prometheus", help="Also export the run metrics to this Prometheus textfile (.prom)")
+    parser.add_argument("--recycle-after", type=int, default=DEFAULT_MAX_PAGES,
+                        help="Pages a browser loads before it is replaced by a fresh one (0 for never)")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Replace the outputs even if failed pages have no earlier record, dropping those museums")
+    args = parser.parse_args()
+
+    # Load all museum detail page URLs
+    with open(args.urls, "r", encoding="utf-8") as f:
+        urls = json.load(f)
+
+    store = ScrapeStore(args.cache_dir)
+    # Last good record per URL, for pages that fail this time
+    fallback_journal = store.journal
+    if args.fresh:
+        # The cleared journal's records stay available as that fallback
+        previous_path = f"{store.journal.path}.previous"
+        if os.path.exists(store.journal.path):
+            shutil.copyfile(store.journal.path, previous_path)
+        fallback_journal = CheckpointJournal(previous_path)
+        store.journal.reset()
+    existing = load_existing(f"{args.output}.json")
+
+    if args.only_changed:
+        pending = list(range(len(urls)))
+    else:
+        pending = [i for i, url in enumerate(urls) if url not in store.journal]
+        if len(pending) < len(urls):
+            print(f"⏩ Resuming: {len(urls) - len(pending)} museums already in {store.journal.path}")
+
+    workers = max(1, min(args.workers, len(pending)))
+    if not pending:
+        print("✅ Every museum is already in the checkpoint journal (use --fresh or --only-changed to refresh)")
+    print(f"🎯 Found {len(pending)} museums to scrape with {workers} browser worker(s)")
+    print(f"⏱️ Estimated time: at most {len(pending) * 4 // 60 // workers} minutes (pages are scraped as soon as they are ready)")
+
+    writer = RecordWriter(f"{args.output}.csv", f"{args.output}.jsonl", f"{args.output}.json")
+    failed = []
+    recovered = []
+
+    metrics = RunMetrics(args.metrics or None)
+    # Warm browsers from an earlier run in this process are reused
+    sessions = shared_sessions(CHROME_SESSIONS, create_driver, max_pages=args.recycle_after or None)
+    sessions.observe = metrics.observe
+
+    def emit(record):
+        if record["Name"]:
+            started = time.perf_counter()
+            writer.write(keep_existing_fields(record, existing))
+            metrics.observe("write", time.perf_counter() - started)
+        else:
+            failed.append(record)
+
+    ordered = OrderedRecords(emit)
+
+    # Museums finished in an earlier run are read back from the journal when their turn comes
+    pending_set = set(pending)
+    for i, url in enumerate(urls):
+        if i not in pending_set:
+            ordered.put(i, lambda url=url: store.journal.read_record(url))
+    pending_urls = [urls[i] for i in pending]
+
+    def on_result(index, record):
+        if not callable(record) and not (record and record["Name"]):
+            # A failed or never visited page keeps the museum from its last good scrape
+            url = pending_urls[index]
+            previous = fallback_journal.read_record(url)
+            if previous:
+                print(f"  ↩️ Keeping the last good record for {url}")
+                recovered.append(url)
+                record = previous
+        ordered.put(pending[index], record)
+
+    started = time.perf_counter()
+    wait_stats = WaitStats(args.page_timeout)
+    # Stays False when the run is interrupted or raises, so the outputs are not replaced by a subset
+    completed = False
+    try:
+        if not pending:
+            completed = True
+        elif args.mode == "http" or args.only_changed:
+            completed = scrape_http_first(pending_urls, on_result, workers, wait_stats, args.page_timeout,
+                              store=store, only_changed=args.only_changed, metrics=metrics, sessions=sessions)
+        else:
+            scrape = partial(scrape_museum, wait_stats=wait_stats, page_timeout=args.page_timeout, store=store,
+                             metrics=metrics)
+            browsers = BrowserPool(scrape, sessions, on_result, workers=workers,
+                                   empty_result=empty_record(), total=len(pending_urls))
+            for job in enumerate(pending_urls):
+                browsers.submit(*job)
+            completed = browsers.close()
+    finally:
+        sessions.observe = None
+        ordered.flush()
+        # A failed museum without an earlier record would disappear from the dataset
+        promote = completed and writer.count > 0 and (not failed or args.allow_missing)
+        writer.close(promote=promote)
+        store.close()
+        if fallback_journal is not store.journal:
+            fallback_journal.close()
+        metrics.close()
+        if args.prometheus:
+            metrics.write_prometheus(args.prometheus)
+
+    elapsed = time.perf_counter() - started
+    print(f"⏱️ Scraped {len(pending)} pages in {elapsed:.1f}s ({len(pending) / elapsed if elapsed else 0:.2f} pages/s)")
+    print(wait_stats.summary())
+    print(sessions.summary())
+    print(metrics.summary())
+    if args.prometheus:
+        print(f"📤 Prometheus metrics written to {args.prometheus}")
+
+    if recovered:
+        print(f"↩️ {len(recovered)} pages failed and kept their last good record")
+    if not completed:
+        print(f"⚠️ Run did not finish, {', '.join(writer.paths)} keep the previous data. "
+              f"{writer.count} museums are in the .partial files; run again to resume from the journal")
+    elif writer.count and not promote:
+        print(f"⚠️ {len(failed)} pages failed without an earlier record, so {', '.join(writer.paths)} keep the "
+              f"previous data. Run again to retry them, or pass --allow-missing to save the "
+              f"{writer.count} museums in the .partial files")
+    elif writer.count:
+        print(f"✅ Saved {writer.count} museums to {', '.join(writer.paths)}")
+        print(f"📊 Success rate: {writer.count} successful / {writer.count + len(failed)} total")
+        if os.path.abspath(args.output) == os.path.abspath(SITE_OUTPUT):
+            rebuild_shards(f"{args.output}.json")
+    else:
+        print("❌ No data was scraped successfully.")
+
+
+if __name__ == "__main__":
+    main()
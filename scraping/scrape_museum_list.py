@@ -1,64 +1,239 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from bs4 import BeautifulSoup
+"""Discover museum detail URLs by walking the museum.nl listing pages.
+
+Listing pages (`?mv-PageIndex=1`, `2`, ...) are fetched a batch at a time in
+parallel until a page comes back without any card that was not seen before,
+so new museums are picked up without editing a page index by hand. Detail
+URLs are deduplicated and compared with the previous `data/detail_urls.json`;
+the added and removed URLs are written next to it.
+
+    python3 scraping/scrape_museum_list.py                       # render listing pages in Chrome
+    python3 scraping/scrape_museum_list.py --mode http --workers 8   # raw HTML over HTTP
+"""
+import argparse
 import csv
 import json
+import os
+import queue
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from webdriver_manager.chrome import ChromeDriverManager
-
-# Setup headless browser
-options = Options()
-options.add_argument("--headless")
-options.add_argument("--no-sandbox")
-options.add_argument("--disable-dev-shm-usage")
+from bs4 import BeautifulSoup
 
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+from browser_sessions import CHROME_SESSIONS, chrome_options, shared_sessions, start_chrome
+from http_fetch import create_session, fetch_html
+from page_waits import wait_for_listing
+from worker_pool import BrowserPool
 
 BASE_URL = "https://www.museum.nl"
-LISTING_URL = f"{BASE_URL}/en/see-and-do/museums?mv-PageIndex=25"
-
-print("🔄 Loading page...")
-driver.get(LISTING_URL)
-time.sleep(5)  # wait for JavaScript to load everything
-
-soup = BeautifulSoup(driver.page_source, "html.parser")
-driver.quit()
-
-csv_rows = []
-detail_urls = []
-
-cards = soup.select(".see-and-do-card")
-print(f"🔍 Found {len(cards)} museum cards")
-
-for card in cards:
-    name_elem = card.select_one(".typography.heading-3")
-    name = name_elem.get_text(strip=True) if name_elem else ""
-
-    city_elem = card.select_one(".typography.buttons-and-labels")
-    city = city_elem.get_text(strip=True) if city_elem else ""
-
-    img_elem = card.select_one(".see-and-do-card_img img")
-    img_url = img_elem['src'] if img_elem and img_elem.has_attr('src') else ""
-    if img_url.startswith("/"):
-        img_url = BASE_URL + img_url
-
-    link_elem = card.select_one("a")
-    detail_url = BASE_URL + link_elem['href'] if link_elem and link_elem.has_attr('href') else ""
-    if detail_url:
-        detail_urls.append(detail_url)
-
-    csv_rows.append([name, city, img_url])
+LISTING_PATH = "/en/see-and-do/museums"
 
-# Save to CSV
-with open("museum_list.csv", "w", newline='', encoding='utf-8') as f:
-    writer = csv.writer(f)
-    writer.writerow(["Name", "City", "Image_URL"])
-    writer.writerows(csv_rows)
+LIST_FIELDS = ["Name", "City", "Image_URL"]
 
-# Save URLs to JSON
-with open("detail_urls.json", "w", encoding='utf-8') as f:
-    json.dump(detail_urls, f, indent=2)
 
-print(f"✅ Saved {len(csv_rows)} museums to CSV.")
\ No newline at end of file
+# --- Headless Browser Setup ---
+def create_driver():
+    return start_chrome(chrome_options())
+
+
+def listing_url(base_url, page_index):
+    return f"{base_url}{LISTING_PATH}?mv-PageIndex={page_index}"
+
+
+# --- Parse One Listing Page ---
+def parse_cards(html, base_url):
+    """Museum cards on a listing page as dicts with the list fields and the detail URL"""
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for card in soup.select(".see-and-do-card"):
+        name_elem = card.select_one(".typography.heading-3")
+        name = name_elem.get_text(strip=True) if name_elem else ""
+
+        city_elem = card.select_one(".typography.buttons-and-labels")
+        city = city_elem.get_text(strip=True) if city_elem else ""
+
+        img_elem = card.select_one(".see-and-do-card_img img")
+        img_url = img_elem['src'] if img_elem and img_elem.has_attr('src') else ""
+        if img_url.startswith("/"):
+            img_url = base_url + img_url
+
+        link_elem = card.select_one("a")
+        detail_url = base_url + link_elem['href'] if link_elem and link_elem.has_attr('href') else ""
+
+        cards.append({"Name": name, "City": city, "Image_URL": img_url, "Detail_URL": detail_url})
+    return cards
+
+
+# --- Page Fetchers ---
+class HttpPages:
+    """Fetch a batch of listing pages over one pooled keep-alive session"""
+
+    def __init__(self, workers, timeout):
+        self.session = create_session(workers)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.timeout = timeout
+
+    def _fetch(self, url):
+        try:
+            return fetch_html(self.session, url, self.timeout)
+        except Exception as e:
+            print(f"  ⚠️ Could not load {url}: {e}")
+            return None
+
+    def fetch(self, urls):
+        return list(self.pool.map(self._fetch, urls))
+
+    def close(self):
+        self.pool.shutdown()
+        self.session.close()
+
+
+class BrowserPages:
+    """Render a batch of listing pages with a pool of browsers that stays open between batches"""
+
+    def __init__(self, workers, timeout):
+        self.timeout = timeout
+        self.results = queue.Queue()
+        self.sessions = shared_sessions(CHROME_SESSIONS, create_driver)
+        self.browsers = BrowserPool(self._load, self.sessions, lambda index, html: self.results.put((index, html)),
+                                    workers=workers, empty_result=None, progress_every=0)
+
+    def _load(self, driver, url):
+        driver.get(url)
+        _, timed_out = wait_for_listing(driver, self.timeout)
+        if timed_out:
+            print(f"  ⚠️ Listing not ready after {self.timeout:g}s: {url}")
+        return driver.page_source
+
+    def fetch(self, urls):
+        for job in enumerate(urls):
+            self.browsers.submit(*job)
+        pages = [None] * len(urls)
+        received = 0
+        while received < len(urls):
+            try:
+                index, html = self.results.get(timeout=1)
+            except queue.Empty:
+                if not self.browsers.alive():
+                    break  # No browser could be started, the missing pages stay None
+                continue
+            pages[index] = html
+            received += 1
+        return pages
+
+    def close(self):
+        self.browsers.close()
+        print(self.sessions.summary())
+
+
+# --- Discovery ---
+def discover(fetcher, base_url, batch_size, max_pages):
+    """Walk listing pages until one has no new cards.
+
+    Returns the unique cards in listing order, or None if a page could not be
+    loaded: a listing with a hole in it would report every museum after the
+    hole as removed.
+    """
+    cards = []
+    seen = set()
+    page_index = 1
+    while page_index <= max_pages:
+        batch = list(range(page_index, min(page_index + batch_size, max_pages + 1)))
+        started = time.perf_counter()
+        pages = fetcher.fetch([listing_url(base_url, i) for i in batch])
+        print(f"📄 Loaded listing pages {batch[0]}-{batch[-1]} in {time.perf_counter() - started:.1f}s")
+
+        # Pages are handled in order so "no new cards" means the same thing however many run at once
+        for i, html in zip(batch, pages):
+            if html is None:
+                print(f"❌ Listing page {i} failed to load, stopping without writing a partial list")
+                return None
+            new = 0
+            for card in parse_cards(html, base_url):
+                url = card["Detail_URL"]
+                if url and url not in seen:
+                    seen.add(url)
+                    cards.append(card)
+                    new += 1
+            if not new:
+                print(f"🏁 Listing page {i} has no new museums, {i - 1} pages with {len(cards)} museums")
+                return cards
+        page_index += batch_size
+
+    print(f"⚠️ Stopped at --max-pages {max_pages}, the listing may have more museums")
+    return cards
+
+
+def diff_urls(previous, current):
+    """(added, removed) detail URLs, each in the order of the list they come from"""
+    previous_set = set(previous)
+    current_set = set(current)
+    return [url for url in current if url not in previous_set], [url for url in previous if url not in current_set]
+
+
+def write_json(path, data):
+    tmp = f"{path}.partial"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover museum detail URLs from the museum.nl listing")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--mode", choices=["browser", "http"], default="browser",
+                        help="browser: render every listing page in Chrome; http: fetch raw listing HTML")
+    parser.add_argument("--workers", type=int, default=4, help="Listing pages loaded at the same time")
+    parser.add_argument("--max-pages", type=int, default=200, help="Safety limit on the number of listing pages")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for one listing page")
+    parser.add_argument("--output-dir", default="data", help="Where museum_list.csv and the URL lists are written")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    urls_path = os.path.join(args.output_dir, "detail_urls.json")
+    added_path = os.path.join(args.output_dir, "detail_urls_added.json")
+    removed_path = os.path.join(args.output_dir, "detail_urls_removed.json")
+    list_path = os.path.join(args.output_dir, "museum_list.csv")
+
+    print(f"🔄 Walking {base_url}{LISTING_PATH}, {args.workers} pages at a time ({args.mode})")
+    started = time.perf_counter()
+    fetcher = (BrowserPages if args.mode == "browser" else HttpPages)(args.workers, args.timeout)
+    try:
+        cards = discover(fetcher, base_url, args.workers, args.max_pages)
+    finally:
+        fetcher.close()
+
+    if not cards:
+        hint = " (the listing may need JavaScript, try --mode browser)" if cards is not None and args.mode == "http" else ""
+        print(f"❌ No museums found, keeping the previous URL list{hint}")
+        sys.exit(1)
+    print(f"🔍 Found {len(cards)} unique museums in {time.perf_counter() - started:.1f}s")
+
+    previous = []
+    if os.path.exists(urls_path):
+        with open(urls_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    detail_urls = [card["Detail_URL"] for card in cards]
+    added, removed = diff_urls(previous, detail_urls)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(f"{list_path}.partial", "w", newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=LIST_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(cards)
+    os.replace(f"{list_path}.partial", list_path)
+    write_json(urls_path, detail_urls)
+    write_json(added_path, added)
+    write_json(removed_path, removed)
+
+    print(f"✅ Saved {len(cards)} museums to {list_path} and {urls_path}")
+    print(f"➕ {len(added)} added since the last run ({added_path})")
+    for url in added[:10]:
+        print(f"   {url}")
+    print(f"➖ {len(removed)} removed since the last run ({removed_path})")
+    for url in removed[:10]:
+        print(f"   {url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Parallel browser workers for the detail page scraper.
+
+Every worker holds one browser session from a `SessionManager` and takes
+URLs from one shared queue. Each result is reported together with the
+URL's position, so callers can put results back in the original URL order
+no matter which worker finished first.
+"""
+import queue
+import threading
+
+from browser_sessions import SessionManager
+
+
+class BrowserPool:
+    """A pool of browser workers that accepts URLs while it is running.
+
+    `scrape(driver, url)` is called for every submitted URL and
+    `on_result(index, result)` receives its return value. A page that raises
+    gets the fallback it was submitted with, or else `empty_result`, and the
+    worker starts a new browser if the old one crashed or fails a health
+    check, so one broken page or crashed browser never stops the rest of the
+    run. Browsers are only started once there is work for them.
+
+    `sessions` is a `SessionManager`, whose warm browsers are reused and
+    handed back when the pool closes, or a function that starts a driver;
+    the pool then owns its browsers and quits them when it closes.
+    """
+
+    def __init__(self, scrape, sessions, on_result, workers=4, empty_result=None,
+                 progress_every=50, total=None):
+        self.scrape = scrape
+        if not isinstance(sessions, SessionManager):
+            sessions = SessionManager(sessions, max_pages=None, keep_warm=False)
+        self.sessions = sessions
+        self.on_result = on_result
+        self.empty_result = empty_result
+        self.progress_every = progress_every
+        self.total = total
+
+        self.jobs = queue.Queue()
+        self.counts = {"done": 0, "ok": 0}
+        self._closed = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._worker, args=(worker_id,), daemon=True)
+            for worker_id in range(1, workers + 1)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, index, url, fallback=None):
+        """Queue a URL; `fallback` is reported instead of `empty_result` if it cannot be scraped"""
+        self.jobs.put((index, url, fallback))
+
+    def _record(self, index, result, ok):
+        with self._lock:
+            self.on_result(index, result)
+            self.counts["done"] += 1
+            self.counts["ok"] += int(ok)
+            done = self.counts["done"]
+            if self.progress_every and done % self.progress_every == 0:
+                print(f"📈 Progress: {done}/{self.total or '?'} completed ({self.counts['ok']} successful)")
+
+    def _next_job(self):
+        while not self._stop.is_set():
+            try:
+                return self.jobs.get(timeout=0.2)
+            except queue.Empty:
+                if self._closed.is_set():
+                    return None
+        return None
+
+    def _worker(self, worker_id):
+        session = None
+        try:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    return
+                index, url, fallback = job
+
+                if session is None:
+                    try:
+                        session = self.sessions.acquire()
+                    except Exception as e:
+                        # Hand the URL back so a healthy worker can pick it up
+                        print(f"❌ Worker {worker_id} could not start a browser: {e}")
+                        self.jobs.put(job)
+                        return
+
+                print(f"🔄 [w{worker_id}] Visiting ({index + 1}/{self.total or '?'}): {url}")
+                try:
+                    self._record(index, self.scrape(session.driver, url), True)
+                except Exception as e:
+                    print(f"  ❌ [w{worker_id}] Error scraping {url}: {e}")
+                    self._record(index, self.empty_result if fallback is None else fallback, False)
+                    # Recycled if the browser crashed or stopped answering
+                    session = self.sessions.page_done(session, e)
+                else:
+                    session = self.sessions.page_done(session)
+        finally:
+            self.sessions.release(session)
+
+    def alive(self):
+        """Number of workers still running"""
+        return sum(thread.is_alive() for thread in self._threads)
+
+    def _report_closed(self):
+        if self.sessions.keep_warm:
+            print(f"♨️ Browsers handed back warm ({len(self.sessions.idle)} idle)")
+        else:
+            print("🔒 Browsers closed")
+
+    def stop(self):
+        """Let the workers finish their current page and drop the rest, e.g. after Ctrl+C elsewhere"""
+        self._stop.set()
+        self._closed.set()
+        for thread in self._threads:
+            thread.join()
+        self._report_closed()
+
+    def close(self):
+        """Wait for all submitted URLs. Returns False if the run was interrupted"""
+        self._closed.set()
+        try:
+            for thread in self._threads:
+                # Join with a timeout so Ctrl+C still reaches the main thread
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            print("\n⚠️ Scraping interrupted by user, waiting for workers to finish their page")
+            self.stop()
+            return False
+
+        self._report_closed()
+
+        # URLs left over because every worker failed to start a browser
+        missing = 0
+        while True:
+            try:
+                index, url, fallback = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            self._record(index, self.empty_result if fallback is None else fallback, False)
+            missing += 1
+        if missing:
+            print(f"⚠️ {missing} URLs were never visited because no browser worker was available")
+        return True
+
+
+def run_pool(urls, scrape, sessions, workers=4, empty_result=None, progress_every=50, on_result=None):
+    """Scrape all URLs with a pool of browser workers.
+
+    Without `on_result` the results are returned as a list in URL order; if
+    the run is interrupted, pages that were never visited are left as None.
+    With `on_result` nothing is kept in memory and the return value says
+    whether the run completed.
+    """
+    results = None
+    if on_result is None:
+        results = [None] * len(urls)
+        on_result = results.__setitem__
+
+    pool = BrowserPool(scrape, sessions, on_result, workers=workers, empty_result=empty_result,
+                       progress_every=progress_every, total=len(urls))
+    for job in enumerate(urls):
+        pool.submit(*job)
+    completed = pool.close()
+    return results if results is not None else completed
@@ -452,7 +452,11 @@ function deleteMuseum(index) {
 function exportJSON() {
   const dataStr = JSON.stringify(museumData, null, 2);
   downloadFile(dataStr, "museum_data.json", "application/json");
-  showStatus("export-status", "JSON file downloaded successfully", "success");
+  showStatus(
+    "export-status",
+    "JSON file downloaded. Save it as data/museum_details_full.json and run python3 scripts/build_data_shards.py, the site loads the shards built from it",
+    "success"
+  );
 }
 
 function exportCSV() {
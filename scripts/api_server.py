@@ -0,0 +1,461 @@
+"""Local asyncio HTTP server for the site and query endpoints over the dataset.
+
+The dataset is loaded once at startup and indexed with the search, facet
+and opening hours indexes, so clients no longer download and filter all of
+it themselves:
+
+    GET /api/search?q=van+gogh&limit=8
+    GET /api/filter?card=yes&city=Amsterdam&city=Leiden&facility=Restaurant&hours=known&open_at=Sunday+14:00
+    GET /api/open?day=Sunday&time=14:00&limit=50&offset=0   (day and time default to now)
+    GET /api/museums/42
+
+Everything else is served from the repository as static files, so the site
+itself works as with `python3 -m http.server`. Text files are compressed
+once with gzip and, when the brotli module is installed, brotli at maximum
+level; the compressed copies are kept in data/cache/static/ under the hash
+of their content, so a restart does not compress them again. Every response
+has a strong ETag (one per encoding) and a conditional GET with a matching
+If-None-Match gets a 304. Content-hashed files (data/shards/,
+images/responsive/, fonts/subset/) may be cached forever; everything else
+has to be revalidated.
+
+    python3 scripts/api_server.py --port 8000
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from build_data_shards import SUMMARY_FIELDS
+from build_facet_index import FacetIndex
+from build_hours_index import DAYS, HoursIndex, format_minute, positions, week_minute
+from build_search_index import SearchIndex
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.path.join(ROOT, "data", "museum_details_full.json")
+COMPRESSED_CACHE_DIR = os.path.join(ROOT, "data", "cache", "static")
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+MIN_COMPRESS_SIZE = 512
+# Served files named after their content
+IMMUTABLE_PREFIXES = ("data/shards/", "images/responsive/", "fonts/subset/")
+API_CACHE_SIZE = 512
+MAX_HEADER_SIZE = 16 * 1024
+
+STATUS_TEXT = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 500: "Internal Server Error",
+}
+
+
+def compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+# --- Representations ---
+class Entity:
+    """A response body with its ETags and compressed variants.
+
+    Variants are made on first use, or up front with `precompress`, and
+    kept. `cache_dir` keeps them on disk across restarts.
+    """
+
+    def __init__(self, body, content_type, cache_control="no-cache", brotli_quality=11, cache_dir=None):
+        self.body = body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.hash = hashlib.sha256(body).hexdigest()[:20]
+        self.brotli_quality = brotli_quality
+        self.cache_dir = cache_dir
+        self.variants = {"identity": body}
+
+    def etag(self, encoding):
+        return f'"{self.hash}"' if encoding == "identity" else f'"{self.hash}-{encoding}"'
+
+    def matches(self, if_none_match):
+        """Whether an If-None-Match header names any representation of this body"""
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        tags = {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+        return "*" in tags or any(self.etag(encoding) in tags for encoding in ("identity", "gzip", "br"))
+
+    def encodings(self):
+        """Encodings this body can be sent in, best first"""
+        if len(self.body) < MIN_COMPRESS_SIZE or not compressible(self.content_type):
+            return ["identity"]
+        return (["br"] if brotli else []) + ["gzip", "identity"]
+
+    def variant(self, encoding):
+        if encoding not in self.variants:
+            path = os.path.join(self.cache_dir, f"{self.hash}.{encoding}") if self.cache_dir else None
+            if path and os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+            else:
+                if encoding == "br":
+                    data = brotli.compress(self.body, quality=self.brotli_quality)
+                else:
+                    data = gzip.compress(self.body, compresslevel=9, mtime=0)
+                if path:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    tmp = f"{path}.partial"
+                    with open(tmp, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp, path)
+            # A variant that does not shrink the body is not worth sending
+            self.variants[encoding] = data if len(data) < len(self.body) else None
+        return self.variants[encoding]
+
+    def precompress(self):
+        for encoding in self.encodings():
+            self.variant(encoding)
+        return self
+
+    def negotiate(self, accept_encoding):
+        """(encoding, bytes) to send for an Accept-Encoding header"""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in self.encodings():
+            if encoding == "identity":
+                break
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > 0 and self.variant(encoding) is not None:
+                return encoding, self.variants[encoding]
+        return "identity", self.body
+
+
+def parse_accept_encoding(value):
+    """{coding: q} of an Accept-Encoding header"""
+    accepted = {}
+    for part in (value or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def json_entity(data):
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # Query results are small and built per request, so they get a faster brotli level
+    return Entity(body, "application/json; charset=utf-8", brotli_quality=5)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Application ---
+class MuseumApi:
+    """Query endpoints and static files"""
+
+    def __init__(self, museums, root=ROOT, cache_dir=COMPRESSED_CACHE_DIR):
+        self.museums = museums
+        self.root = root
+        self.cache_dir = cache_dir
+        self.search_index = SearchIndex.build(museums)
+        self.facet_index = FacetIndex.build(museums)
+        self.hours_index = HoursIndex.from_museums(museums)
+        self.static = {}
+        # The dataset does not change while the server runs, so answers can be kept
+        self.api_cache = OrderedDict()
+        self.routes = {
+            "/api/search": self.search,
+            "/api/filter": self.filter,
+            "/api/open": self.open_at,
+        }
+
+    # --- Endpoints ---
+    def search(self, params):
+        query = first(params, "q")
+        if not query:
+            raise ApiError(400, "Missing q")
+        return {"query": query, "results": self.search_index.search(query, int_param(params, "limit", 8))}
+
+    def filter(self, params):
+        selection = {
+            "museum_card": params.get("card", []),
+            "city": params.get("city", []),
+            "facility": params.get("facility", []),
+            "hours": params.get("hours", []),
+        }
+        base = None
+        if first(params, "open_at"):
+            day, _, time_text = first(params, "open_at").partition(" ")
+            base = self.hours_index.open_mask(parse_week_minute(day, time_text))
+        found = self.facet_index.query(selection, base)
+        offset = int_param(params, "offset", 0)
+        limit = int_param(params, "limit", 50)
+        counts = self.facet_index.facet_counts(selection, base)
+        return {
+            "total": len(found),
+            "offset": offset,
+            "museums": [self.summary(i) for i in found[offset:offset + limit]],
+            "counts": {facet: {value: n for value, n in values.items() if n} for facet, values in counts.items()},
+        }
+
+    def open_at(self, params):
+        now = time.localtime()
+        day = first(params, "day") or DAYS[now.tm_wday]
+        time_text = first(params, "time") or f"{now.tm_hour:02d}:{now.tm_min:02d}"
+        minute = parse_week_minute(day, time_text)
+        offset = int_param(params, "offset", 0)
+        limit = int_param(params, "limit", 50)
+        found = positions(self.hours_index.open_mask(minute))
+        museums = []
+        for i in found[offset:offset + limit]:
+            change = self.hours_index.next_change(i, minute)
+            museums.append({**self.summary(i), "closes": format_minute(change[0]) if change else None})
+        return {"day": day.capitalize(), "time": time_text, "total": len(found), "offset": offset, "museums": museums}
+
+    def museum(self, index):
+        if not 0 <= index < len(self.museums):
+            raise ApiError(404, f"No museum {index}")
+        return {"index": index, **self.museums[index]}
+
+    def summary(self, i):
+        museum = self.museums[i]
+        return {"index": i, **{field: museum.get(field, "") for field in SUMMARY_FIELDS}}
+
+    # --- Dispatch ---
+    def api_entity(self, path, query):
+        key = f"{path}?{query}"
+        if key in self.api_cache:
+            self.api_cache.move_to_end(key)
+            return self.api_cache[key]
+
+        params = parse_qs(query)
+        if path in self.routes:
+            data = self.routes[path](params)
+        elif path.startswith("/api/museums/") and path[len("/api/museums/"):].isdigit():
+            data = self.museum(int(path[len("/api/museums/"):]))
+        else:
+            raise ApiError(404, f"Unknown endpoint {path}")
+
+        entity = json_entity(data)
+        # "Open now" changes by the minute
+        if not (path == "/api/open" and not ("day" in params and "time" in params)):
+            self.api_cache[key] = entity
+            if len(self.api_cache) > API_CACHE_SIZE:
+                self.api_cache.popitem(last=False)
+        return entity
+
+    def static_entity(self, path):
+        relative = os.path.normpath(unquote(path).lstrip("/")) if path != "/" else "index.html"
+        full = os.path.join(self.root, relative)
+        if relative.startswith("..") or os.path.isabs(relative) or relative.split(os.sep)[0].startswith("."):
+            raise ApiError(404, "Not found")
+        if os.path.isdir(full):
+            full = os.path.join(full, "index.html")
+        if not os.path.isfile(full):
+            raise ApiError(404, "Not found")
+
+        stat = os.stat(full)
+        cached = self.static.get(full)
+        if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+        with open(full, "rb") as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(full)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+            content_type += "; charset=utf-8"
+        immutable = relative.replace(os.sep, "/").startswith(IMMUTABLE_PREFIXES)
+        entity = Entity(
+            body, content_type,
+            "public, max-age=31536000, immutable" if immutable else "no-cache",
+            cache_dir=self.cache_dir,
+        ).precompress()
+        self.static[full] = ((stat.st_mtime_ns, stat.st_size), entity)
+        return entity
+
+    def precompress_static(self):
+        """Compress every text file the site serves, so the first requests are not slow"""
+        count = 0
+        for directory, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ("cache", "metrics", "__pycache__")]
+            for file in files:
+                content_type = mimetypes.guess_type(file)[0] or ""
+                if compressible(content_type):
+                    path = os.path.relpath(os.path.join(directory, file), self.root)
+                    self.static_entity("/" + path.replace(os.sep, "/"))
+                    count += 1
+        return count
+
+    def respond(self, method, target, headers):
+        """(status, headers, body) for one request"""
+        if method not in ("GET", "HEAD"):
+            return error_response(405, "Only GET and HEAD are supported")
+        url = urlsplit(target)
+        try:
+            if url.path.startswith("/api/"):
+                entity = self.api_entity(url.path, url.query)
+            else:
+                entity = self.static_entity(url.path)
+        except ApiError as e:
+            return error_response(e.status, str(e))
+        except (ValueError, KeyError) as e:
+            return error_response(400, str(e))
+
+        encoding, body = entity.negotiate(headers.get("accept-encoding"))
+        response_headers = {
+            "Content-Type": entity.content_type,
+            "ETag": entity.etag(encoding),
+            "Cache-Control": entity.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+        if "if-none-match" in headers and entity.matches(headers["if-none-match"]):
+            return 304, response_headers, b""
+        return 200, response_headers, body
+
+
+def first(params, name):
+    values = params.get(name)
+    return values[0] if values else None
+
+
+def int_param(params, name, default):
+    value = first(params, name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise ApiError(400, f"{name} must be a number")
+    return int(value)
+
+
+def parse_week_minute(day, time_text):
+    day = day.capitalize()
+    if day not in DAYS:
+        raise ApiError(400, f"Unknown day {day!r}")
+    hour, _, minute = time_text.partition(":")
+    if not (hour.isdigit() and minute.isdigit() and int(hour) < 24 and int(minute) < 60):
+        raise ApiError(400, f"Time must be HH:MM, not {time_text!r}")
+    return week_minute(day, time_text)
+
+
+def error_response(status, message):
+    body = json.dumps({"error": message}).encode("utf-8")
+    return status, {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-store"}, body
+
+
+# --- HTTP/1.1 ---
+async def handle_connection(api, reader, writer):
+    """Serve requests on one keep-alive connection until the client closes it"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                # Without a usable length the rest of the stream cannot be framed: answer and close
+                length = None
+            if length:
+                await reader.readexactly(length)
+
+            if length is None:
+                status, response_headers, body = error_response(400, "Invalid Content-Length")
+            else:
+                try:
+                    status, response_headers, body = api.respond(method, target, headers)
+                except Exception as e:
+                    status, response_headers, body = error_response(500, f"{type(e).__name__}: {e}")
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+            keep_alive = keep_alive and length is not None
+            # A 304 has no body, and its Content-Length would describe the cached representation
+            if status != 304:
+                response_headers["Content-Length"] = str(len(body))
+            response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+            head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n" + "".join(
+                f"{name}: {value}\r\n" for name, value in response_headers.items()
+            ) + "\r\n"
+            writer.write(head.encode("latin-1"))
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionResetError, BrokenPipeError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(api, host, port):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(api, reader, writer), host, port, limit=MAX_HEADER_SIZE
+    )
+    address = server.sockets[0].getsockname()
+    print(f"🌐 Serving on http://{address[0]}:{address[1]}/ (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the site and query endpoints over the museum dataset")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--no-precompress", action="store_true",
+                        help="Compress static files on their first request instead of at startup")
+    args = parser.parse_args()
+
+    print("📖 Loading museum data...")
+    started = time.perf_counter()
+    with open(args.input, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+    api = MuseumApi(museums)
+    print(f"✅ Indexed {len(museums)} museums in {time.perf_counter() - started:.2f}s "
+          f"({len(api.search_index.terms)} search terms, "
+          f"{sum(len(values) for values in api.facet_index.masks.values())} facet values)")
+
+    if not args.no_precompress:
+        started = time.perf_counter()
+        count = api.precompress_static()
+        print(f"🗜️ Compressed {count} static files with gzip{' and brotli' if brotli else ''} "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    try:
+        asyncio.run(serve(api, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ function renderCard(template, data, index) {
 
   return template
     .replace(/\{\{IMAGE\}\}/g, data["Image"] || "images/placeholder.jpg")
+    .replace(/\{\{IMAGE_AVIF\}\}/g, formatImageSrcset(data["Image"], "avif"))
+    .replace(/\{\{IMAGE_WEBP\}\}/g, formatImageSrcset(data["Image"], "webp"))
+    .replace(/\{\{IMAGE_STYLE\}\}/g, formatImageStyle(data["Image"]))
     .replace(/\{\{NAME\}\}/g, data["Name"] || "")
     .replace(/\{\{MUSEUM_ID\}\}/g, museumId)
     .replace(/\{\{OPEN_TODAY\}\}/g, openingStatus.message)
@@ -28,6 +31,25 @@ function renderCard(template, data, index) {
     .replace(/\{\{FACILITIES\}\}/g, formatFacilities(data["Facilities"]));
 }
 
+// Fill in the variants of images rendered before the image manifest arrived.
+// Images that already finished loading keep the original they have.
+function applyImageVariants(root = document) {
+  root.querySelectorAll("picture").forEach((picture) => {
+    const img = picture.querySelector("img");
+    if (!img || img.complete) return;
+    const image = img.getAttribute("src");
+
+    picture.querySelectorAll("source").forEach((source) => {
+      if (source.getAttribute("srcset")) return;
+      const srcset = formatImageSrcset(image, source.type.replace("image/", ""));
+      if (srcset) source.setAttribute("srcset", srcset);
+    });
+
+    const style = formatImageStyle(image);
+    if (style && !img.getAttribute("style")) img.setAttribute("style", style);
+  });
+}
+
 // Search functionality
 function searchMuseums(data, searchTerm) {
   if (!searchTerm || searchTerm.trim() === "") {
@@ -0,0 +1,176 @@
+"""Split the museum dataset into a slim first-paint summary and lazily loaded detail shards.
+
+The cards and list views only need a museum's name, address, opening hours,
+museum card and image. Those fields go into one small summary file; the
+long descriptions, facilities, phone numbers and links go into detail shards
+of `--bucket-size` museums each, which the modal fetches when it opens.
+
+Every file is named after the hash of its content, so it can be cached
+forever: a changed museum gets a new file name. `data/manifest.json` is the
+only file that has to be revalidated and points at the current files:
+
+    {"version": 1, "count": 510, "bucket_size": 16, "source": "9f8e7d6c5b4a3210",
+     "summary": "data/shards/summary-1a2b3c4d5e6f.json",
+     "details": ["data/shards/details-....json", ...]}
+
+`source` is the hash of the dataset the shards were built from, so a
+dataset edited without rebuilding them is caught by `--check`. The detail
+scraper rebuilds them after every complete run.
+
+    python3 scripts/build_data_shards.py
+    python3 scripts/build_data_shards.py --check    # exit with 1 if the shards are out of date
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+
+DATASET_PATH = "data/museum_details_full.json"
+MANIFEST_PATH = "data/manifest.json"
+SHARD_DIR = "data/shards"
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Everything the card and list templates, the status badges and the filters read
+SUMMARY_FIELDS = ["Name", "Address", *[f"Opening_{day}" for day in DAYS], "Museum Card", "Image"]
+
+
+def dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_name(prefix, body):
+    return f"{prefix}-{hashlib.sha256(body).hexdigest()[:12]}.json"
+
+
+def source_hash(full_body):
+    return hashlib.sha256(full_body).hexdigest()[:16]
+
+
+def build_files(museums, bucket_size, shard_dir=SHARD_DIR):
+    """{file name: body} for the summary and every detail shard, plus the manifest dict"""
+    summary = [{field: museum.get(field, "") for field in SUMMARY_FIELDS} for museum in museums]
+    files = {}
+
+    body = dumps(summary)
+    summary_name = content_name("summary", body)
+    files[summary_name] = body
+
+    # A shard maps each museum's position in the summary to its remaining fields
+    detail_names = []
+    for start in range(0, len(museums), bucket_size):
+        shard = {
+            str(i): {field: value for field, value in museums[i].items() if field not in SUMMARY_FIELDS}
+            for i in range(start, min(start + bucket_size, len(museums)))
+        }
+        body = dumps(shard)
+        name = content_name("details", body)
+        files[name] = body
+        detail_names.append(name)
+
+    manifest = {
+        "version": 1,
+        "count": len(museums),
+        "bucket_size": bucket_size,
+        "summary": f"{shard_dir}/{summary_name}",
+        "details": [f"{shard_dir}/{name}" for name in detail_names],
+    }
+    return files, manifest
+
+
+def write_files(files, manifest, shard_dir, manifest_path):
+    """Write new shards, then the manifest, then remove shards no manifest points at any more"""
+    os.makedirs(shard_dir, exist_ok=True)
+    for name, body in files.items():
+        path = os.path.join(shard_dir, name)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(body)
+
+    tmp = f"{manifest_path}.partial"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, manifest_path)
+
+    stale = [
+        name for name in os.listdir(shard_dir)
+        if name.endswith(".json") and name.startswith(("summary-", "details-")) and name not in files
+    ]
+    for name in stale:
+        os.remove(os.path.join(shard_dir, name))
+    return stale
+
+
+def parse_time(body, repeat=20):
+    """Best of `repeat` json.loads runs, as a stand-in for the browser's JSON parse"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        json.loads(body)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(full_body, files, manifest):
+    summary_body = files[os.path.basename(manifest["summary"])]
+    details = [files[os.path.basename(path)] for path in manifest["details"]]
+    rows = [
+        ("full dataset", full_body),
+        ("summary", summary_body),
+        ("one detail shard", max(details, key=len)),
+    ]
+    print(f"{'':<18} {'bytes':>10} {'gzip':>9} {'parse ms':>9}")
+    for label, body in rows:
+        print(f"{label:<18} {len(body):>10,} {len(gzip.compress(body)):>9,} {parse_time(body) * 1000:>9.2f}")
+
+    saved = 1 - len(summary_body) / len(full_body)
+    saved_gzip = 1 - len(gzip.compress(summary_body)) / len(gzip.compress(full_body))
+    faster = parse_time(full_body) / parse_time(summary_body)
+    print(f"\n📉 Before first paint: {saved:.0%} fewer bytes ({saved_gzip:.0%} gzipped), "
+          f"JSON parse {faster:.1f}x faster")
+    print(f"   {len(details)} detail shards, {sum(map(len, details)):,} bytes in total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the summary file and detail shards for the front end")
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    parser.add_argument("--shard-dir", default=SHARD_DIR)
+    parser.add_argument("--bucket-size", type=int, default=16, help="Museums per detail shard")
+    parser.add_argument("--check", action="store_true",
+                        help="Only check that the manifest was built from the current dataset")
+    args = parser.parse_args()
+
+    print("📖 Loading museum data...")
+    with open(args.input, "rb") as f:
+        full_body = f.read()
+
+    if args.check:
+        built_from = None
+        if os.path.exists(args.manifest):
+            with open(args.manifest, "r", encoding="utf-8") as f:
+                built_from = json.load(f).get("source")
+        if built_from != source_hash(full_body):
+            print(f"❌ {args.manifest} is out of date with {args.input}, the site shows the old data. "
+                  "Run python3 scripts/build_data_shards.py")
+            sys.exit(1)
+        print(f"✅ {args.manifest} is up to date with {args.input}")
+        return
+
+    museums = json.loads(full_body)
+    files, manifest = build_files(museums, args.bucket_size, args.shard_dir)
+    manifest["source"] = source_hash(full_body)
+    stale = write_files(files, manifest, args.shard_dir, args.manifest)
+    print(f"✅ Wrote {len(files)} files to {args.shard_dir} and {args.manifest}"
+          + (f", removed {len(stale)} stale ones" if stale else ""))
+    print()
+    report(full_body, files, manifest)
+
+
+if __name__ == "__main__":
+    main()
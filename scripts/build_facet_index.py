@@ -0,0 +1,313 @@
+"""Precomputed facet bitsets for filtering the museum dataset.
+
+Every facet value gets one integer bitmask with bit i set for museum i:
+
+- museum_card: "yes" / "no"
+- city:        the place name after the postcode in `Address`
+- facility:    every item of the comma separated `Facilities`
+- hours:       "known" when all seven days' hours can be read, else "unknown"
+
+A filter is a selection of values per facet. Values of one facet are ORed
+(Amsterdam or Leiden), except facilities, which a museum must all have; the
+facets are then ANDed together. The count shown next to a value is the
+popcount of its mask ANDed with the other facets' selection, so counts cost
+a few integer operations instead of another pass over the data. The open
+museums from data/opening_hours_index.json can be ANDed in the same way.
+
+    python3 scripts/build_facet_index.py                  # write data/facet_index.json
+    python3 scripts/build_facet_index.py --city Amsterdam --facility Restaurant --open-at Sunday 14:00
+    python3 scripts/build_facet_index.py --benchmark --scale-to 50000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+
+from build_hours_index import HoursIndex, positions, week_intervals, week_minute
+
+DATASET_PATH = "data/museum_details_full.json"
+INDEX_PATH = "data/facet_index.json"
+
+# How the selected values of one facet combine
+FACETS = {"museum_card": "any", "city": "any", "facility": "all", "hours": "any"}
+
+POSTCODE_CITY_RE = re.compile(r"\b\d{4}\s?[A-Z]{2}\s+(.+)$")
+
+
+def popcount(mask):
+    return mask.bit_count() if hasattr(mask, "bit_count") else bin(mask).count("1")
+
+
+# --- Facet values of one museum ---
+def city_of(address):
+    """Place name after the postcode, without an island or region suffix, or None.
+
+    "Ruyterweg 20 1791 AA Oudeschild, Texel" and "... De Waal (Texel)" give
+    "Oudeschild" and "De Waal".
+    """
+    match = POSTCODE_CITY_RE.search(address or "")
+    if not match:
+        return None
+    city = re.split(r"[,(]", match.group(1))[0].strip()
+    return city or None
+
+
+def facilities_of(text):
+    return [item.strip() for item in (text or "").split(",") if item.strip()]
+
+
+def facet_values(museum):
+    """{facet: [values]} for one museum"""
+    _, unknown_days = week_intervals(museum)
+    city = city_of(museum.get("Address"))
+    return {
+        "museum_card": ["yes" if (museum.get("Museum Card") or "").lower() == "yes" else "no"],
+        "city": [city] if city else [],
+        "facility": facilities_of(museum.get("Facilities")),
+        "hours": ["unknown" if unknown_days else "known"],
+    }
+
+
+# --- Index ---
+class FacetIndex:
+    """One bitmask per facet value"""
+
+    def __init__(self, count, masks):
+        self.count = count
+        self.masks = masks
+        self.all = (1 << count) - 1
+        # Case-insensitive lookup of values, e.g. "sas van gent" for "Sas Van Gent"
+        self.keys = {facet: {value.casefold(): value for value in values} for facet, values in masks.items()}
+
+    @classmethod
+    def build(cls, museums):
+        masks = {facet: {} for facet in FACETS}
+        # Spellings of one city differ in case; the first one seen is used for all
+        cities = {}
+        for i, museum in enumerate(museums):
+            for facet, values in facet_values(museum).items():
+                for value in values:
+                    if facet == "city":
+                        value = cities.setdefault(value.casefold(), value)
+                    masks[facet][value] = masks[facet].get(value, 0) | 1 << i
+        return cls(len(museums), {facet: dict(sorted(values.items())) for facet, values in masks.items()})
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["count"], {
+            facet: {value: int(mask, 16) for value, mask in values.items()}
+            for facet, values in data["facets"].items()
+        })
+
+    def to_json(self):
+        """Masks as hex strings, like data/opening_hours_index.json"""
+        return {
+            "version": 1,
+            "count": self.count,
+            "combine": FACETS,
+            "facets": {
+                facet: {value: format(mask, "x") for value, mask in values.items()}
+                for facet, values in self.masks.items()
+            },
+        }
+
+    def save(self, path=INDEX_PATH):
+        tmp = f"{path}.partial"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    # --- Queries ---
+    def value_mask(self, facet, value):
+        """Mask of one facet value; an unknown value matches nothing"""
+        value = self.keys[facet].get(str(value).casefold())
+        return self.masks[facet].get(value, 0)
+
+    def facet_mask(self, facet, values):
+        """Mask of the museums matching the selected values of one facet"""
+        if not values:
+            return self.all
+        masks = [self.value_mask(facet, value) for value in values]
+        result = masks[0]
+        for mask in masks[1:]:
+            result = result & mask if FACETS[facet] == "all" else result | mask
+        return result
+
+    def query_mask(self, selection, base=None, skip=None):
+        """Mask of the museums matching `selection` ({facet: [values]}), within `base`"""
+        mask = self.all if base is None else base
+        for facet, values in selection.items():
+            if facet != skip and values:
+                mask &= self.facet_mask(facet, values)
+        return mask
+
+    def query(self, selection, base=None):
+        """Positions of the matching museums"""
+        return positions(self.query_mask(selection, base))
+
+    def facet_counts(self, selection, base=None):
+        """{facet: {value: count}} of matches if that value were picked, for every facet.
+
+        A facet's own selection is left out of its counts, so the other cities
+        still show how many museums they would add.
+        """
+        counts = {}
+        for facet, values in self.masks.items():
+            others = self.query_mask(selection, base, skip=facet)
+            if FACETS[facet] == "all" and selection.get(facet):
+                others &= self.facet_mask(facet, selection[facet])
+            counts[facet] = {value: popcount(mask & others) for value, mask in values.items()}
+        return counts
+
+
+# --- Predicate scan, as in filterMuseums in scripts/app.js ---
+def scan(museums, selection):
+    """Positions of matching museums by evaluating every predicate on every museum"""
+    cards = {value.lower() for value in selection.get("museum_card") or []}
+    cities = {value.casefold() for value in selection.get("city") or []}
+    facilities = set(selection.get("facility") or [])
+    hours = set(selection.get("hours") or [])
+    result = []
+    for i, museum in enumerate(museums):
+        if cards and ("yes" if (museum.get("Museum Card") or "").lower() == "yes" else "no") not in cards:
+            continue
+        if cities and (city_of(museum.get("Address")) or "").casefold() not in cities:
+            continue
+        if facilities and not facilities <= set(facilities_of(museum.get("Facilities"))):
+            continue
+        if hours and ("unknown" if week_intervals(museum)[1] else "known") not in hours:
+            continue
+        result.append(i)
+    return result
+
+
+def synthetic_museums(museums, count, rng):
+    """`count` museums with the card, address, facilities and hours of random real ones mixed"""
+    facilities = sorted({item for museum in museums for item in facilities_of(museum.get("Facilities"))})
+    result = []
+    for i in range(count):
+        museum = dict(rng.choice(museums))
+        museum["Name"] = f"{museum.get('Name', '')} {i}"
+        museum["Address"] = rng.choice(museums).get("Address", "")
+        museum["Facilities"] = ", ".join(item for item in facilities if rng.random() < 0.5)
+        museum["Museum Card"] = "Yes" if rng.random() < 0.9 else "No"
+        hours_from = rng.choice(museums)
+        for key, value in hours_from.items():
+            if key.startswith("Opening_"):
+                museum[key] = value
+        result.append(museum)
+    return result
+
+
+def sample_selections(index, count, rng):
+    cities = list(index.masks["city"])
+    facilities = list(index.masks["facility"])
+    selections = []
+    for _ in range(count):
+        selection = {}
+        if rng.random() < 0.5:
+            selection["museum_card"] = ["yes"]
+        if rng.random() < 0.7:
+            selection["city"] = rng.sample(cities, rng.randint(1, 3))
+        if rng.random() < 0.7:
+            selection["facility"] = rng.sample(facilities, rng.randint(1, 2))
+        if rng.random() < 0.3:
+            selection["hours"] = ["known"]
+        selections.append(selection)
+    return selections
+
+
+def benchmark(museums, queries, scale_to):
+    rng = random.Random(0)
+    corpus = synthetic_museums(museums, scale_to, rng) if scale_to else museums
+
+    started = time.perf_counter()
+    index = FacetIndex.build(corpus)
+    build = time.perf_counter() - started
+    selections = sample_selections(index, queries, rng)
+
+    mismatches = [s for s in selections if index.query(s) != scan(corpus, s)]
+
+    timings = {}
+    for label, func in [
+        ("predicate scan", lambda s: scan(corpus, s)),
+        ("index + positions", index.query),
+        ("index mask only", index.query_mask),
+        ("facet counts", index.facet_counts),
+    ]:
+        started = time.perf_counter()
+        for selection in selections:
+            func(selection)
+        timings[label] = (time.perf_counter() - started) / len(selections)
+
+    values = sum(len(values) for values in index.masks.values())
+    print(f"⏱️ {len(selections)} filter queries over {len(corpus)} museums "
+          f"(index of {values} values built in {build * 1000:.0f} ms):")
+    scan_time = timings["predicate scan"]
+    for label, seconds in timings.items():
+        speedup = f" ({scan_time / seconds:.0f}x faster)" if label != "predicate scan" else ""
+        print(f"   {label:<18} {seconds * 1000:>9.3f} ms/query{speedup}")
+    if mismatches:
+        print(f"⚠️ {len(mismatches)} queries differ from the predicate scan, e.g. {mismatches[0]}")
+    else:
+        print("✅ Index and predicate scan agree on every query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the facet bitsets for filtering")
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--output", default=INDEX_PATH)
+    parser.add_argument("--card", choices=["yes", "no"], help="Filter on the museum card")
+    parser.add_argument("--city", action="append", default=[], help="Filter on a city (repeat for any of several)")
+    parser.add_argument("--facility", action="append", default=[], help="Filter on a facility (repeat for all of several)")
+    parser.add_argument("--hours", choices=["known", "unknown"], help="Filter on whether the opening hours are known")
+    parser.add_argument("--open-at", nargs=2, metavar=("DAY", "HH:MM"), help="Only museums open at this time")
+    parser.add_argument("--benchmark", action="store_true", help="Compare index queries with predicate scanning")
+    parser.add_argument("--queries", type=int, default=200, help="Number of random filters for --benchmark")
+    parser.add_argument("--scale-to", type=int, default=50000,
+                        help="Synthetic museums for --benchmark, 0 for the real dataset")
+    args = parser.parse_args()
+
+    print("📖 Loading museum data...")
+    with open(args.input, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+
+    started = time.perf_counter()
+    index = FacetIndex.build(museums)
+    elapsed = time.perf_counter() - started
+    index.save(args.output)
+    sizes = ", ".join(f"{len(values)} {facet}" for facet, values in index.masks.items())
+    print(f"✅ Indexed {len(museums)} museums into {sizes} values in {elapsed * 1000:.1f} ms")
+    print(f"💾 Saved {os.path.getsize(args.output) / 1024:.1f} KB to {args.output}")
+
+    selection = {
+        "museum_card": [args.card] if args.card else [],
+        "city": args.city,
+        "facility": args.facility,
+        "hours": [args.hours] if args.hours else [],
+    }
+    base = None
+    if args.open_at:
+        day, time_text = args.open_at
+        base = HoursIndex.from_museums(museums).open_mask(week_minute(day.capitalize(), time_text))
+    if any(selection.values()) or base is not None:
+        found = index.query(selection, base)
+        print(f"\n🔎 {len(found)} museums match:")
+        for i in found[:20]:
+            print(f"   {museums[i]['Name']} ({city_of(museums[i].get('Address')) or '-'})")
+        if len(found) > 20:
+            print(f"   ... and {len(found) - 20} more")
+        counts = index.facet_counts(selection, base)
+        print(f"   Facilities: {', '.join(f'{value} {n}' for value, n in counts['facility'].items())}")
+
+    if args.benchmark:
+        print()
+        benchmark(museums, args.queries, args.scale_to)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Subset the web fonts to the characters the site shows and convert them to woff2.
+
+The characters are collected from the HTML templates, the strings in
+scripts/*.js and every text field of the dataset, which brings in the Dutch
+and Frisian letters of names like "'t Fiskershúske". Basic Latin, Latin-1
+and common punctuation are always kept, so text typed into the search box
+still renders in the site's fonts.
+
+Only the faces declared in css/fonts.css are built. Each becomes
+fonts/subset/<font>-<hash>.woff2, named after its content so it can be
+cached forever, and its @font-face rule is rewritten to load the woff2 first
+with the original file as the fallback. The original is also what the next
+run subsets again, so the script can be rerun after the data changes.
+
+    python3 scripts/build_fonts.py
+    python3 scripts/build_fonts.py --check      # only report, write nothing
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+
+from fontTools import subset
+
+CSS_PATH = "css/fonts.css"
+SUBSET_DIR = "fonts/subset"
+DATASET_PATH = "data/museum_details_full.json"
+TEXT_SOURCES = ["*.html", "scripts/*.js"]
+
+# Always kept: Basic Latin, Latin-1 Supplement and typographic punctuation
+BASE_RANGES = [(0x20, 0x7E), (0xA0, 0xFF), (0x2010, 0x2027), (0x2030, 0x203A), (0x20AC, 0x20AC)]
+
+FONT_FACE_RE = re.compile(r"@font-face\s*{(.*?)}", re.S)
+PROPERTY_RE = re.compile(r"([\w-]+)\s*:\s*([^;]+);")
+URL_RE = re.compile(r'url\("?([^")]+)"?\)\s*format\("([^"]+)"\)')
+FORMATS = {".otf": "opentype", ".ttf": "truetype", ".woff": "woff", ".woff2": "woff2"}
+
+
+# --- Characters ---
+def dataset_text(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from dataset_text(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from dataset_text(item)
+
+
+def used_characters(dataset_path=DATASET_PATH, sources=TEXT_SOURCES):
+    """Code points in the base ranges plus every one in the templates, scripts and dataset"""
+    characters = set()
+    for start, end in BASE_RANGES:
+        characters.update(range(start, end + 1))
+    for pattern in sources:
+        for path in glob.glob(pattern):
+            with open(path, "r", encoding="utf-8") as f:
+                characters.update(map(ord, f.read()))
+    with open(dataset_path, "r", encoding="utf-8") as f:
+        for text in dataset_text(json.load(f)):
+            characters.update(map(ord, text))
+    # Control characters never reach the page as glyphs
+    return {c for c in characters if c >= 0x20 and not 0x7F <= c < 0xA0}
+
+
+# --- CSS ---
+def parse_faces(css, css_path=CSS_PATH):
+    """One dict per @font-face rule: its span in the CSS, properties and source font file"""
+    faces = []
+    css_dir = os.path.dirname(css_path)
+    for match in FONT_FACE_RE.finditer(css):
+        properties = {name: value.strip() for name, value in PROPERTY_RE.findall(match.group(1))}
+        urls = URL_RE.findall(properties.get("src", ""))
+        # A rule this script wrote lists the woff2 first and the original after it
+        originals = [url for url, fmt in urls if fmt != "woff2"]
+        if not originals:
+            continue
+        faces.append({
+            "span": match.span(),
+            "family": properties.get("font-family", "").strip('"'),
+            "weight": properties.get("font-weight", "400"),
+            "style": properties.get("font-style", "normal"),
+            "url": originals[0],
+            "path": os.path.normpath(os.path.join(css_dir, originals[0])),
+        })
+    return faces
+
+
+def font_face_rule(face, woff2_url):
+    original_format = FORMATS.get(os.path.splitext(face["url"])[1].lower(), "opentype")
+    return (
+        "@font-face {\n"
+        f'  font-family: "{face["family"]}";\n'
+        f'  src: url("{woff2_url}") format("woff2"),\n'
+        f'    url("{face["url"]}") format("{original_format}");\n'
+        f"  font-weight: {face['weight']};\n"
+        f"  font-style: {face['style']};\n"
+        "  font-display: swap;\n"
+        "}"
+    )
+
+
+# --- Subsetting ---
+def subset_woff2(path, characters):
+    """woff2 bytes of the font at `path` with only the glyphs for `characters`"""
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.desubroutinize = True  # Compresses better in woff2
+    options.drop_tables += ["meta"]  # Not subsettable and not used by browsers
+    font = subset.load_font(path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=characters)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    return buffer.getvalue()
+
+
+def build(css_path, subset_dir, characters, write=True):
+    """Subset every face in the CSS. Returns the report rows"""
+    with open(css_path, "r", encoding="utf-8") as f:
+        css = f.read()
+    faces = parse_faces(css, css_path)
+
+    rows = []
+    files = set()
+    rewritten = css
+    for face in reversed(faces):  # Back to front, so the spans stay valid
+        data = subset_woff2(face["path"], characters)
+        stem = os.path.splitext(os.path.basename(face["path"]))[0]
+        name = f"{stem}-{hashlib.sha256(data).hexdigest()[:8]}.woff2"
+        files.add(name)
+        if write:
+            os.makedirs(subset_dir, exist_ok=True)
+            path = os.path.join(subset_dir, name)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(data)
+        url = os.path.relpath(os.path.join(subset_dir, name), os.path.dirname(css_path)).replace(os.sep, "/")
+        start, end = face["span"]
+        rewritten = rewritten[:start] + font_face_rule(face, url) + rewritten[end:]
+        rows.append((f"{face['family']} {face['weight']}", os.path.getsize(face["path"]), len(data)))
+
+    if write:
+        tmp = f"{css_path}.partial"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(rewritten)
+        os.replace(tmp, css_path)
+        for file in os.listdir(subset_dir):
+            if file.endswith(".woff2") and file not in files:
+                os.remove(os.path.join(subset_dir, file))
+    return list(reversed(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subset the site's fonts to the characters it uses, as woff2")
+    parser.add_argument("--css", default=CSS_PATH)
+    parser.add_argument("--output-dir", default=SUBSET_DIR)
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--check", action="store_true", help="Only report the savings, write nothing")
+    args = parser.parse_args()
+
+    print("🔤 Collecting the characters the site shows...")
+    characters = used_characters(args.dataset)
+    extra = sorted(chr(c) for c in characters if c > 0xFF and not 0x2010 <= c <= 0x20AC)
+    print(f"   {len(characters)} characters, beyond Latin-1: {''.join(extra[:40])}"
+          + (f" ... ({len(extra)} in all)" if len(extra) > 40 else ""))
+
+    rows = build(args.css, args.output_dir, characters, write=not args.check)
+    print(f"\n{'face':<18} {'original':>10} {'woff2':>9} {'saved':>6}")
+    for label, original, subset_size in rows:
+        print(f"{label:<18} {original:>10,} {subset_size:>9,} {1 - subset_size / original:>6.0%}")
+    original = sum(row[1] for row in rows)
+    subset_total = sum(row[2] for row in rows)
+    print(f"{'total':<18} {original:>10,} {subset_total:>9,} {1 - subset_total / original:>6.0%}")
+
+    if not args.check:
+        print(f"\n💾 Wrote {len(rows)} fonts to {args.output_dir} and rewrote {args.css}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Precompiled weekly opening hours index for the museum dataset.
+
+The free text `Opening_<Day>` fields are parsed once into minute intervals
+over the week (0 = Monday 00:00, 10080 = the next Monday). A day may have
+several ranges ("10:00 - 12:00, 13:00 - 17:00") and a range that closes at
+or before it opens runs past midnight into the next day; Sunday night wraps
+around to Monday morning.
+
+For queries the week is cut at every opening and closing minute. Within one
+segment the set of open museums does not change, so it is stored as a single
+integer bitmask with bit i set for museum i. "Which museums are open on day D
+at time T" is then one binary search plus one lookup, and combining it with
+other filters is a bitwise AND.
+
+    python3 scripts/build_hours_index.py                  # write data/opening_hours_index.json
+    python3 scripts/build_hours_index.py --query Sunday 16:45
+    python3 scripts/build_hours_index.py --benchmark
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+from bisect import bisect_right
+
+DATASET_PATH = "data/museum_details_full.json"
+INDEX_PATH = "data/opening_hours_index.json"
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+TIME_RANGE_RE = re.compile(r"(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})")
+
+
+# --- Parsing ---
+def parse_day(text):
+    """Minute ranges for one day's hours text.
+
+    Returns a list of (open, close) minutes since midnight, where close may
+    be past 1440 for a range that runs overnight. An empty list means closed;
+    None means the hours are unknown or could not be read.
+    """
+    if not text or "time unknown" in text.lower():
+        return None
+    ranges = []
+    for open_h, open_m, close_h, close_m in TIME_RANGE_RE.findall(text):
+        start = int(open_h) * 60 + int(open_m)
+        end = int(close_h) * 60 + int(close_m)
+        if end <= start:
+            end += DAY_MINUTES  # Open past midnight
+        ranges.append((start, end))
+    if ranges:
+        return ranges
+    if "closed" in text.lower():
+        return []
+    return None
+
+
+def week_intervals(museum):
+    """(intervals, unknown_days) for one museum.
+
+    Intervals are merged, sorted (start, end) minutes of the week; ranges past
+    Sunday midnight continue on Monday. `unknown_days` has bit d set for every
+    day whose hours could not be read.
+    """
+    intervals = []
+    unknown_days = 0
+    for d, day in enumerate(DAYS):
+        ranges = parse_day(museum.get(f"Opening_{day}", ""))
+        if ranges is None:
+            unknown_days |= 1 << d
+            continue
+        for start, end in ranges:
+            start += d * DAY_MINUTES
+            end += d * DAY_MINUTES
+            if end > WEEK_MINUTES:
+                intervals.append((0, end - WEEK_MINUTES))
+                end = WEEK_MINUTES
+            intervals.append((start, end))
+
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged], unknown_days
+
+
+def week_minute(day, time_text):
+    """Minute of the week for a day name and "HH:MM" """
+    hour, minute = time_text.split(":")
+    return DAYS.index(day) * DAY_MINUTES + int(hour) * 60 + int(minute)
+
+
+def format_minute(minute):
+    minute %= WEEK_MINUTES
+    return f"{DAYS[minute // DAY_MINUTES]} {minute % DAY_MINUTES // 60:02d}:{minute % 60:02d}"
+
+
+# --- Index ---
+class HoursIndex:
+    """Open museums per segment of the week as integer bitmasks"""
+
+    def __init__(self, names, intervals, unknown_days):
+        self.names = names
+        self.intervals = intervals
+        self.unknown_days = unknown_days
+
+        # Every opening adds the museum's bit and every closing removes it
+        changes = {}
+        for i, museum_intervals in enumerate(intervals):
+            for start, end in museum_intervals:
+                changes.setdefault(start, [0, 0])[0] |= 1 << i
+                changes.setdefault(end, [0, 0])[1] |= 1 << i
+        self.boundaries = [0]
+        self.masks = [0]
+        for minute in sorted(changes):
+            opened, closed = changes[minute]
+            mask = (self.masks[-1] & ~closed) | opened
+            if minute == self.boundaries[-1]:
+                self.masks[-1] = mask
+            else:
+                self.boundaries.append(minute)
+                self.masks.append(mask)
+
+        self.unknown_masks = [0] * 7
+        for i, days in enumerate(unknown_days):
+            for d in range(7):
+                if days >> d & 1:
+                    self.unknown_masks[d] |= 1 << i
+
+    @classmethod
+    def from_museums(cls, museums):
+        names = []
+        intervals = []
+        unknown_days = []
+        for museum in museums:
+            museum_intervals, unknown = week_intervals(museum)
+            names.append(museum.get("Name", ""))
+            intervals.append(museum_intervals)
+            unknown_days.append(unknown)
+        return cls(names, intervals, unknown_days)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data["names"],
+            [list(zip(flat[::2], flat[1::2])) for flat in data["intervals"]],
+            data["unknown_days"],
+        )
+
+    def to_json(self):
+        """Compact form: intervals as flat [start, end, start, end, ...] lists per museum,
+        segment masks as hex strings so they survive JSON readers without big integers"""
+        return {
+            "version": 1,
+            "week_minutes": WEEK_MINUTES,
+            "names": self.names,
+            "intervals": [[minute for interval in intervals for minute in interval] for intervals in self.intervals],
+            "unknown_days": self.unknown_days,
+            "boundaries": self.boundaries,
+            "masks": [format(mask, "x") for mask in self.masks],
+        }
+
+    def save(self, path=INDEX_PATH):
+        tmp = f"{path}.partial"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    # --- Queries ---
+    def open_mask(self, minute):
+        """Bitmask of museums open at a minute of the week"""
+        return self.masks[bisect_right(self.boundaries, minute % WEEK_MINUTES) - 1]
+
+    def unknown_mask(self, day):
+        """Bitmask of museums whose hours on `day` are unknown"""
+        return self.unknown_masks[DAYS.index(day)]
+
+    def open_at(self, day, time_text):
+        """Positions of the museums open on `day` at "HH:MM" """
+        return positions(self.open_mask(week_minute(day, time_text)))
+
+    def is_open(self, i, minute):
+        return bool(self.open_mask(minute) >> i & 1)
+
+    def next_change(self, i, minute):
+        """(minute, opens) of the next time museum i opens or closes, or None if it never does.
+
+        The minute is returned unwrapped, so it can lie past the end of the week.
+        """
+        intervals = list(self.intervals[i])
+        if not intervals:
+            return None
+        if len(intervals) > 1 and intervals[0][0] == 0 and intervals[-1][1] == WEEK_MINUTES:
+            # Open across Sunday midnight: one range, not a close and a reopen
+            intervals[-1] = (intervals[-1][0], WEEK_MINUTES + intervals.pop(0)[1])
+        minute %= WEEK_MINUTES
+        for week in (-WEEK_MINUTES, 0, WEEK_MINUTES):
+            for start, end in intervals:
+                if start + week > minute:
+                    return start + week, True
+                if end + week > minute:
+                    return end + week, False
+        return None
+
+
+# Set bit positions of every byte value
+_BYTE_POSITIONS = [[bit for bit in range(8) if value >> bit & 1] for value in range(256)]
+
+
+def positions(mask):
+    """Bit positions set in a mask, lowest first.
+
+    Works through the mask's bytes, because clearing the lowest bit of a large
+    integer copies it every time and makes the loop quadratic in its size.
+    """
+    result = []
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset * 8
+            result.extend(base + bit for bit in _BYTE_POSITIONS[byte])
+    return result
+
+
+# --- String parsing path, as in scripts/time-utils.js ---
+def open_by_parsing(museums, day, time_text):
+    """Positions of open museums by re-parsing every museum's hours text"""
+    hour, minute = time_text.split(":")
+    now = int(hour) * 60 + int(minute)
+    result = []
+    for i, museum in enumerate(museums):
+        hours = museum.get(f"Opening_{day}", "")
+        if not hours or "closed" in hours.lower() or "time unknown" in hours.lower():
+            continue
+        match = TIME_RANGE_RE.search(hours)
+        if not match:
+            continue
+        open_h, open_m, close_h, close_m = match.groups()
+        if int(open_h) * 60 + int(open_m) <= now < int(close_h) * 60 + int(close_m):
+            result.append(i)
+    return result
+
+
+def benchmark(museums, index, queries):
+    rng = random.Random(0)
+    samples = [(rng.choice(DAYS), f"{rng.randrange(24):02d}:{rng.randrange(60):02d}") for _ in range(queries)]
+
+    # Single daytime ranges are all the string path understands; on those both must agree
+    mismatches = [q for q in samples if index.open_at(*q) != open_by_parsing(museums, *q)]
+
+    started = time.perf_counter()
+    for q in samples:
+        open_by_parsing(museums, *q)
+    parsing = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for q in samples:
+        positions(index.open_mask(week_minute(*q)))
+    indexed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for q in samples:
+        index.open_mask(week_minute(*q))
+    masks_only = time.perf_counter() - started
+
+    print(f"⏱️ {queries} open-at queries over {len(museums)} museums:")
+    print(f"   string parsing    {parsing / queries * 1e6:>9.1f} µs/query")
+    print(f"   index + positions {indexed / queries * 1e6:>9.1f} µs/query ({parsing / indexed:.0f}x faster)")
+    print(f"   index mask only   {masks_only / queries * 1e6:>9.1f} µs/query ({parsing / masks_only:.0f}x faster)")
+    if mismatches:
+        print(f"⚠️ {len(mismatches)} queries differ from the string path, e.g. {mismatches[0]}")
+    else:
+        print("✅ Index and string parsing agree on every query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the weekly opening hours index")
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--output", default=INDEX_PATH)
+    parser.add_argument("--query", nargs=2, metavar=("DAY", "HH:MM"), help="List the museums open at this time")
+    parser.add_argument("--benchmark", action="store_true", help="Compare index queries with string parsing")
+    parser.add_argument("--queries", type=int, default=2000, help="Number of random queries for --benchmark")
+    args = parser.parse_args()
+
+    print("📖 Loading museum data...")
+    with open(args.input, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+
+    started = time.perf_counter()
+    index = HoursIndex.from_museums(museums)
+    elapsed = time.perf_counter() - started
+    index.save(args.output)
+    unknown = sum(1 for days in index.unknown_days if days)
+    print(f"✅ Indexed {len(museums)} museums into {len(index.boundaries)} week segments in {elapsed * 1000:.1f} ms")
+    print(f"   {unknown} museums have at least one day with unknown hours")
+    print(f"💾 Saved {os.path.getsize(args.output) / 1024:.1f} KB to {args.output}")
+
+    if args.query:
+        day, time_text = args.query
+        day = day.capitalize()
+        found = index.open_at(day, time_text)
+        print(f"\n🕒 {len(found)} museums open on {day} at {time_text}:")
+        for i in found:
+            closes, _ = index.next_change(i, week_minute(day, time_text))
+            print(f"   {index.names[i]} (until {format_minute(closes)})")
+
+    if args.benchmark:
+        print()
+        benchmark(museums, index, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Responsive image pipeline for the museum photos in images/.
+
+Every source image is resized to a few widths (never wider than the
+original) and encoded as WebP and, when this Pillow build supports it, AVIF.
+A tiny WebP of each image is kept as a blur-up placeholder in a separate
+`placeholders.json`, so the manifest the front end needs for `srcset`s stays
+small. Images are processed in a pool of worker processes, one image per task.
+
+A source is only rebuilt when it changed: the manifest remembers each
+source's mtime, size and SHA-256, and a touched file with the same content
+keeps its variants. `images/responsive/manifest.json` maps each museum's
+`Image` path to its variants, which the front end turns into `srcset`s:
+
+    {"images/anne_frank_huis.jpg": {
+        "width": 420, "height": 280,
+        "variants": {"avif": [["images/responsive/anne_frank_huis-160-1a2b3c4d.avif", 160], ...],
+                     "webp": [...]}, ...}}
+
+    images/responsive/placeholders.json: {"images/anne_frank_huis.jpg": "data:image/webp;base64,...", ...}
+
+    python3 scripts/build_images.py                 # build what changed, on every core
+    python3 scripts/build_images.py --scaling       # time a full build with 1, 2, 4, ... workers
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, features
+
+SOURCE_DIR = "images"
+OUTPUT_DIR = "images/responsive"
+MANIFEST_NAME = "manifest.json"
+PLACEHOLDERS_NAME = "placeholders.json"
+
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+WIDTHS = [160, 320, 640]
+PLACEHOLDER_WIDTH = 16
+
+# Pillow save options per format, tuned for photos shown at card size
+FORMAT_OPTIONS = {
+    "avif": {"quality": 50, "speed": 6},
+    "webp": {"quality": 75, "method": 4},
+}
+
+
+def available_formats():
+    """Output formats this Pillow build can write, best compression first"""
+    return [name for name in FORMAT_OPTIONS if features.check(name)]
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def target_widths(width):
+    """Output widths for a source `width` pixels wide, the original width included once"""
+    widths = [w for w in WIDTHS if w < width]
+    return widths + [min(width, WIDTHS[-1])]
+
+
+# --- One image, in a worker process ---
+def build_image(source, key, sha256, output_dir, formats):
+    """Write every variant of one source image and return its manifest entry"""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        width, height = image.size
+
+        variants = {name: [] for name in formats}
+        for target in target_widths(width):
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS
+            )
+            for name in formats:
+                path = os.path.join(output_dir, f"{stem}-{target}-{sha256[:8]}.{name}")
+                resized.save(path, name.upper(), **FORMAT_OPTIONS[name])
+                variants[name].append([path.replace(os.sep, "/"), target])
+
+        tiny = image.resize((PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))), Image.BILINEAR)
+        buffer = io.BytesIO()
+        tiny.save(buffer, "WEBP", quality=30)
+
+    stat = os.stat(source)
+    return key, {
+        "source": {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": sha256},
+        "width": width,
+        "height": height,
+        "placeholder": "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii"),
+        "variants": variants,
+    }
+
+
+def _build_task(args):
+    """build_image, with a broken source reported as (key, None, error) instead of raised"""
+    try:
+        return (*build_image(*args), None)
+    except Exception as e:
+        return args[1], None, f"{type(e).__name__}: {e}"
+
+
+# --- Whole directory ---
+def load_manifest(output_dir):
+    """The manifest with every entry's placeholder merged back in"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"version": 1, "images": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    placeholders_path = os.path.join(output_dir, PLACEHOLDERS_NAME)
+    if os.path.exists(placeholders_path):
+        with open(placeholders_path, "r", encoding="utf-8") as f:
+            for key, placeholder in json.load(f).items():
+                if key in manifest["images"]:
+                    manifest["images"][key]["placeholder"] = placeholder
+    return manifest
+
+
+def write_json(path, data):
+    tmp = f"{path}.partial"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def variants_exist(entry):
+    return "placeholder" in entry and all(
+        os.path.exists(path) for variants in entry["variants"].values() for path, _ in variants
+    )
+
+
+def plan(source_dir, output_dir, manifest, formats, force=False):
+    """(tasks, kept entries): sources that need building and entries that are still valid"""
+    tasks = []
+    kept = {}
+    for file in sorted(os.listdir(source_dir)):
+        if not file.lower().endswith(SOURCE_EXTENSIONS):
+            continue
+        source = os.path.join(source_dir, file)
+        key = f"{source_dir}/{file}".replace(os.sep, "/")
+        stat = os.stat(source)
+        entry = manifest["images"].get(key)
+
+        if entry and not force and sorted(entry["variants"]) == sorted(formats) and variants_exist(entry):
+            recorded = entry["source"]
+            if recorded["mtime"] == stat.st_mtime and recorded["size"] == stat.st_size:
+                kept[key] = entry
+                continue
+            # Touched but not changed, e.g. after a fresh checkout
+            sha256 = file_hash(source)
+            if sha256 == recorded["sha256"]:
+                entry["source"] = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": sha256}
+                kept[key] = entry
+                continue
+        else:
+            sha256 = file_hash(source)
+        tasks.append((source, key, sha256, output_dir, formats))
+    return tasks, kept
+
+
+def build(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR, workers=None, force=False, quiet=False):
+    """Build all changed images.
+
+    Returns (manifest, number built, number skipped, seconds, failures), where
+    failures maps each source that could not be read to its error. The
+    manifest is written either way, without the failed sources.
+    """
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    formats = available_formats()
+
+    tasks, images = plan(source_dir, output_dir, manifest, formats, force)
+    failures = {}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for done, (key, entry, error) in enumerate(pool.map(_build_task, tasks, chunksize=4), 1):
+                if error:
+                    failures[key] = error
+                else:
+                    images[key] = entry
+                if not quiet and done % 50 == 0:
+                    print(f"📈 Progress: {done}/{len(tasks)} images built")
+
+    images = dict(sorted(images.items()))
+    manifest = {
+        "version": 1,
+        "formats": formats,
+        "widths": WIDTHS,
+        "images": {key: {name: value for name, value in entry.items() if name != "placeholder"}
+                   for key, entry in images.items()},
+    }
+    # Placeholders are most of the bytes; the page loads them after the variants
+    write_json(os.path.join(output_dir, PLACEHOLDERS_NAME), {key: entry["placeholder"] for key, entry in images.items()})
+    write_json(os.path.join(output_dir, MANIFEST_NAME), manifest)
+
+    # Variants of sources that changed, disappeared or failed halfway
+    current = {os.path.basename(path) for entry in images.values()
+               for variants in entry["variants"].values() for path, _ in variants}
+    for file in os.listdir(output_dir):
+        if file not in (MANIFEST_NAME, PLACEHOLDERS_NAME) and not file.endswith(".partial") and file not in current:
+            os.remove(os.path.join(output_dir, file))
+
+    built = len(tasks) - len(failures)
+    return manifest, built, len(images) - built, time.perf_counter() - started, failures
+
+
+# --- Reports ---
+def report_bytes(manifest, source_dir):
+    originals = 0
+    per_format = {}
+    for key, entry in manifest["images"].items():
+        originals += os.path.getsize(os.path.join(source_dir, os.path.basename(key)))
+        for name, variants in entry["variants"].items():
+            sizes = per_format.setdefault(name, {"largest": 0, "all": 0})
+            largest_path = max(variants, key=lambda variant: variant[1])[0]
+            sizes["largest"] += os.path.getsize(largest_path)
+            sizes["all"] += sum(os.path.getsize(path) for path, _ in variants)
+
+    print(f"\n📦 {len(manifest['images'])} originals: {originals / 1e6:.1f} MB")
+    for name, sizes in per_format.items():
+        print(f"   {name:<5} at full width {sizes['largest'] / 1e6:>6.1f} MB "
+              f"(saves {1 - sizes['largest'] / originals:.0%} per card), all widths {sizes['all'] / 1e6:.1f} MB")
+
+
+def report_scaling(source_dir, limit):
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+
+    print(f"⏱️ Full build of {source_dir} by number of worker processes:")
+    baseline = None
+    for workers in counts:
+        output_dir = tempfile.mkdtemp(prefix="museum-images-")
+        try:
+            _, built, _, seconds, _ = build(source_dir, output_dir, workers=workers, force=True, quiet=True)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        baseline = baseline or seconds
+        print(f"   {workers:>3} workers  {seconds:>7.1f}s  {built / seconds:>6.1f} images/s  "
+              f"{baseline / seconds:.1f}x")
+
+
+def check_museum_images(manifest, dataset_path):
+    """Museums whose Image has no variants, so the front end falls back to the original"""
+    if not os.path.exists(dataset_path):
+        return []
+    with open(dataset_path, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+    return [museum["Name"] for museum in museums
+            if museum.get("Image") and museum["Image"] not in manifest["images"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive WebP/AVIF variants of the museum images")
+    parser.add_argument("--source-dir", default=SOURCE_DIR)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: every core)")
+    parser.add_argument("--force", action="store_true", help="Rebuild every image, even unchanged ones")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Only time full builds with 1, 2, 4, ... up to --workers processes")
+    parser.add_argument("--dataset", default="data/museum_details_full.json")
+    args = parser.parse_args()
+
+    if args.scaling:
+        report_scaling(args.source_dir, args.workers)
+        return
+
+    print(f"🖼️ Building {', '.join(available_formats())} variants with {args.workers} worker(s)...")
+    manifest, built, skipped, seconds, failures = build(args.source_dir, args.output_dir, args.workers, args.force)
+    print(f"✅ Built {built} images, {skipped} unchanged, in {seconds:.1f}s")
+    print(f"💾 Manifest: {os.path.join(args.output_dir, MANIFEST_NAME)}")
+    report_bytes(manifest, args.source_dir)
+
+    if failures:
+        print(f"\n❌ {len(failures)} images could not be built (check them with scripts/check_image_mismatches.py):")
+        for key, error in failures.items():
+            print(f"   {key}: {error}")
+
+    missing = check_museum_images(manifest, args.dataset)
+    if missing:
+        print(f"\n⚠️ {len(missing)} museums point at an image that was not built:")
+        for name in missing[:10]:
+            print(f"   {name}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""Prebuilt search index for the museum dataset.
+
+`generateSearchSuggestions` in scripts/search.js lowercases and substring
+scans every museum's name, address, facilities and description on every
+keystroke. This builds the same search as an index once:
+
+- an inverted index from every word to the museums and fields it occurs in,
+  with how often it occurs there and where it first occurs, so a snippet can
+  be cut from the description without searching it again
+- a trigram layer over the vocabulary, so partial words ("gogh", "useum")
+  and small typos ("rijksmuseim") still find their terms
+
+Results are ranked like the front end: name matches first, then address,
+then facilities and description, and by field-weighted score within each.
+
+    python3 scripts/build_search_index.py                    # write data/search_index.json
+    python3 scripts/build_search_index.py --query "van gogh"
+    python3 scripts/build_search_index.py --benchmark --scale 10
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+
+DATASET_PATH = "data/museum_details_full.json"
+INDEX_PATH = "data/search_index.json"
+
+# Indexed fields in ranking order, with their dataset key, tier and weight
+FIELDS = [
+    ("name", "Name", 1, 8.0),
+    ("address", "Address", 2, 4.0),
+    ("facilities", "Facilities", 3, 2.0),
+    ("description", "Description_Text", 3, 1.0),
+]
+NAME, ADDRESS, FACILITIES, DESCRIPTION = range(len(FIELDS))
+
+# How much a query word counts for depending on how it matched a term
+EXACT, PREFIX, SUBSTRING, FUZZY = 1.0, 0.8, 0.6, 0.4
+
+MAX_SUGGESTIONS = 8
+WORD_RE = re.compile(r"\w+")
+
+
+# --- Text normalization ---
+@lru_cache(maxsize=None)
+def _fold_char(char):
+    folded = "".join(c for c in unicodedata.normalize("NFKD", char.lower()) if not unicodedata.combining(c))
+    return folded if len(folded) == 1 else char
+
+
+def fold(text):
+    """Lowercase and strip accents without changing the length, so offsets stay valid"""
+    return "".join(map(_fold_char, text))
+
+
+def tokenize(text):
+    """(word, offset) pairs of the folded text"""
+    return [(match.group(), match.start()) for match in WORD_RE.finditer(fold(text))]
+
+
+def trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 as soon as it is certain to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+# --- Index ---
+class SearchIndex:
+    """Field-weighted inverted index with a trigram layer over its vocabulary.
+
+    `postings[term_id]` is a flat list of (museum, field, count, first offset)
+    quadruples; `terms` is sorted, so prefixes are a binary search.
+    """
+
+    def __init__(self, terms, postings, museums):
+        self.terms = terms
+        self.postings = postings
+        self.museums = museums
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.grams = {}
+        for term_id, term in enumerate(terms):
+            for gram in trigrams(term):
+                self.grams.setdefault(gram, []).append(term_id)
+
+    @classmethod
+    def build(cls, museums):
+        found = {}
+        for doc, museum in enumerate(museums):
+            for field, (_, key, _, _) in enumerate(FIELDS):
+                seen = {}
+                for word, offset in tokenize(museum.get(key) or ""):
+                    if word in seen:
+                        seen[word][0] += 1
+                    else:
+                        seen[word] = [1, offset]
+                for word, (count, offset) in seen.items():
+                    found.setdefault(word, []).extend((doc, field, count, offset))
+        terms = sorted(found)
+        return cls(terms, [found[term] for term in terms], museums)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH, dataset_path=DATASET_PATH):
+        """Load a saved index. The dataset is only read to show names, addresses and snippets"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with open(dataset_path, "r", encoding="utf-8") as f:
+            museums = json.load(f)
+        postings = []
+        for flat in data["postings"]:
+            # Museum numbers are stored as gaps from the previous posting
+            flat = list(flat)
+            for i in range(4, len(flat), 4):
+                flat[i] += flat[i - 4]
+            postings.append(flat)
+        return cls(data["terms"], postings, museums)
+
+    def to_json(self):
+        postings = []
+        for flat in self.postings:
+            flat = list(flat)
+            for i in range(len(flat) - 4, 0, -4):
+                flat[i] -= flat[i - 4]
+            postings.append(flat)
+        return {
+            "version": 1,
+            "fields": [name for name, _, _, _ in FIELDS],
+            "terms": self.terms,
+            "postings": postings,
+        }
+
+    def save(self, path=INDEX_PATH):
+        tmp = f"{path}.partial"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    # --- Term lookup ---
+    def expand(self, word):
+        """{term_id: match quality} for every vocabulary term a query word can stand for"""
+        matches = {}
+        term_id = self.term_ids.get(word)
+        if term_id is not None:
+            matches[term_id] = EXACT
+
+        # Words still being typed
+        start = bisect_left(self.terms, word)
+        for term_id in range(start, len(self.terms)):
+            if not self.terms[term_id].startswith(word):
+                break
+            matches.setdefault(term_id, PREFIX)
+
+        if len(word) < 3:
+            return matches
+
+        # Terms containing the word share all of its trigrams
+        grams = trigrams(word)
+        lists = sorted((self.grams.get(gram, []) for gram in grams), key=len)
+        if lists and lists[0]:
+            candidates = set(lists[0]).intersection(*lists[1:])
+            for term_id in candidates:
+                if word in self.terms[term_id]:
+                    matches.setdefault(term_id, SUBSTRING)
+
+        # Typos: terms sharing enough trigrams and within a small edit distance
+        if len(word) >= 4 and not matches:
+            limit = 1 if len(word) < 8 else 2
+            shared = {}
+            for gram in grams:
+                for term_id in self.grams.get(gram, ()):
+                    shared[term_id] = shared.get(term_id, 0) + 1
+            needed = max(1, len(grams) - 3 * limit)
+            for term_id, count in shared.items():
+                if count >= needed and edit_distance(word, self.terms[term_id], limit) <= limit:
+                    matches.setdefault(term_id, FUZZY)
+        return matches
+
+    # --- Queries ---
+    def search(self, query, limit=MAX_SUGGESTIONS):
+        """Ranked suggestions for a query, shaped like the front end's suggestions.
+
+        Every query word has to match somewhere in a museum. The tier of a
+        museum is the best field that matches all words on its own, or the
+        facilities/description tier when the words are spread over fields.
+        """
+        words = [word for word, _ in tokenize(query)]
+        if not words:
+            return []
+
+        # doc -> per query word: {field: (score, term_id)} of the best match in that field
+        hits = None
+        for position, word in enumerate(words):
+            word_hits = {}
+            for term_id, quality in self.expand(word).items():
+                flat = self.postings[term_id]
+                for i in range(0, len(flat), 4):
+                    doc, field, count, _ = flat[i:i + 4]
+                    if hits is not None and doc not in hits:
+                        continue
+                    score = quality * FIELDS[field][3] * (1 + 0.1 * min(count, 5))
+                    fields = word_hits.setdefault(doc, {})
+                    if score > fields.get(field, (0, None))[0]:
+                        fields[field] = (score, term_id)
+            if hits is None:
+                hits = {doc: [fields] for doc, fields in word_hits.items()}
+            else:
+                hits = {doc: hits[doc] + [word_hits[doc]] for doc in hits if doc in word_hits}
+            if not hits:
+                return []
+
+        ranked = []
+        for doc, per_word in hits.items():
+            common = set.intersection(*(set(fields) for fields in per_word))
+            best_field = min(common) if common else DESCRIPTION
+            tier = FIELDS[best_field][2]
+            score = sum(max(score for score, _ in fields.values()) for fields in per_word)
+            ranked.append((tier, -score, doc, best_field, per_word))
+        ranked.sort(key=lambda item: item[:3])
+
+        return [self._suggestion(doc, tier, -score, field, per_word)
+                for tier, score, doc, field, per_word in ranked[:limit]]
+
+    def _offset(self, doc, field, term_id):
+        flat = self.postings[term_id]
+        for i in range(0, len(flat), 4):
+            if flat[i] == doc and flat[i + 1] == field:
+                return flat[i + 3]
+        return 0
+
+    def _suggestion(self, doc, tier, score, field, per_word):
+        museum = self.museums[doc]
+        name = museum.get("Name", "")
+        address = museum.get("Address", "")
+        match_type = FIELDS[field][0]
+        if field in (NAME, ADDRESS):
+            details = f"📍 {address}"
+        elif field == FACILITIES:
+            details = f"🛠 Facilities: {museum.get('Facilities', '')[:50]}..."
+        else:
+            # Cut the snippet around the first word's stored offset instead of searching the text
+            fields = per_word[0]
+            term_id = fields[DESCRIPTION][1] if DESCRIPTION in fields else max(fields.values())[1]
+            description = museum.get("Description_Text", "")
+            offset = self._offset(doc, DESCRIPTION, term_id)
+            details = f"📝 ...{description[max(0, offset - 30):offset + 50]}..."
+        return {
+            "index": doc,
+            "name": name,
+            "details": details,
+            "matchType": match_type,
+            "priority": tier,
+            "score": round(score, 3),
+        }
+
+
+# --- Linear scan, as in scripts/search.js ---
+def scan_suggestions(museums, query, limit=MAX_SUGGESTIONS):
+    term = query.lower().strip()
+    suggestions = []
+    for index, museum in enumerate(museums):
+        name = museum.get("Name") or ""
+        address = museum.get("Address") or ""
+        description = museum.get("Description_Text") or ""
+        facilities = museum.get("Facilities") or ""
+        if term in name.lower():
+            priority = 1
+        elif term in address.lower():
+            priority = 2
+        elif term in facilities.lower() or term in description.lower():
+            priority = 3
+        else:
+            continue
+        if len(suggestions) < limit:
+            suggestions.append({"index": index, "name": name, "priority": priority})
+    return sorted(suggestions, key=lambda s: s["priority"])
+
+
+def sample_queries(museums, count, rng):
+    """Whole words, word prefixes and one-letter typos taken from the dataset"""
+    words = sorted({word for museum in museums for word, _ in tokenize(museum.get("Name", "")) if len(word) >= 4})
+    queries = []
+    for i in range(count):
+        word = rng.choice(words)
+        kind = i % 3
+        if kind == 1:
+            word = word[:max(2, len(word) // 2)]
+        elif kind == 2:
+            at = rng.randrange(len(word))
+            word = word[:at] + rng.choice("aeiounrst") + word[at + 1:]
+        queries.append(word)
+    return queries
+
+
+def benchmark(museums, queries, scale):
+    rng = random.Random(0)
+    corpus = museums * scale
+    samples = sample_queries(museums, queries, rng)
+
+    started = time.perf_counter()
+    index = SearchIndex.build(corpus)
+    build = time.perf_counter() - started
+    size = len(json.dumps(index.to_json(), ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    latencies = {"linear scan": [], "index": []}
+    for query in samples:
+        started = time.perf_counter()
+        scan_suggestions(corpus, query)
+        latencies["linear scan"].append(time.perf_counter() - started)
+        started = time.perf_counter()
+        index.search(query)
+        latencies["index"].append(time.perf_counter() - started)
+
+    print(f"⏱️ {len(samples)} queries over {len(corpus)} museums "
+          f"(index built in {build * 1000:.0f} ms, {size / 1024:.0f} KB):")
+    for path, values in latencies.items():
+        values.sort()
+        p50 = values[len(values) // 2]
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"   {path:<12} p50 {p50 * 1000:>7.2f} ms  p95 {p95 * 1000:>7.2f} ms  "
+              f"total {sum(values) * 1000:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the museum search index")
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--output", default=INDEX_PATH)
+    parser.add_argument("--query", help="Show the suggestions for this search")
+    parser.add_argument("--benchmark", action="store_true", help="Compare query latency with the linear scan")
+    parser.add_argument("--queries", type=int, default=300, help="Number of sampled queries for --benchmark")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat the dataset this many times for --benchmark")
+    args = parser.parse_args()
+
+    print("📖 Loading museum data...")
+    with open(args.input, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+
+    started = time.perf_counter()
+    index = SearchIndex.build(museums)
+    elapsed = time.perf_counter() - started
+    index.save(args.output)
+    print(f"✅ Indexed {len(museums)} museums, {len(index.terms)} terms, {len(index.grams)} trigrams "
+          f"in {elapsed * 1000:.0f} ms")
+    print(f"💾 Saved {os.path.getsize(args.output) / 1024:.1f} KB to {args.output}")
+
+    if args.query:
+        print(f"\n🔍 Suggestions for {args.query!r}:")
+        for suggestion in index.search(args.query):
+            print(f"   [{suggestion['matchType']}] {suggestion['name']}")
+            print(f"      {suggestion['details']}")
+
+    if args.benchmark:
+        print()
+        benchmark(museums, args.queries, args.scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,55 @@
+"""Integrity check of the museum images against the dataset.
+
+Every image in images/ is hashed and fully decoded in a pool of worker
+processes. Results are cached by mtime and size in data/cache/, so a rerun
+only looks at files that changed. The check reports:
+
+- missing:          a museum's Image does not exist (fixable when an image named
+                    after the museum does; --fix writes those paths back)
+- corrupt:          the file cannot be decoded, or a JPEG/PNG ends before its
+                    end marker (a truncated download)
+- wrong_format:     the content is not what the extension says, e.g. a PNG named .jpg
+- duplicates:       files with identical bytes
+- near_duplicates:  files whose perceptual hashes differ in at most --distance bits,
+                    e.g. the same photo re-encoded or resized
+- orphans:          files no museum refers to
+
+The full report is written as JSON. The exit code is 1 when anything is
+missing (and not fixed) or corrupt, and with --strict also for the other
+findings, so the check can gate CI.
+
+    python3 scripts/check_image_mismatches.py
+    python3 scripts/check_image_mismatches.py --fix            # write fixable Image paths back, rebuild the shards
+    python3 scripts/check_image_mismatches.py --strict --report report.json
+"""
+import argparse
+import hashlib
 import json
+import math
 import os
 import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+DATASET_PATH = "data/museum_details_full.json"
+IMAGE_DIR = "images"
+CACHE_PATH = "data/cache/image_hashes.json"
+REPORT_PATH = "data/metrics/image_integrity.json"
+SHARDS_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "build_data_shards.py")
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+EXTENSION_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG", ".gif": "GIF", ".webp": "WEBP"}
+
+# Bumped whenever inspect_image changes what it stores, so old cache entries are redone
+CACHE_VERSION = 1
+HASH_SIZE = 32  # pHash: DCT of a 32x32 greyscale thumbnail...
+HASH_BITS = 8   # ...of which the lowest 8x8 frequencies make the 64-bit hash
+NEAR_DISTANCE = 6
+
 
 def clean_filename(name):
     """Clean filename using the same logic as before"""
@@ -13,101 +62,297 @@ def clean_filename(name):
     clean_name = clean_name.strip('_')  # Remove leading/trailing underscores
     return clean_name
 
-# Load JSON data
-print("📖 Loading museum data...")
-with open("data/museum_details_full.json", "r", encoding="utf-8") as f:
-    museums = json.load(f)
-
-# Get list of actual image files
-print("🖼️ Scanning image files...")
-image_files = set()
-if os.path.exists("images"):
-    for file in os.listdir("images"):
-        if file.lower().endswith('.jpg'):
-            image_files.add(file)
-
-print(f"Found {len(image_files)} image files")
-
-# Check for mismatches
-mismatches = []
-missing_images = []
-fixed_count = 0
-
-print("\n🔍 Checking for mismatches...")
-
-for museum in museums:
-    name = museum.get("Name", "")
-    current_image_path = museum.get("Image", "")
-    
-    if not current_image_path or not name:
-        continue
-    
-    # Extract current filename
-    current_filename = os.path.basename(current_image_path)
-    
-    # Check if current filename exists
-    if current_filename not in image_files:
-        # Generate what the clean filename should be
-        clean_name = clean_filename(name)
-        expected_filename = clean_name + ".jpg"
-        
-        if expected_filename in image_files:
-            # Found a mismatch that can be fixed
-            mismatches.append({
-                'museum': name,
-                'current': current_filename,
-                'expected': expected_filename,
-                'fixable': True
-            })
-            
-            # Fix it
-            museum["Image"] = f"images/{expected_filename}"
-            fixed_count += 1
+
+# --- One file, in a worker process ---
+_COSINES = [
+    [math.cos(math.pi * (2 * x + 1) * u / (2 * HASH_SIZE)) for x in range(HASH_SIZE)]
+    for u in range(HASH_BITS)
+]
+
+
+def perceptual_hash(image):
+    """64-bit DCT hash: bit set where a low frequency is above the median of the others"""
+    pixels = image.convert("L").resize((HASH_SIZE, HASH_SIZE), Image.LANCZOS).tobytes()
+    rows = [pixels[y * HASH_SIZE:(y + 1) * HASH_SIZE] for y in range(HASH_SIZE)]
+    # The 2D DCT is separable: transform the rows, then the columns of the result
+    row_dct = [[sum(c * p for c, p in zip(cosines, row)) for cosines in _COSINES] for row in rows]
+    coefficients = [
+        sum(_COSINES[v][y] * row_dct[y][u] for y in range(HASH_SIZE))
+        for v in range(HASH_BITS) for u in range(HASH_BITS)
+    ]
+    # The DC term only says how bright the image is
+    median = sorted(coefficients[1:])[len(coefficients[1:]) // 2]
+    return sum(1 << i for i, value in enumerate(coefficients) if value > median)
+
+
+def truncation_problem(data, image_format):
+    """Why a JPEG or PNG looks cut off, or None"""
+    if image_format == "JPEG" and not data.rstrip(b"\0").endswith(b"\xff\xd9"):
+        return "JPEG has no end-of-image marker"
+    if image_format == "PNG" and b"IEND" not in data[-12:]:
+        return "PNG has no IEND chunk"
+    return None
+
+
+def inspect_image(path):
+    """Hashes, format and decode problems of one image file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    result = {"sha256": hashlib.sha256(data).hexdigest(), "format": None, "phash": None, "error": None}
+    try:
+        with Image.open(path) as image:
+            result["format"] = image.format
+            result["width"], result["height"] = image.size
+            image.load()  # Decodes every byte; raises on truncated or damaged data
+            result["phash"] = format(perceptual_hash(image), "016x")
+        result["error"] = truncation_problem(data, result["format"])
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _inspect_task(args):
+    file, path = args
+    return file, inspect_image(path)
+
+
+# --- Scanning with the cache ---
+def load_cache(path):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache["files"]
+    return {}
+
+
+def save_cache(path, files):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.partial"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def scan_images(image_dir, cache_path, workers=None):
+    """{file name: inspection result} for every image, and how many had to be inspected"""
+    cache = load_cache(cache_path)
+    files = {}
+    todo = []
+    for file in sorted(os.listdir(image_dir)):
+        path = os.path.join(image_dir, file)
+        if not file.lower().endswith(IMAGE_EXTENSIONS) or not os.path.isfile(path):
+            continue
+        stat = os.stat(path)
+        cached = cache.get(file)
+        if cached and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size:
+            files[file] = cached
         else:
-            # Image is completely missing
-            missing_images.append({
-                'museum': name,
-                'current': current_filename,
-                'expected': expected_filename
-            })
-            mismatches.append({
-                'museum': name,
-                'current': current_filename,
-                'expected': expected_filename,
-                'fixable': False
-            })
-
-# Show results
-print(f"\n📊 Results:")
-print(f"   Total museums: {len(museums)}")
-print(f"   Mismatches found: {len(mismatches)}")
-print(f"   Fixed automatically: {fixed_count}")
-print(f"   Missing images: {len(missing_images)}")
-
-if mismatches:
-    print(f"\n❌ Image Mismatches:")
-    for mismatch in mismatches[:10]:  # Show first 10
-        status = "✅ FIXED" if mismatch['fixable'] else "❌ MISSING"
-        print(f"   {status} {mismatch['museum']}")
-        print(f"      Current:  {mismatch['current']}")
-        print(f"      Expected: {mismatch['expected']}")
-        print()
-    
-    if len(mismatches) > 10:
-        print(f"   ... and {len(mismatches) - 10} more")
-
-# Save fixed JSON if we made changes
-if fixed_count > 0:
-    print(f"\n💾 Saving {fixed_count} fixes to JSON...")
-    with open("data/museum_details_full.json", "w", encoding="utf-8") as f:
-        json.dump(museums, f, indent=2, ensure_ascii=False)
-    print("✅ JSON updated with correct image paths")
-
-if missing_images:
-    print(f"\n⚠️ Missing Images (need to be created or found):")
-    for missing in missing_images[:5]:
-        print(f"   {missing['museum']} -> {missing['expected']}")
-    if len(missing_images) > 5:
-        print(f"   ... and {len(missing_images) - 5} more")
-
-print(f"\n🎯 Summary: {fixed_count} images fixed, {len(missing_images)} still missing")
\ No newline at end of file
+            files[file] = {"mtime": stat.st_mtime, "size": stat.st_size}
+            todo.append((file, path))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for file, result in pool.map(_inspect_task, todo, chunksize=8):
+                files[file].update(result)
+    save_cache(cache_path, files)
+    return files, len(todo)
+
+
+# --- Findings ---
+def find_missing(museums, files):
+    """Museums whose Image does not exist, with the image named after the museum if there is one"""
+    missing = []
+    for index, museum in enumerate(museums):
+        name = museum.get("Name", "")
+        current = museum.get("Image", "")
+        if not current or not name or os.path.basename(current) in files:
+            continue
+        expected = clean_filename(name) + ".jpg"
+        missing.append({
+            "index": index,
+            "museum": name,
+            "current": current,
+            "expected": f"{IMAGE_DIR}/{expected}",
+            "fixable": expected in files,
+        })
+    return missing
+
+
+def find_duplicates(files):
+    """Groups of files with identical content"""
+    groups = {}
+    for file, info in files.items():
+        if info.get("sha256"):
+            groups.setdefault(info["sha256"], []).append(file)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def find_near_duplicates(files, distance=NEAR_DISTANCE):
+    """Pairs of different files whose perceptual hashes are at most `distance` bits apart.
+
+    By the pigeonhole principle two such hashes agree exactly on at least one
+    of `distance + 1` bands, so only files sharing a band value are compared.
+    """
+    hashes = {}
+    for file, info in files.items():
+        if info.get("phash"):
+            hashes.setdefault(info["sha256"], (file, int(info["phash"], 16)))
+    items = list(hashes.values())
+
+    bands = distance + 1
+    width = 64 // bands
+    buckets = {}
+    for i, (_, value) in enumerate(items):
+        for band in range(bands):
+            # The last band takes the bits left over
+            bits = width if band < bands - 1 else 64 - width * band
+            key = (band, value >> (band * width) & ((1 << bits) - 1))
+            buckets.setdefault(key, []).append(i)
+
+    pairs = {}
+    for members in buckets.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                i, j = members[a], members[b]
+                if (i, j) not in pairs:
+                    d = hamming(items[i][1], items[j][1])
+                    if d <= distance:
+                        pairs[(i, j)] = d
+    return sorted(
+        ({"files": sorted([items[i][0], items[j][0]]), "distance": d} for (i, j), d in pairs.items()),
+        key=lambda pair: (pair["distance"], pair["files"]),
+    )
+
+
+def build_report(museums, files, distance):
+    referenced = {os.path.basename(museum["Image"]) for museum in museums if museum.get("Image")}
+    missing = find_missing(museums, files)
+    fixed = {os.path.basename(m["expected"]) for m in missing if m["fixable"]}
+    return {
+        "images": len(files),
+        "museums": len(museums),
+        "missing": missing,
+        "corrupt": [
+            {"file": file, "error": info["error"]} for file, info in files.items() if info.get("error")
+        ],
+        "wrong_format": [
+            {"file": file, "format": info["format"]}
+            for file, info in files.items()
+            if info.get("format")
+            and info["format"] != EXTENSION_FORMATS.get(os.path.splitext(file)[1].lower())
+        ],
+        "duplicates": find_duplicates(files),
+        "near_duplicates": find_near_duplicates(files, distance),
+        "orphans": sorted(file for file in files if file not in referenced and file not in fixed),
+    }
+
+
+def failures(report, strict=False, fixed=False):
+    """Names of the findings that make the check fail"""
+    failed = []
+    if any(not (fixed and m["fixable"]) for m in report["missing"]):
+        failed.append("missing")
+    if report["corrupt"]:
+        failed.append("corrupt")
+    if strict:
+        failed += [key for key in ("wrong_format", "duplicates", "near_duplicates", "orphans") if report[key]]
+    return failed
+
+
+def apply_fixes(museums, missing, dataset_path):
+    fixes = [m for m in missing if m["fixable"]]
+    for m in fixes:
+        museums[m["index"]]["Image"] = m["expected"]
+    if fixes:
+        tmp = f"{dataset_path}.partial"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(museums, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, dataset_path)
+    return len(fixes)
+
+
+def rebuild_shards(dataset_path):
+    """Rebuild data/manifest.json and the shards, which is what the site loads instead of the full JSON"""
+    print("🧩 Rebuilding the data shards for the site...")
+    if subprocess.run([sys.executable, SHARDS_SCRIPT, "--input", dataset_path]).returncode:
+        print("⚠️ Could not rebuild the data shards, run python3 scripts/build_data_shards.py by hand")
+
+
+def print_summary(report, limit=5):
+    print(f"\n📊 Results for {report['images']} images and {report['museums']} museums:")
+    sections = [
+        ("missing", "❌ Missing images", lambda m: f"{m['museum']}: {m['current']}"
+         + (f" -> {m['expected']} exists" if m["fixable"] else "")),
+        ("corrupt", "❌ Corrupt images", lambda c: f"{c['file']}: {c['error']}"),
+        ("wrong_format", "⚠️ Extension does not match the content",
+         lambda w: f"{w['file']} is {w['format'] or 'unknown'}"),
+        ("duplicates", "⚠️ Identical files", lambda group: ", ".join(group)),
+        ("near_duplicates", "⚠️ Near duplicates", lambda p: f"{' ~ '.join(p['files'])} ({p['distance']} bits)"),
+        ("orphans", "⚠️ Not used by any museum", lambda file: file),
+    ]
+    for key, title, describe in sections:
+        found = report[key]
+        if not found:
+            continue
+        print(f"\n{title}: {len(found)}")
+        for item in found[:limit]:
+            print(f"   {describe(item)}")
+        if len(found) > limit:
+            print(f"   ... and {len(found) - limit} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the museum images for missing, corrupt and duplicate files")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--image-dir", default=IMAGE_DIR)
+    parser.add_argument("--cache", default=CACHE_PATH)
+    parser.add_argument("--report", default=REPORT_PATH, help="Where to write the JSON report")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--distance", type=int, default=NEAR_DISTANCE,
+                        help="Most perceptual hash bits two near duplicates may differ in")
+    parser.add_argument("--fix", action="store_true", help="Point museums at the image named after them if theirs is missing")
+    parser.add_argument("--strict", action="store_true", help="Also fail on wrong formats, duplicates and orphans")
+    args = parser.parse_args()
+
+    print("📖 Loading museum data...")
+    with open(args.dataset, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+
+    print("🖼️ Scanning image files...")
+    started = time.perf_counter()
+    files, inspected = scan_images(args.image_dir, args.cache, args.workers)
+    print(f"Found {len(files)} image files, inspected {inspected} new or changed "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    report = build_report(museums, files, args.distance)
+    if args.fix:
+        fixed = apply_fixes(museums, report["missing"], args.dataset)
+        if fixed:
+            print(f"💾 Fixed {fixed} image paths in {args.dataset}")
+            if os.path.abspath(args.dataset) == os.path.abspath(DATASET_PATH):
+                rebuild_shards(args.dataset)
+            else:
+                print(f"⚠️ The site shards are not rebuilt from {args.dataset}; "
+                      f"run python3 scripts/build_data_shards.py --input {args.dataset} if the site should use it")
+    print_summary(report)
+
+    failed = failures(report, args.strict, args.fix)
+    report["failed"] = failed
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Report: {args.report}")
+
+    if failed:
+        print(f"❌ Check failed: {', '.join(failed)}")
+        sys.exit(1)
+    print("✅ Check passed")
+
+
+if __name__ == "__main__":
+    main()
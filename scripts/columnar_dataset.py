@@ -0,0 +1,408 @@
+"""Columnar, dictionary-encoded export of the museum dataset.
+
+The JSON repeats its 16 key names on every museum and the same few strings
+("Closed", "10:00 - 17:00", facility names) hundreds of times. This format
+stores every field as a column instead:
+
+- dict:  a table of the distinct values plus one small integer per museum
+- plain: the values themselves, for columns where nearly every value is unique
+- set:   comma separated lists (Facilities) as a table of items, a bitset per
+         museum (as many bytes per museum as the items need) and the index of
+         the order the items were listed in
+- json:  any column holding something other than strings, one JSON value each
+
+String tables are stored as one UTF-8 blob with character offsets, integer
+arrays as little-endian bytes. A museum without a field is marked in the
+column's presence bitmap, and a museum whose keys are not in column order
+has its key order stored, so decoding gives back exactly the original JSON.
+
+File layout: b"MCOL", a version byte, the length of a JSON header as a
+4-byte little-endian integer, the header, then the payload the header's
+(offset, length) pairs point into.
+
+    python3 scripts/columnar_dataset.py                  # write data/museum_details_full.mcol
+    python3 scripts/columnar_dataset.py --check          # round trip and compare only
+"""
+import argparse
+import gzip
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+
+DATASET_PATH = "data/museum_details_full.json"
+COLUMNAR_PATH = "data/museum_details_full.mcol"
+
+MAGIC = b"MCOL"
+VERSION = 2
+
+# Columns with fewer distinct values than this share of the rows are dictionary encoded
+DICT_RATIO = 0.5
+SET_SEPARATOR = ", "
+SET_COLUMNS = {"Facilities"}
+
+
+# --- Low level buffers ---
+def _typecode(largest):
+    for code in ("B", "H", "I"):
+        if largest < 1 << (8 * array(code).itemsize):
+            return code
+    return "Q"
+
+
+def _int_bytes(values):
+    values = array(_typecode(max(values, default=0)), values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.typecode, values.tobytes()
+
+
+def _int_array(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class _Payload:
+    """Collects binary buffers and hands out (offset, length) references to them"""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def add(self, data):
+        ref = [self.size, len(data)]
+        self.parts.append(data)
+        self.size += len(data)
+        return ref
+
+    def ints(self, values):
+        typecode, data = _int_bytes(values)
+        return [*self.add(data), typecode]
+
+    def bitsets(self, values, width):
+        """Non-negative ints as `width` little-endian bytes each"""
+        return self.add(b"".join(value.to_bytes(width, "little") for value in values))
+
+    def strings(self, values):
+        offsets = [0]
+        for value in values:
+            offsets.append(offsets[-1] + len(value))
+        return {"text": self.add("".join(values).encode("utf-8")), "offsets": self.ints(offsets)}
+
+
+def _read_strings(payload, ref):
+    offset, length = ref["text"]
+    text = bytes(payload[offset:offset + length]).decode("utf-8")
+    offsets = _read_ints(payload, ref["offsets"])
+    return [text[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def _read_ints(payload, ref):
+    offset, length, typecode = ref
+    return _int_array(typecode, payload[offset:offset + length])
+
+
+# --- Writing ---
+def _set_items(values):
+    """(items, rows) if every value is a clean SET_SEPARATOR list, else None"""
+    items = {}
+    rows = []
+    for value in values:
+        parts = value.split(SET_SEPARATOR) if value else []
+        if any(not part or part != part.strip() for part in parts) or len(set(parts)) != len(parts):
+            return None
+        rows.append([items.setdefault(part, len(items)) for part in parts])
+    return list(items), rows
+
+
+def _encode_column(payload, name, values, rows):
+    """Header entry for one column; `values` holds the values of the rows that have it"""
+    column = {"name": name}
+
+    if any(not isinstance(value, str) for value in values):
+        column["kind"] = "json"
+        column["values"] = payload.strings([json.dumps(value, ensure_ascii=False) for value in values])
+        return column
+
+    if name in SET_COLUMNS:
+        parsed = _set_items(values)
+        if parsed is not None:
+            items, item_rows = parsed
+            orders = {}
+            column["kind"] = "set"
+            column["items"] = payload.strings(items)
+            # Bytes per bitset follow the number of items, so new facilities never overflow
+            column["stride"] = max(1, (len(items) + 7) // 8)
+            column["bits"] = payload.bitsets([sum(1 << item for item in row) for row in item_rows], column["stride"])
+            column["order"] = payload.ints([orders.setdefault(tuple(row), len(orders)) for row in item_rows])
+            column["orders"] = payload.ints([item for order in orders for item in (len(order), *order)])
+            return column
+
+    distinct = {}
+    for value in values:
+        distinct.setdefault(value, len(distinct))
+    if len(distinct) < rows * DICT_RATIO:
+        column["kind"] = "dict"
+        column["table"] = payload.strings(list(distinct))
+        column["index"] = payload.ints([distinct[value] for value in values])
+    else:
+        column["kind"] = "plain"
+        column["values"] = payload.strings(values)
+    return column
+
+
+def encode(records):
+    """Columnar bytes for a list of flat dicts"""
+    names = []
+    seen = set()
+    for record in records:
+        for name in record:
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+
+    payload = _Payload()
+    columns = []
+    for name in names:
+        present = [name in record for record in records]
+        column = _encode_column(payload, name, [record[name] for record in records if name in record], len(records))
+        if not all(present):
+            bitmap = bytearray((len(records) + 7) // 8)
+            for row, has in enumerate(present):
+                if has:
+                    bitmap[row >> 3] |= 1 << (row & 7)
+            column["present"] = payload.add(bytes(bitmap))
+        columns.append(column)
+
+    # Key order is only stored for records that do not follow the column order
+    position = {name: i for i, name in enumerate(names)}
+    key_orders = {
+        str(row): [position[name] for name in record]
+        for row, record in enumerate(records)
+        if list(record) != sorted(record, key=position.get)
+    }
+
+    header = json.dumps(
+        {"rows": len(records), "columns": columns, "key_orders": key_orders},
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+    return MAGIC + bytes([VERSION]) + struct.pack("<I", len(header)) + header + b"".join(payload.parts)
+
+
+def write(records, path=COLUMNAR_PATH):
+    data = encode(records)
+    tmp = f"{path}.partial"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+# --- Reading ---
+class ColumnarDataset:
+    """Decoded columnar file. Columns are decoded on first use and kept.
+
+    `column(name)` gives one value per row, with None where a row does not
+    have the field; `records()` rebuilds the original list of dicts.
+    """
+
+    def __init__(self, data):
+        data = memoryview(data)
+        if bytes(data[:4]) != MAGIC:
+            raise ValueError("Not a columnar museum dataset")
+        if data[4] != VERSION:
+            raise ValueError(f"Unsupported columnar dataset version {data[4]}")
+        header_length = struct.unpack("<I", data[5:9])[0]
+        header = json.loads(bytes(data[9:9 + header_length]).decode("utf-8"))
+        self.payload = data[9 + header_length:]
+        self.rows = header["rows"]
+        self.key_orders = {int(row): order for row, order in header["key_orders"].items()}
+        self.specs = {column["name"]: column for column in header["columns"]}
+        self.names = [column["name"] for column in header["columns"]]
+        self._columns = {}
+
+    def present(self, name):
+        """Per row whether it has the field"""
+        spec = self.specs[name]
+        if "present" not in spec:
+            return [True] * self.rows
+        offset, length = spec["present"]
+        bitmap = self.payload[offset:offset + length]
+        return [bool(bitmap[row >> 3] >> (row & 7) & 1) for row in range(self.rows)]
+
+    def _values(self, name):
+        """Values of the rows that have the field, in row order"""
+        spec = self.specs[name]
+        kind = spec["kind"]
+        if kind == "plain":
+            return _read_strings(self.payload, spec["values"])
+        if kind == "json":
+            return [json.loads(value) for value in _read_strings(self.payload, spec["values"])]
+        if kind == "dict":
+            table = _read_strings(self.payload, spec["table"])
+            return [table[i] for i in _read_ints(self.payload, spec["index"])]
+        if kind == "set":
+            items = _read_strings(self.payload, spec["items"])
+            flat = _read_ints(self.payload, spec["orders"])
+            orders = []
+            i = 0
+            while i < len(flat):
+                orders.append(SET_SEPARATOR.join(items[item] for item in flat[i + 1:i + 1 + flat[i]]))
+                i += 1 + flat[i]
+            return [orders[i] for i in _read_ints(self.payload, spec["order"])]
+        raise ValueError(f"Unknown column kind {kind!r}")
+
+    def column(self, name):
+        if name not in self._columns:
+            values = self._values(name)
+            if "present" in self.specs[name]:
+                it = iter(values)
+                values = [next(it) if has else None for has in self.present(name)]
+            self._columns[name] = values
+        return self._columns[name]
+
+    def set_items(self, name):
+        """Item names of a set column; bit i of `set_bits(name)[row]` stands for item i"""
+        return _read_strings(self.payload, self.specs[name]["items"])
+
+    def set_bits(self, name):
+        """Per row bitset of a set column, for filtering without building strings.
+        Rows without the field are left out, like in the stored column"""
+        spec = self.specs[name]
+        offset, length = spec["bits"]
+        stride = spec["stride"]
+        data = self.payload[offset:offset + length]
+        return [int.from_bytes(data[i:i + stride], "little") for i in range(0, length, stride)]
+
+    def records(self):
+        names = self.names
+        columns = [self.column(name) for name in names]
+        present = {i: self.present(name) for i, name in enumerate(names) if "present" in self.specs[name]}
+        all_columns = range(len(names))
+        records = []
+        for row in range(self.rows):
+            order = self.key_orders.get(row)
+            if order is None:
+                missing = [i for i, has in present.items() if not has[row]]
+                order = [i for i in all_columns if i not in missing] if missing else all_columns
+            records.append({names[i]: columns[i][row] for i in order})
+        return records
+
+
+def decode(data):
+    return ColumnarDataset(data)
+
+
+def read(path=COLUMNAR_PATH):
+    with open(path, "rb") as f:
+        return ColumnarDataset(f.read())
+
+
+# --- Round trip and report ---
+def round_trip_problems(records, data):
+    """Differences between the records and what decoding `data` gives back"""
+    decoded = decode(data).records()
+    problems = []
+    if len(decoded) != len(records):
+        problems.append(f"{len(decoded)} records decoded, {len(records)} expected")
+    for row, (original, copy) in enumerate(zip(records, decoded)):
+        if list(original.items()) != list(copy.items()):
+            problems.append(f"record {row} differs")
+
+    # The bitsets are not used by records(), so check them against the values
+    dataset = decode(data)
+    for name in dataset.names:
+        if dataset.specs[name]["kind"] != "set":
+            continue
+        bit = {item: 1 << i for i, item in enumerate(dataset.set_items(name))}
+        values = [record[name] for record in records if name in record]
+        expected = [sum(bit[item] for item in value.split(SET_SEPARATOR)) if value else 0 for value in values]
+        if dataset.set_bits(name) != expected:
+            problems.append(f"bitsets of set column {name} differ")
+    return problems
+
+
+def wide_set_records(records, count=80):
+    """The records with `count` made-up facilities spread over them, more than one 64-bit word holds"""
+    extra = [f"Facility {i}" for i in range(count)]
+    result = []
+    for row, record in enumerate(records):
+        record = dict(record)
+        items = [item for i, item in enumerate(extra) if (row + i) % 3 == 0]
+        if record.get("Facilities"):
+            items = record["Facilities"].split(SET_SEPARATOR) + items
+        record["Facilities"] = SET_SEPARATOR.join(items)
+        result.append(record)
+    return result
+
+
+def best_time(func, repeat=10):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def decode_columns(data):
+    dataset = decode(data)
+    return [dataset.column(name) for name in dataset.names]
+
+
+def report(json_body, data):
+    compact = json.dumps(json.loads(json_body), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    print(f"{'':<22} {'bytes':>10} {'gzip':>9} {'decode ms':>10}")
+    rows = [
+        ("JSON (as served)", json_body, lambda: json.loads(json_body)),
+        ("JSON (compact)", compact, lambda: json.loads(compact)),
+        ("columnar -> columns", data, lambda: decode_columns(data)),
+        ("columnar -> records", data, lambda: decode(data).records()),
+    ]
+    for label, body, func in rows:
+        print(f"{label:<22} {len(body):>10,} {len(gzip.compress(body)):>9,} {best_time(func) * 1000:>10.2f}")
+    print(f"\n📉 Columnar is {1 - len(data) / len(json_body):.0%} smaller than the JSON "
+          f"({1 - len(gzip.compress(data)) / len(gzip.compress(json_body)):.0%} gzipped)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the museum dataset to the columnar format")
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--output", default=COLUMNAR_PATH)
+    parser.add_argument("--check", action="store_true", help="Only run the round trip and the report, write nothing")
+    args = parser.parse_args()
+
+    print("📖 Loading museum data...")
+    with open(args.input, "rb") as f:
+        json_body = f.read()
+    records = json.loads(json_body)
+
+    data = encode(records)
+    problems = round_trip_problems(records, data)
+    wide = wide_set_records(records)
+    problems += [f"with 80 extra facilities: {problem}" for problem in round_trip_problems(wide, encode(wide))]
+    if problems:
+        print(f"❌ Round trip is not lossless: {len(problems)} problem(s)")
+        for problem in problems[:10]:
+            print(f"   {problem}")
+        sys.exit(1)
+    print(f"✅ Round trip of {len(records)} museums is lossless, also with 80 extra facilities")
+
+    if not args.check:
+        write(records, args.output)
+        print(f"💾 Saved {len(data):,} bytes to {args.output}")
+
+    header = decode(data)
+    kinds = ", ".join(f"{name} ({header.specs[name]['kind']})" for name in header.names)
+    print(f"🧱 Columns: {kinds}\n")
+    report(json_body, data)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,11 @@ const CONFIG = {
   cardTemplateURL: "cards.html",
   listTemplateURL: "list-card.html",
   dataURL: "data/museum_details_full.json",
+  // Summary and detail shards built by scripts/build_data_shards.py
+  manifestURL: "data/manifest.json",
+  // Responsive variants built by scripts/build_images.py
+  imageManifestURL: "images/responsive/manifest.json",
+  imagePlaceholdersURL: "images/responsive/placeholders.json",
   container: document.getElementById("cards"),
 };
 
@@ -10,3 +15,4 @@ const CONFIG = {
 let currentView = "grid";
 let selectedDate = null;
 let museumData = null;
+let imageVariants = {};
@@ -21,10 +21,99 @@ async function loadTemplates() {
   return { gridTemplate, listTemplate };
 }
 
+// Shard files are named after their content, so they never change once published
+let dataManifest = null;
+const detailShards = {};
+
 async function loadData() {
-  const res = await fetch(CONFIG.dataURL);
-  return await res.json();
+  try {
+    // The manifest is small and has to be revalidated; everything it points at can come from cache
+    const manifestRes = await fetch(CONFIG.manifestURL, { cache: "no-cache" });
+    if (!manifestRes.ok) throw new Error(`HTTP ${manifestRes.status}`);
+    const manifest = await manifestRes.json();
+    const res = await fetch(manifest.summary, { cache: "force-cache" });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const data = await res.json();
+    dataManifest = manifest;
+    return data;
+  } catch (error) {
+    console.warn("Data shards unavailable, loading the full dataset:", error);
+    const res = await fetch(CONFIG.dataURL);
+    return await res.json();
+  }
+}
+
+// Without the image manifest the cards simply use the original images
+async function loadImageManifest() {
+  try {
+    const res = await fetch(CONFIG.imageManifestURL, { cache: "no-cache" });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const manifest = await res.json();
+    return manifest.images || {};
+  } catch (error) {
+    console.warn("Responsive images unavailable, using the originals:", error);
+    return {};
+  }
+}
+
+// Blur-up placeholders per image, loaded after the manifest since they are most of its bytes
+async function loadImagePlaceholders() {
+  try {
+    const res = await fetch(CONFIG.imagePlaceholdersURL, { cache: "no-cache" });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    return await res.json();
+  } catch (error) {
+    console.warn("Image placeholders unavailable:", error);
+    return {};
+  }
+}
+
+function loadDetailShard(shardIndex) {
+  if (!detailShards[shardIndex]) {
+    detailShards[shardIndex] = fetch(dataManifest.details[shardIndex], {
+      cache: "force-cache",
+    })
+      .then((res) => {
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        return res.json();
+      })
+      .then((shard) => {
+        // Merge the details into the summary records, so search and cards see them too
+        Object.entries(shard).forEach(([index, details]) => {
+          Object.assign(museumData[index], details);
+        });
+        return shard;
+      })
+      .catch((error) => {
+        delete detailShards[shardIndex]; // Try again next time
+        throw error;
+      });
+  }
+  return detailShards[shardIndex];
+}
+
+// Full record of one museum, fetching its detail shard if needed
+async function loadMuseumDetails(index) {
+  if (dataManifest) {
+    await loadDetailShard(Math.floor(index / dataManifest.bucket_size));
+  }
+  return museumData[index];
+}
+
+// Fetch the remaining shards while the browser is idle, so full text search works shortly after first paint
+function prefetchMuseumDetails() {
+  if (!dataManifest) return;
+  const idle = window.requestIdleCallback || ((callback) => setTimeout(callback, 200));
+  let next = 0;
+  const fetchNext = () => {
+    if (next >= dataManifest.details.length) return;
+    loadDetailShard(next++)
+      .catch((error) => console.warn("Failed to prefetch museum details:", error))
+      .finally(() => idle(fetchNext));
+  };
+  idle(fetchNext);
 }
 
 // Make isMobileDevice available globally
 window.isMobileDevice = isMobileDevice;
+window.loadMuseumDetails = loadMuseumDetails;
@@ -61,6 +61,22 @@ function formatFacilities(facilityText) {
     .join("");
 }
 
+// srcset of one format's variants, or "" so the browser skips that <source>
+function formatImageSrcset(image, format) {
+  const entry = imageVariants[image];
+  if (!entry || !entry.variants[format]) return "";
+  return entry.variants[format]
+    .map(([path, width]) => `${path} ${width}w`)
+    .join(", ");
+}
+
+// Blurred placeholder shown behind the image until it has loaded
+function formatImageStyle(image) {
+  const entry = imageVariants[image];
+  if (!entry || !entry.placeholder) return "";
+  return `background: url(${entry.placeholder}) center / cover no-repeat`;
+}
+
 function formatOpeningHoursForModal(data) {
   const days = [
     "Monday",
@@ -0,0 +1,216 @@
+"""Load test for scripts/api_server.py with a local asyncio client.
+
+Every level opens `concurrency` keep-alive connections that send requests
+back to back for `--duration` seconds, and reports requests per second and
+latency percentiles. Requests are a fixed, seeded mix of searches, filters,
+open-at queries, single museums and the compressed dataset; a share of them
+are conditional GETs with the ETag of an earlier response, like a browser
+revalidating its cache.
+
+    python3 scripts/load_test.py --spawn                       # start a server on a free port and test it
+    python3 scripts/load_test.py --url http://127.0.0.1:8000 --concurrency 1 8 32 --duration 10
+
+Client and server share the machine, so on few cores the client's own work
+limits the numbers at high concurrency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+from build_facet_index import FacetIndex, sample_selections
+from build_hours_index import DAYS
+from build_search_index import sample_queries
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scraping"))
+from http_fetch import percentile  # noqa: E402
+
+DATASET_PATH = "data/museum_details_full.json"
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_server.py")
+
+# Share of each kind of request in the mix
+MIX = {"search": 0.35, "filter": 0.25, "open": 0.15, "museum": 0.15, "dataset": 0.10}
+CONDITIONAL_SHARE = 0.3
+
+
+def request_mix(museums, count, rng):
+    """`count` request paths in the proportions of MIX"""
+    queries = sample_queries(museums, 100, rng)
+    selections = sample_selections(FacetIndex.build(museums), 100, rng)
+    kinds = list(MIX)
+    paths = []
+    for kind in rng.choices(kinds, weights=[MIX[kind] for kind in kinds], k=count):
+        if kind == "search":
+            paths.append("/api/search?" + urlencode({"q": rng.choice(queries)}))
+        elif kind == "filter":
+            selection = rng.choice(selections)
+            params = [
+                (name, value)
+                for facet, name in (("museum_card", "card"), ("city", "city"), ("facility", "facility"), ("hours", "hours"))
+                for value in selection.get(facet, [])
+            ]
+            paths.append("/api/filter?" + urlencode(params))
+        elif kind == "open":
+            paths.append("/api/open?" + urlencode({"day": rng.choice(DAYS), "time": f"{rng.randrange(8, 20):02d}:00"}))
+        elif kind == "museum":
+            paths.append(f"/api/museums/{rng.randrange(len(museums))}")
+        else:
+            paths.append("/" + DATASET_PATH)
+    return paths
+
+
+# --- Client ---
+async def send(reader, writer, host, path, etag=None):
+    """(status, etag, body size) of one GET on an open connection"""
+    head = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: br, gzip\r\n"
+    if etag:
+        head += f"If-None-Match: {etag}\r\n"
+    writer.write((head + "\r\n").encode("latin-1"))
+    await writer.drain()
+
+    lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length:
+        await reader.readexactly(length)
+    return status, headers.get("etag"), length
+
+
+async def client(host, port, paths, deadline, rng, results):
+    etags = {}
+    connection = None
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        etag = etags.get(path) if rng.random() < CONDITIONAL_SHARE else None
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(host, port)
+            status, new_etag, size = await send(*connection, host, path, etag)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            results["errors"] += 1
+            if connection:
+                connection[1].close()
+            connection = None
+            continue
+        results["latencies"].append(time.perf_counter() - started)
+        results["statuses"][status] = results["statuses"].get(status, 0) + 1
+        results["bytes"] += size
+        if new_etag:
+            etags[path] = new_etag
+    if connection:
+        connection[1].close()
+
+
+async def run_level(host, port, paths, concurrency, duration, seed):
+    results = {"latencies": [], "statuses": {}, "errors": 0, "bytes": 0}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*[
+        client(host, port, paths, deadline, random.Random(seed * 1000 + i), results)
+        for i in range(concurrency)
+    ])
+    results["seconds"] = time.perf_counter() - started
+    return results
+
+
+# --- Server process ---
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(port, timeout=120.0):
+    process = subprocess.Popen(
+        [sys.executable, SERVER_PATH, "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server did not start within {timeout:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the museum API server")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server to test")
+    parser.add_argument("--spawn", action="store_true", help="Start scripts/api_server.py on a free port instead")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level")
+    parser.add_argument("--requests", type=int, default=2000, help="Distinct request paths in the mix")
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        museums = json.load(f)
+    paths = request_mix(museums, args.requests, random.Random(0))
+
+    process = None
+    if args.spawn:
+        host, port = "127.0.0.1", free_port()
+        print(f"🚀 Starting the API server on port {port}...")
+        process = spawn_server(port)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+
+    rows = []
+    try:
+        print(f"⏱️ {args.duration:.0f}s per level, {len(paths)} request paths, "
+              f"{CONDITIONAL_SHARE:.0%} conditional GETs:")
+        print(f"   {'conc':>5} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'304s':>6} {'errors':>6}")
+        for level, concurrency in enumerate(args.concurrency):
+            results = asyncio.run(run_level(host, port, paths, concurrency, args.duration, level))
+            latencies = results["latencies"]
+            row = {
+                "concurrency": concurrency,
+                "requests": len(latencies),
+                "requests_per_second": len(latencies) / results["seconds"],
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+                "statuses": results["statuses"],
+                "errors": results["errors"],
+                "megabytes": results["bytes"] / 1e6,
+            }
+            rows.append(row)
+            print(f"   {concurrency:>5} {row['requests']:>9} {row['requests_per_second']:>8.0f} "
+                  f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+                  f"{results['statuses'].get(304, 0):>6} {results['errors']:>6}")
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"💾 Results: {args.output}")
+    other = {status for row in rows for status in row["statuses"] if status not in (200, 304)}
+    if other or any(row["errors"] for row in rows):
+        print(f"⚠️ Unexpected responses: {sorted(other)}, {sum(row['errors'] for row in rows)} connection errors")
+
+
+if __name__ == "__main__":
+    main()
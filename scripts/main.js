@@ -38,6 +38,23 @@
     // Setup navigation and initial render
     setupNavigation(templates, data);
 
+    // Descriptions and facilities arrive in the background after first paint
+    prefetchMuseumDetails();
+
+    // So do the responsive image variants, and after them the blur placeholders
+    loadImageManifest()
+      .then((images) => {
+        imageVariants = images;
+        applyImageVariants();
+        return loadImagePlaceholders();
+      })
+      .then((placeholders) => {
+        Object.entries(placeholders).forEach(([image, placeholder]) => {
+          if (imageVariants[image]) imageVariants[image].placeholder = placeholder;
+        });
+        applyImageVariants();
+      });
+
     // Handle window resize to reload templates if needed
     let resizeTimeout;
     let wasMobile = isMobileDevice();
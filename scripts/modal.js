@@ -1,13 +1,19 @@
 // Modal functionality
-function openMuseumPage(museumId) {
+async function openMuseumPage(museumId) {
   const index = parseInt(museumId.replace("museum-", ""));
-  const museum = museumData[index];
-
-  if (!museum) {
+  if (!museumData[index]) {
     console.error("Museum not found:", museumId, "Index:", index);
     return;
   }
 
+  // Description, facilities and links live in a detail shard that is fetched on first open
+  let museum = museumData[index];
+  try {
+    museum = await loadMuseumDetails(index);
+  } catch (error) {
+    console.error("Failed to load museum details:", error);
+  }
+
   const modal = document.getElementById("museum-modal");
   const modalBody = document.getElementById("museum-modal-body");
   const modalTitle = document.getElementById("modal-title");
@@ -15,10 +21,17 @@ function openMuseumPage(museumId) {
   // Update modal header
   modalTitle.textContent = museum["Name"] || "Unknown Museum";
 
+  const image = museum["Image"];
+  const imageSizes = "(max-width: 768px) 100vw, 640px";
+
   modalBody.innerHTML = `
-    <img class="modal-image" src="${
-      museum["Image"] || "images/placeholder.jpg"
-    }" alt="${museum["Name"]} image" />
+    <picture style="display: contents">
+      <source type="image/avif" srcset="${formatImageSrcset(image, "avif")}" sizes="${imageSizes}" />
+      <source type="image/webp" srcset="${formatImageSrcset(image, "webp")}" sizes="${imageSizes}" />
+      <img class="modal-image" src="${
+        image || "images/placeholder.jpg"
+      }" alt="${museum["Name"]} image" style="${formatImageStyle(image)}" />
+    </picture>
     
     <div class="modal-section">
       <div class="modal-section-title">
@@ -0,0 +1,330 @@
+"""Versioned snapshots of the museum dataset with field-level patches between them.
+
+Every run that changes data/museum_details_full.json becomes a new version,
+identified by the hash of its content, so running it again on the same
+data does nothing. Next to the gzipped full snapshot it stores the patch
+from the previous version, so a client on version N can fetch just the
+patches to N+1, N+2, ... instead of the whole dataset:
+
+    data/snapshots/index.json                      versions, hashes, patch paths, change counts
+    data/snapshots/full/<hash>.json.gz             every version in full
+    data/snapshots/patches/<from>-<to>.json        what changed from one version to the next
+
+Museums are matched between versions by name (the second museum with the
+same name is "Name#2", and so on). A patch lists the added museums, the
+removed names and, for changed museums, the new value of every changed
+field and the fields that are gone:
+
+    {"from": "1a2b...", "to": "3c4d...", "added": {"Name": {...}}, "removed": ["Name"],
+     "changed": {"Name": {"set": {"Phone": "..."}, "unset": ["Official_Website"]}}, "order": [...]}
+
+    python3 scripts/snapshots.py                    # snapshot the current dataset
+    python3 scripts/snapshots.py --report           # change volume of every run
+    python3 scripts/snapshots.py --diff 3 4         # field-level changes between two versions
+    python3 scripts/snapshots.py --verify           # replay every patch and check the hashes
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import time
+
+DATASET_PATH = "data/museum_details_full.json"
+SNAPSHOT_DIR = "data/snapshots"
+
+
+def dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_hash(records):
+    """Hash of the data, independent of the order of keys within a museum"""
+    canonical = json.dumps(records, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def museum_keys(records):
+    """A key per museum: its name, with "#2", "#3", ... for repeated names"""
+    seen = {}
+    keys = []
+    for record in records:
+        name = record.get("Name", "")
+        seen[name] = seen.get(name, 0) + 1
+        keys.append(name if seen[name] == 1 else f"{name}#{seen[name]}")
+    return keys
+
+
+# --- Diff and patch ---
+def diff_records(old, new):
+    """Field-level differences between two versions of the dataset.
+
+    Returns {"added": {key: record}, "removed": {key: record},
+    "changed": {key: {field: [old value, new value]}}, "order_changed": bool};
+    a field that is missing on one side has None there.
+    """
+    old_by_key = dict(zip(museum_keys(old), old))
+    new_keys = museum_keys(new)
+    new_by_key = dict(zip(new_keys, new))
+
+    changed = {}
+    for key, record in new_by_key.items():
+        before = old_by_key.get(key)
+        if before is None or before == record:
+            continue
+        fields = {}
+        for field in list(before) + [field for field in record if field not in before]:
+            if before.get(field) != record.get(field) or (field in before) != (field in record):
+                fields[field] = [before.get(field), record.get(field)]
+        changed[key] = fields
+
+    kept = [key for key in museum_keys(old) if key in new_by_key]
+    return {
+        "added": {key: record for key, record in new_by_key.items() if key not in old_by_key},
+        "removed": {key: record for key, record in old_by_key.items() if key not in new_by_key},
+        "changed": changed,
+        "order_changed": kept + [key for key in new_keys if key not in old_by_key] != new_keys,
+        "order": new_keys,
+    }
+
+
+def make_patch(old, new):
+    """Patch that turns `old` into `new`, with only the new values"""
+    diff = diff_records(old, new)
+    new_by_key = dict(zip(museum_keys(new), new))
+    patch = {
+        "from": content_hash(old),
+        "to": content_hash(new),
+        "added": diff["added"],
+        "removed": list(diff["removed"]),
+        "changed": {
+            key: {
+                "set": {field: new_by_key[key][field] for field in fields if field in new_by_key[key]},
+                "unset": [field for field in fields if field not in new_by_key[key]],
+            }
+            for key, fields in diff["changed"].items()
+        },
+    }
+    # Without an order, kept museums stay in place and added ones go at the end
+    if diff["order_changed"]:
+        patch["order"] = diff["order"]
+    return patch, diff
+
+
+def apply_patch(records, patch):
+    """The next version of `records`. Raises ValueError if the patch is for another version"""
+    if content_hash(records) != patch["from"]:
+        raise ValueError(f"Patch is for version {patch['from']}, not {content_hash(records)}")
+
+    removed = set(patch["removed"])
+    by_key = {}
+    for key, record in zip(museum_keys(records), records):
+        if key in removed:
+            continue
+        change = patch["changed"].get(key)
+        if change:
+            record = {field: value for field, value in record.items() if field not in change["unset"]}
+            record.update(change["set"])
+        by_key[key] = record
+
+    order = patch.get("order")
+    if order is None:
+        result = list(by_key.values()) + list(patch["added"].values())
+    else:
+        by_key.update(patch["added"])
+        result = [by_key[key] for key in order]
+
+    if content_hash(result) != patch["to"]:
+        raise ValueError(f"Patch did not produce version {patch['to']}")
+    return result
+
+
+# --- Store ---
+class SnapshotStore:
+    """data/snapshots/: an index of versions, full snapshots and patches"""
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        else:
+            self.index = {"version": 1, "latest": 0, "versions": []}
+
+    def path(self, relative):
+        return os.path.join(self.directory, relative)
+
+    def entry(self, version):
+        """Index entry for a version number or hash"""
+        for entry in self.index["versions"]:
+            if str(entry["version"]) == str(version) or entry["hash"] == version:
+                return entry
+        raise KeyError(f"No snapshot version {version}")
+
+    def load(self, version):
+        with gzip.open(self.path(self.entry(version)["file"]), "rb") as f:
+            return json.loads(f.read())
+
+    def load_patch(self, version):
+        """Patch from the version before `version` to `version`"""
+        with open(self.path(self.entry(version)["patch"]), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, relative, data, compress=False):
+        path = self.path(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.partial"
+        with open(tmp, "wb") as f:
+            f.write(gzip.compress(data, mtime=0) if compress else data)
+        os.replace(tmp, path)
+
+    def add(self, records):
+        """Store `records` as a new version. Returns (index entry, diff), or (None, None) if unchanged"""
+        digest = content_hash(records)
+        versions = self.index["versions"]
+        if versions and versions[-1]["hash"] == digest:
+            return None, None
+
+        body = dumps(records)
+        entry = {
+            "version": (versions[-1]["version"] if versions else 0) + 1,
+            "hash": digest,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "museums": len(records),
+            "bytes": len(body),
+            "file": f"full/{digest}.json.gz",
+        }
+        self._write(entry["file"], body, compress=True)
+
+        diff = None
+        if versions:
+            previous = self.load(versions[-1]["version"])
+            patch, diff = make_patch(previous, records)
+            patch_body = dumps(patch)
+            entry["patch"] = f"patches/{patch['from']}-{patch['to']}.json"
+            entry["patch_bytes"] = len(patch_body)
+            entry["changes"] = change_counts(diff)
+            self._write(entry["patch"], patch_body)
+
+        versions.append(entry)
+        self.index["latest"] = entry["version"]
+        self._write("index.json", json.dumps(self.index, indent=2, ensure_ascii=False).encode("utf-8") + b"\n")
+        return entry, diff
+
+    def updates(self, from_hash):
+        """Patch paths a client on version `from_hash` fetches to reach the latest version, in order.
+        Raises KeyError for a version this store does not have"""
+        versions = self.index["versions"]
+        start = next((i for i, entry in enumerate(versions) if entry["hash"] == from_hash), None)
+        if start is None:
+            raise KeyError(f"Unknown snapshot version {from_hash}")
+        return [entry["patch"] for entry in versions[start + 1:]]
+
+    def verify(self):
+        """Replay every patch on the version before it; returns the problems found"""
+        problems = []
+        versions = self.index["versions"]
+        for previous, entry in zip(versions, versions[1:]):
+            try:
+                result = apply_patch(self.load(previous["version"]), self.load_patch(entry["version"]))
+                if content_hash(result) != content_hash(self.load(entry["version"])):
+                    problems.append(f"version {entry['version']}: patch result differs from the snapshot")
+            except (OSError, ValueError, KeyError) as e:
+                problems.append(f"version {entry['version']}: {e}")
+        return problems
+
+
+# --- Reports ---
+def change_counts(diff):
+    fields = {}
+    for changes in diff["changed"].values():
+        for field in changes:
+            fields[field] = fields.get(field, 0) + 1
+    return {
+        "added": len(diff["added"]),
+        "removed": len(diff["removed"]),
+        "changed": len(diff["changed"]),
+        "fields": dict(sorted(fields.items(), key=lambda item: -item[1])),
+    }
+
+
+def print_run(entry):
+    changes = entry.get("changes")
+    if not changes:
+        print(f"   v{entry['version']} {entry['hash']} {entry['created']}  {entry['museums']} museums (first snapshot)")
+        return
+    print(f"   v{entry['version']} {entry['hash']} {entry['created']}  "
+          f"+{changes['added']} -{changes['removed']} ~{changes['changed']} museums, "
+          f"patch {entry['patch_bytes']:,} of {entry['bytes']:,} bytes ({entry['patch_bytes'] / entry['bytes']:.1%})")
+    if changes["fields"]:
+        print("      " + ", ".join(f"{field} {count}" for field, count in changes["fields"].items()))
+
+
+def print_diff(diff, limit=10):
+    for label, key in (("➕ Added", "added"), ("➖ Removed", "removed")):
+        if diff[key]:
+            print(f"{label}: {', '.join(list(diff[key])[:limit])}" + (" ..." if len(diff[key]) > limit else ""))
+    if diff["changed"]:
+        print(f"✏️ Changed: {len(diff['changed'])} museums")
+        for key, fields in list(diff["changed"].items())[:limit]:
+            print(f"   {key}")
+            for field, (before, after) in fields.items():
+                print(f"      {field}: {str(before)[:60]!r} -> {str(after)[:60]!r}")
+    if diff["order_changed"]:
+        print("🔀 The order of the museums changed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot the museum dataset and publish patches between versions")
+    parser.add_argument("--input", default=DATASET_PATH)
+    parser.add_argument("--dir", default=SNAPSHOT_DIR)
+    parser.add_argument("--report", action="store_true", help="Show the change volume of every run")
+    parser.add_argument("--diff", nargs=2, metavar=("FROM", "TO"), help="Field-level changes between two versions")
+    parser.add_argument("--verify", action="store_true", help="Replay every patch and check the result")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.dir)
+
+    if args.report:
+        print(f"📜 {len(store.index['versions'])} versions in {args.dir}:")
+        for entry in store.index["versions"]:
+            print_run(entry)
+        return
+
+    if args.diff:
+        try:
+            old, new = store.load(args.diff[0]), store.load(args.diff[1])
+        except KeyError as e:
+            print(f"❌ {e.args[0]} (see --report for the versions)")
+            raise SystemExit(1)
+        print_diff(diff_records(old, new))
+        return
+
+    if args.verify:
+        problems = store.verify()
+        if problems:
+            print(f"❌ {len(problems)} patches do not replay:")
+            for problem in problems:
+                print(f"   {problem}")
+            raise SystemExit(1)
+        print(f"✅ All {max(0, len(store.index['versions']) - 1)} patches replay to their snapshots")
+        return
+
+    print("📖 Loading museum data...")
+    with open(args.input, "r", encoding="utf-8") as f:
+        records = json.load(f)
+
+    entry, diff = store.add(records)
+    if entry is None:
+        print(f"✅ Unchanged since v{store.index['latest']}, nothing to snapshot")
+        return
+    print(f"💾 Saved v{entry['version']} ({entry['hash']}) to {args.dir}")
+    print_run(entry)
+    if diff:
+        print()
+        print_diff(diff)
+
+
+if __name__ == "__main__":
+    main()